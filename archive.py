@@ -0,0 +1,311 @@
+# Lost & Found DBMS Project - Hot/cold archival
+# ------------------------------------------------
+# Claimed items and decided (approved / rejected) claims are moved out of
+# `items` / `claims` once they are older than `age_days`, into
+# `items_archive` / `claims_archive` (main.sql / migration 8). Those are
+# RANGE-partitioned by year of report_date / claim_date, so old years can
+# be dropped or scanned on their own; the live tables, and everything that
+# reads them (paged tabs, sync), keep only the working set. The tables are created with just p_old and pmax; each run
+# first splits a partition per year off pmax up to the cutoff's year
+# (ensure_partitions), so archived rows never land in pmax and the layout
+# does not depend on when the database was created.
+#
+# Consistency:
+# - Rows are copied and deleted in the same transaction, a small batch
+#   at a time, so the run can be stopped anywhere (max_seconds, Ctrl-C,
+#   a crash) and the next run simply finds what is left.
+# - A claim goes before (or with) its item, so claims.item_id never points
+#   at a missing item; an item only goes once all its claims can go too.
+# - The usual delete triggers fire: they take the rows off the live summary
+#   counts, and the same batch adds them to the summaries' archived_count
+#   (ARCHIVED_COUNTS), so the Query Hub and count_items_by_user() go on
+#   counting archived rows and summaries.py check still holds. Tombstones
+#   tell the other desks to drop the rows; item_events keeps the history of
+#   archived items.
+# - Candidate rows are locked FOR UPDATE SKIP LOCKED: a row another desk
+#   is editing is left for the next run instead of being waited on.
+#   SKIP LOCKED needs MySQL 8.0+ or MariaDB 10.6+.
+#
+# The archive tables carry no foreign keys (InnoDB partitioned tables
+# cannot); they are only ever written here.
+#
+# On the SQLite backend the archive tables are plain tables: there are no
+# partitions to add, each batch's BEGIN IMMEDIATE stands in for the row
+# locks, and status() reports one row count per table.
+#
+# Usage:
+#   python archive.py run [--age-days 365] [--batch-size 500] [--max-seconds 60]
+#   python archive.py status
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from mysql.connector import Error
+
+from db import backend_name, get_conn, note_write
+from queries import TABLE_COLUMNS
+
+ARCHIVE_CONFIG = {
+    "age_days": 365,          # resolved rows older than this are archived
+    "batch_size": 500,        # rows moved per transaction
+    "pause": 0.05,            # seconds between batches (lets other writers in)
+    "lock_wait_timeout": 5,   # seconds, for the archiving session
+    "retries": 3,             # per batch, on lock wait timeout / deadlock
+}
+
+ARCHIVE_TABLES = {"items": "items_archive", "claims": "claims_archive"}
+PARTITION_DATES = {"items": "report_date", "claims": "claim_date"}
+FIRST_YEAR = 2020             # rows before this share partition p_old
+
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+
+# Columns copied across (updated_at keeps the last live change)
+COPY_COLUMNS = {t: TABLE_COLUMNS[t] + ["updated_at"] for t in ARCHIVE_TABLES}
+
+# Decided claims older than the cutoff (idx_claims_status_date range)
+CLAIM_CANDIDATES_SQL = """
+    SELECT claim_id FROM claims
+    WHERE status IN ('approved', 'rejected') AND claim_date < %s
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED"""
+
+# Claimed items older than the cutoff whose claims can all go with them
+ITEM_CANDIDATES_SQL = """
+    SELECT i.item_id FROM items i
+    WHERE i.status = 'claimed' AND i.report_date < %s
+      AND NOT EXISTS (
+          SELECT 1 FROM claims c
+          WHERE c.item_id = i.item_id
+            AND NOT COALESCE(c.status IN ('approved', 'rejected') AND c.claim_date < %s, FALSE))
+    ORDER BY i.report_date, i.item_id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED"""
+
+# Moved rows per summary group (read before the DELETE) -> the UPDATE that
+# adds them to that group's archived_count. The delete triggers leave the
+# group's row in place at 0, so it is always there to update.
+ARCHIVED_COUNTS = {
+    "items": [
+        ("""SELECT COALESCE(category, ''), COALESCE(status, ''), COUNT(*) FROM items
+            WHERE {match} GROUP BY COALESCE(category, ''), COALESCE(status, '')""",
+         """UPDATE item_category_counts SET archived_count = archived_count + %s
+            WHERE category = %s AND status = %s"""),
+        ("""SELECT reported_by, COUNT(*) FROM items
+            WHERE {match} AND reported_by IS NOT NULL GROUP BY reported_by""",
+         "UPDATE user_item_counts SET archived_count = archived_count + %s WHERE user_id = %s"),
+    ],
+    "claims": [
+        ("""SELECT COALESCE(status, ''), COUNT(*) FROM claims
+            WHERE {match} GROUP BY COALESCE(status, '')""",
+         "UPDATE claim_status_counts SET archived_count = archived_count + %s WHERE status = %s"),
+    ],
+}
+
+# ---------------------- DDL ----------------------
+def partitions_sql(column):
+    # Yearly partitions are added by ensure_partitions() as they are needed
+    return (f"PARTITION BY RANGE COLUMNS({column}) "
+            f"(PARTITION p_old VALUES LESS THAN ('{FIRST_YEAR}-01-01'), PARTITION pmax VALUES LESS THAN (MAXVALUE))")
+
+def archive_ddl():
+    # CREATE TABLE statements for both archive tables (migration 8)
+    return [
+        f"""CREATE TABLE IF NOT EXISTS items_archive (
+              item_id INT NOT NULL,
+              item_name VARCHAR(100) NOT NULL,
+              description TEXT,
+              category VARCHAR(50),
+              status ENUM('lost','found','claimed'),
+              report_date DATE NOT NULL,
+              reported_by INT,
+              location_id INT,
+              updated_at TIMESTAMP(6) NOT NULL,
+              archived_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+              PRIMARY KEY (item_id, report_date),
+              INDEX idx_items_archive_name (item_name),
+              INDEX idx_items_archive_date (report_date),
+              INDEX idx_items_archive_user (reported_by),
+              INDEX idx_items_archive_loc (location_id)
+            ) {partitions_sql("report_date")}""",
+        f"""CREATE TABLE IF NOT EXISTS claims_archive (
+              claim_id INT NOT NULL,
+              item_id INT,
+              claimer_id INT,
+              claim_date DATE NOT NULL,
+              status ENUM('pending','approved','rejected'),
+              remarks VARCHAR(255),
+              updated_at TIMESTAMP(6) NOT NULL,
+              archived_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+              PRIMARY KEY (claim_id, claim_date),
+              INDEX idx_claims_archive_item (item_id),
+              INDEX idx_claims_archive_claimer (claimer_id),
+              INDEX idx_claims_archive_date (claim_date)
+            ) {partitions_sql("claim_date")}""",
+    ]
+
+def partitions(cur, table):
+    """[(partition name, approximate rows)] of an archive table, in order."""
+    if backend_name() != "mysql":
+        cur.execute(f"SELECT COUNT(*) FROM {table}")
+        return [(table, cur.fetchone()[0])]
+    cur.execute("""SELECT partition_name, table_rows FROM information_schema.partitions
+                   WHERE table_schema = DATABASE() AND table_name = %s
+                   ORDER BY partition_ordinal_position""", (table,))
+    return [(name, rows or 0) for name, rows in cur.fetchall()]
+
+def ensure_partitions(cur, year):
+    # Split pmax so every year up to `year` has its own partition
+    if backend_name() != "mysql":
+        return
+    for source, archive_table in ARCHIVE_TABLES.items():
+        years = [int(name[1:]) for name, _ in partitions(cur, archive_table)
+                 if name[1:].isdigit()]
+        for y in range(max(years, default=FIRST_YEAR - 1) + 1, year + 1):
+            cur.execute(f"""ALTER TABLE {archive_table} REORGANIZE PARTITION pmax INTO (
+                              PARTITION p{y} VALUES LESS THAN ('{y + 1}-01-01'),
+                              PARTITION pmax VALUES LESS THAN (MAXVALUE))""")
+
+# ---------------------- ARCHIVING ----------------------
+def _move(cur, table, where, ids):
+    # Copy then delete the same rows, moving their summary counts to
+    # archived_count; returns rows moved
+    cols = ", ".join(COPY_COLUMNS[table])
+    match = f"{where} IN ({', '.join(['%s'] * len(ids))})"
+    counts = []
+    for select, update in ARCHIVED_COUNTS[table]:
+        cur.execute(select.format(match=match), ids)
+        counts += [(update, (r[-1], *r[:-1])) for r in cur.fetchall()]
+    cur.execute(f"INSERT INTO {ARCHIVE_TABLES[table]} ({cols}) "
+                f"SELECT {cols} FROM {table} WHERE {match}", ids)
+    cur.execute(f"DELETE FROM {table} WHERE {match}", ids)
+    moved = cur.rowcount
+    for update, params in counts:
+        cur.execute(update, params)
+    return moved
+
+def _claims_batch(cur, cutoff, n):
+    cur.execute(CLAIM_CANDIDATES_SQL, (cutoff, n))
+    ids = [r[0] for r in cur.fetchall()]
+    return {"claims": _move(cur, "claims", "claim_id", ids)} if ids else None
+
+def _items_batch(cur, cutoff, n):
+    cur.execute(ITEM_CANDIDATES_SQL, (cutoff, cutoff, n))
+    ids = [r[0] for r in cur.fetchall()]
+    if not ids:
+        return None
+    claims = _move(cur, "claims", "item_id", ids)   # children first
+    return {"claims": claims, "items": _move(cur, "items", "item_id", ids)}
+
+def archive(age_days=None, batch_size=None, max_seconds=None, on_progress=None,
+            config=ARCHIVE_CONFIG):
+    """Move resolved rows older than `age_days` into the archive tables.
+
+    Returns {"cutoff", "items", "claims", "batches", "seconds", "done"};
+    done is False when max_seconds ran out first (run again to continue).
+    on_progress(result so far) is called after every batch.
+    """
+    age_days = config["age_days"] if age_days is None else age_days
+    batch_size = batch_size or config["batch_size"]
+    cutoff = date.today() - timedelta(days=age_days)
+    started = time.monotonic()
+    result = {"cutoff": cutoff, "items": 0, "claims": 0, "batches": 0, "seconds": 0.0,
+              "done": True}
+    with get_conn() as con:
+        cur = con.cursor()
+        try:
+            ensure_partitions(cur, cutoff.year)
+            if backend_name() == "mysql":
+                cur.execute("SET SESSION innodb_lock_wait_timeout = %s", (config["lock_wait_timeout"],))
+            for step in (_claims_batch, _items_batch):
+                retries = 0
+                while True:
+                    if max_seconds is not None and time.monotonic() - started > max_seconds:
+                        result["done"] = False
+                        break
+                    try:
+                        con.start_transaction()
+                        moved = step(cur, cutoff, batch_size)
+                        con.commit()
+                    except Error as e:
+                        con.rollback()
+                        if e.errno not in (ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK) \
+                                or retries >= config["retries"]:
+                            raise
+                        retries += 1
+                        time.sleep(config["pause"] * 10)
+                        continue
+                    if moved is None:
+                        break
+                    retries = 0
+                    note_write(*moved)
+                    for table, n in moved.items():
+                        result[table] += n
+                    result["batches"] += 1
+                    result["seconds"] = round(time.monotonic() - started, 3)
+                    if on_progress:
+                        on_progress(dict(result))
+                    time.sleep(config["pause"])
+                if not result["done"]:
+                    break
+        finally:
+            if backend_name() == "mysql":
+                try:
+                    cur.execute("SET SESSION innodb_lock_wait_timeout = DEFAULT")
+                except Error:
+                    pass
+            cur.close()
+    result["seconds"] = round(time.monotonic() - started, 3)
+    return result
+
+def format_summary(result):
+    text = (f"Archived {result['items']:,} item(s) and {result['claims']:,} claim(s) "
+            f"resolved before {result['cutoff']} in {result['batches']} batch(es), "
+            f"{result['seconds']}s.")
+    if not result["done"]:
+        text += " Stopped at the time limit; run again to continue."
+    return text
+
+def status(cur, age_days=None):
+    """{table: (live rows eligible now, [(partition, approx rows)])}."""
+    age_days = ARCHIVE_CONFIG["age_days"] if age_days is None else age_days
+    cutoff = date.today() - timedelta(days=age_days)
+    cur.execute("""SELECT COUNT(*) FROM claims
+                   WHERE status IN ('approved', 'rejected') AND claim_date < %s""", (cutoff,))
+    claims = cur.fetchone()[0]
+    cur.execute("SELECT COUNT(*) FROM items WHERE status = 'claimed' AND report_date < %s", (cutoff,))
+    items = cur.fetchone()[0]
+    return {"claims": (claims, partitions(cur, "claims_archive")),
+            "items": (items, partitions(cur, "items_archive"))}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Archive resolved items and claims.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("run", help="move resolved rows older than --age-days")
+    p.add_argument("--age-days", type=int, default=ARCHIVE_CONFIG["age_days"])
+    p.add_argument("--batch-size", type=int, default=ARCHIVE_CONFIG["batch_size"])
+    p.add_argument("--max-seconds", type=float)
+    p = sub.add_parser("status", help="eligible rows and archive partitions")
+    p.add_argument("--age-days", type=int, default=ARCHIVE_CONFIG["age_days"])
+    args = ap.parse_args(argv)
+    if args.cmd == "run":
+        def progress(r):
+            print(f"\r{r['items']:,} items, {r['claims']:,} claims, {r['batches']} batches",
+                  end="", flush=True)
+        result = archive(args.age_days, args.batch_size, args.max_seconds, progress)
+        print()
+        print(format_summary(result))
+    else:
+        with get_conn() as con:
+            cur = con.cursor()
+            try:
+                for table, (eligible, parts) in status(cur, args.age_days).items():
+                    print(f"{table}: {eligible:,} live row(s) eligible")
+                    for name, rows in parts:
+                        print(f"  {ARCHIVE_TABLES[table]}.{name:8} ~{rows:,} rows")
+            finally:
+                cur.close()
+
+if __name__ == "__main__":
+    main()
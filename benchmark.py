@@ -0,0 +1,452 @@
+# Lost & Found DBMS Project - Synthetic data + headless benchmarks
+# ------------------------------------------------
+# populate: fills `lostfound` with synthetic data at a given scale
+#   - users = items / 20, 200 locations in 20 buildings
+#   - Zipf-skewed categories and reporters (a few users report most items)
+#   - report dates over two years, ~40% of found items get 1-3 claims,
+#     ~30% of those have an approved claim (item status 'claimed')
+# run: times the application's hot paths without the GUI
+#   - the CRUD statements of main.py, add_item / update_claim_status /
+#     batch_claim_status through call_proc
+#   - every Query Hub query, count_items_by_user(), keyset pages, search
+#   - fill_tree rendering (plain and keyed) when a Tk display is available
+#   and writes a JSON report (per-case latency percentiles plus the
+#   profiler's per-statement stats) that `compare` diffs across commits.
+# --temp-server starts a throwaway mysqld / mariadbd in a temp dir, loads
+# main.sql into it and points db.DB_CONFIG at it.
+#
+# Usage:
+#   python benchmark.py run --temp-server --scale 100000 --out bench.json
+#   python benchmark.py populate --scale 1000000
+#   python benchmark.py compare old.json new.json [--threshold 10]
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import mysql.connector
+
+import db
+from db import run_query, run_exec, call_proc, close_pool
+from paging import reconcile_tree
+from profiler import profiler, percentile
+from queries import TABLE_SQL, QUERY_HUB
+from search import search_items
+
+BENCH_CONFIG = {
+    "repeat": 50,             # calls per timed case
+    "batch_size": 10000,      # rows per INSERT batch when populating
+    "tree_rows": 1000,        # rows rendered in the fill_tree cases
+}
+
+CATEGORIES = ["Electronics", "Wallet", "Keys", "ID Card", "Bag", "Clothing", "Bottle",
+              "Books", "Accessories", "Umbrella", "Jewelry", "Headphones", "Charger",
+              "Glasses", "Sports", "Stationery", "Documents", "Toys", "Tools", "Other"]
+ADJECTIVES = ["black", "blue", "red", "silver", "green", "leather", "small", "large",
+              "old", "new", "white", "grey", "striped", "broken", "plastic"]
+NOUNS = ["wallet", "phone", "umbrella", "keys", "charger", "bottle", "notebook", "jacket",
+         "backpack", "watch", "earbuds", "calculator", "scarf", "cap", "laptop", "card"]
+DETAILS = ["with sticker", "cracked screen", "name inside", "zip broken", "brand logo",
+           "left on desk", "near entrance", "in a pouch", "keychain attached", ""]
+
+# ---------------------- TEMP SERVER ----------------------
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class TempServer:
+    """Throwaway MySQL / MariaDB server in a temp dir (context manager)."""
+
+    def __init__(self, mysqld=None, port=None, keep=False, log=print):
+        self.binary = mysqld or shutil.which("mysqld") or shutil.which("mariadbd")
+        if not self.binary:
+            raise RuntimeError("mysqld / mariadbd not found on PATH (or pass --mysqld)")
+        self.port = port or free_port()
+        self.keep = keep
+        self.log = log
+        self.dir = None
+        self.proc = None
+
+    @property
+    def config(self):
+        return {"host": "127.0.0.1", "port": self.port, "user": "root", "password": ""}
+
+    def __enter__(self):
+        self.dir = tempfile.mkdtemp(prefix="lostfound-bench-")
+        datadir = os.path.join(self.dir, "data")
+        version = subprocess.run([self.binary, "--version"], capture_output=True, text=True).stdout
+        as_root = ["--user=root"] if hasattr(os, "geteuid") and os.geteuid() == 0 else []
+        if "mariadb" in version.lower():
+            install = (shutil.which("mariadb-install-db") or shutil.which("mysql_install_db"))
+            if not install:
+                raise RuntimeError("mariadb-install-db not found on PATH")
+            init = [install, "--no-defaults", f"--datadir={datadir}",
+                    "--auth-root-authentication-method=normal"] + as_root
+            extra = []
+        else:
+            init = [self.binary, "--no-defaults", "--initialize-insecure",
+                    f"--datadir={datadir}"] + as_root
+            extra = ["--mysqlx=OFF"]
+        self.log(f"Initializing {version.strip() or self.binary} in {self.dir}")
+        subprocess.run(init, check=True, capture_output=True)
+        self.proc = subprocess.Popen(
+            [self.binary, "--no-defaults", f"--datadir={datadir}", f"--port={self.port}",
+             "--bind-address=127.0.0.1", f"--socket={os.path.join(self.dir, 'mysqld.sock')}",
+             f"--pid-file={os.path.join(self.dir, 'mysqld.pid')}",
+             f"--log-error={os.path.join(self.dir, 'error.log')}"] + extra + as_root,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self._wait_ready()
+        return self
+
+    def _wait_ready(self, timeout=60.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                mysql.connector.connect(**self.config).close()
+                return
+            except mysql.connector.Error:
+                if self.proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"server did not start; see {self.dir}/error.log")
+                time.sleep(0.5)
+
+    def load_sql(self, path):
+        client = shutil.which("mysql") or shutil.which("mariadb")
+        if not client:
+            raise RuntimeError("mysql / mariadb client not found on PATH")
+        with open(path, "rb") as f:
+            subprocess.run([client, "--no-defaults", "-h", "127.0.0.1", "-P", str(self.port), "-u", "root"],
+                           stdin=f, check=True)
+
+    def __exit__(self, *exc):
+        close_pool()
+        if self.proc is not None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(30)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        if self.dir and not self.keep:
+            shutil.rmtree(self.dir, ignore_errors=True)
+
+def use_server(config):
+    # Point the pooled helpers at another server
+    close_pool()
+    db.DB_CONFIG.update(config)
+    db.DB_CONFIG["database"] = "lostfound"
+
+# ---------------------- DATA GENERATOR ----------------------
+def zipf_cum_weights(n, s=1.1):
+    total, out = 0.0, []
+    for k in range(1, n + 1):
+        total += 1.0 / k ** s
+        out.append(total)
+    return out
+
+def insert_many(sql, rows, batch_size):
+    for i in range(0, len(rows), batch_size):
+        run_exec(sql, rows[i:i + batch_size], many=True)
+
+def populate(scale, seed=1, batch_size=None, log=print):
+    batch_size = batch_size or BENCH_CONFIG["batch_size"]
+    rnd = random.Random(seed)
+    t0 = time.perf_counter()
+    n_users = max(100, scale // 20)
+
+    base = run_query("SELECT COALESCE(MAX(user_id), 0) FROM users")[0][0]
+    roles = rnd.choices(["student", "staff", "admin"], weights=[80, 15, 5], k=n_users)
+    insert_many("INSERT INTO users(name,email,phone,role) VALUES(%s,%s,%s,%s)",
+                [(f"Bench User {base + i}", f"bench{base + i}.{seed}@example.com",
+                  f"9{rnd.randrange(10**9):09d}", roles[i]) for i in range(n_users)], batch_size)
+    user_ids = [r[0] for r in run_query("SELECT user_id FROM users WHERE user_id > %s ORDER BY user_id", (base,))]
+    log(f"users: {len(user_ids):,}")
+
+    base = run_query("SELECT COALESCE(MAX(location_id), 0) FROM locations")[0][0]
+    insert_many("INSERT INTO locations(location_name,building,floor_no) VALUES(%s,%s,%s)",
+                [(f"Room {base + i}", f"Block {chr(65 + i % 20)}", i % 6) for i in range(200)], batch_size)
+    loc_ids = [r[0] for r in run_query("SELECT location_id FROM locations WHERE location_id > %s", (base,))]
+
+    user_cum = zipf_cum_weights(len(user_ids))
+    cat_cum = zipf_cum_weights(len(CATEGORIES))
+    start = datetime.date.today() - datetime.timedelta(days=730)
+    done = claims = 0
+    while done < scale:
+        n = min(batch_size, scale - done)
+        last_id = run_query("SELECT COALESCE(MAX(item_id), 0) FROM items")[0][0]
+        reporters = rnd.choices(user_ids, cum_weights=user_cum, k=n)
+        cats = rnd.choices(CATEGORIES, cum_weights=cat_cum, k=n)
+        rows = []
+        for i in range(n):
+            name = f"{rnd.choice(ADJECTIVES)} {rnd.choice(NOUNS)}"
+            rows.append((name.title(), f"{name} {rnd.choice(DETAILS)}".strip(), cats[i],
+                         rnd.choice(("lost", "found")), start + datetime.timedelta(days=rnd.randrange(730)),
+                         reporters[i], rnd.choice(loc_ids)))
+        run_exec("""INSERT INTO items(item_name,description,category,status,report_date,reported_by,location_id)
+                    VALUES(%s,%s,%s,%s,%s,%s,%s)""", rows, many=True)
+        # Claims on ~40% of the found items of this batch
+        found = [r[0] for r in run_query("SELECT item_id FROM items WHERE item_id > %s AND status = 'found'",
+                                         (last_id,))]
+        claim_rows, claimed = [], []
+        for item_id in found:
+            if rnd.random() >= 0.4:
+                continue
+            approved = rnd.random() < 0.3
+            for k in range(rnd.choice((1, 1, 1, 2, 3))):
+                if k == 0 and approved:
+                    status = "approved"
+                else:
+                    status = "rejected" if approved or rnd.random() < 0.3 else "pending"
+                claim_rows.append((item_id, rnd.choice(user_ids), status, "bench"))
+            if approved:
+                claimed.append(item_id)
+        if claim_rows:
+            run_exec("INSERT INTO claims(item_id,claimer_id,status,remarks) VALUES(%s,%s,%s,%s)",
+                     claim_rows, many=True)
+        for i in range(0, len(claimed), 1000):
+            chunk = claimed[i:i + 1000]
+            run_exec(f"UPDATE items SET status='claimed' WHERE item_id IN ({', '.join(['%s'] * len(chunk))})",
+                     chunk)
+        done += n
+        claims += len(claim_rows)
+        log(f"items: {done:,} / {scale:,}  claims: {claims:,}  ({time.perf_counter() - t0:.0f} s)")
+    return {"users": len(user_ids), "locations": len(loc_ids), "items": done, "claims": claims,
+            "seconds": round(time.perf_counter() - t0, 1)}
+
+# ---------------------- TIMED CASES ----------------------
+def summarize(times_ms):
+    values = sorted(times_ms)
+    return {"n": len(values), "mean_ms": round(sum(values) / len(values), 3),
+            "min_ms": round(values[0], 3), "p50_ms": round(percentile(values, 50), 3),
+            "p95_ms": round(percentile(values, 95), 3), "p99_ms": round(percentile(values, 99), 3),
+            "max_ms": round(values[-1], 3)}
+
+def timed(cases, name, fn, repeat, log=print):
+    times = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn(i)
+        times.append((time.perf_counter() - t0) * 1000.0)
+    cases[name] = summarize(times)
+    log(f"{name:<34} p50 {cases[name]['p50_ms']:>9.2f} ms   p95 {cases[name]['p95_ms']:>9.2f} ms")
+
+def run_cases(repeat=None, seed=1, log=print):
+    repeat = repeat or BENCH_CONFIG["repeat"]
+    rnd = random.Random(seed)
+    cases = {}
+    lo, hi = run_query("SELECT MIN(user_id), MAX(user_id) FROM users")[0]
+    item_lo, item_hi = run_query("SELECT MIN(item_id), MAX(item_id) FROM items")[0]
+    loc_id = run_query("SELECT MIN(location_id) FROM locations")[0][0]
+    tag = f"{os.getpid()}.{int(time.time())}"
+
+    # Users tab
+    user_ids = []
+    def user_add(i):
+        run_exec("INSERT INTO users(name,email,phone,role) VALUES(%s,%s,%s,%s)",
+                 (f"Bench {i}", f"bench.{tag}.{i}@example.com", "9000000000", "student"))
+        user_ids.append(run_query("SELECT user_id FROM users WHERE email=%s", (f"bench.{tag}.{i}@example.com",))[0][0])
+    timed(cases, "users.insert", user_add, repeat, log)
+    timed(cases, "users.update", lambda i: run_exec(
+        "UPDATE users SET name=%s, email=%s, phone=%s, role=%s WHERE user_id=%s",
+        (f"Bench {i}*", f"bench.{tag}.{i}@example.com", "9000000001", "staff", user_ids[i])), repeat, log)
+    timed(cases, "users.select_all", lambda i: run_query(TABLE_SQL["users"]), min(repeat, 5), log)
+
+    # Locations tab
+    loc_ids = []
+    def loc_add(i):
+        run_exec("INSERT INTO locations(location_name,building,floor_no) VALUES(%s,%s,%s)",
+                 (f"Bench room {tag}.{i}", "Bench", 1))
+        loc_ids.append(run_query("SELECT MAX(location_id) FROM locations")[0][0])
+    timed(cases, "locations.insert", loc_add, repeat, log)
+    timed(cases, "locations.update", lambda i: run_exec(
+        "UPDATE locations SET location_name=%s,building=%s,floor_no=%s WHERE location_id=%s",
+        (f"Bench room {tag}.{i}*", "Bench", 2, loc_ids[i])), repeat, log)
+
+    # Items tab
+    item_ids = []
+    def add_item(i):
+        call_proc("add_item", (f"Bench item {i}", "bench run", "Other", ("lost", "found")[i % 2],
+                               user_ids[i], loc_id))
+        item_ids.append(run_query("SELECT MAX(item_id) FROM items")[0][0])
+    timed(cases, "proc.add_item", add_item, repeat, log)
+    timed(cases, "items.update", lambda i: run_exec(
+        """UPDATE items SET item_name=%s, description=%s, category=%s, status=%s,
+                              reported_by=%s, location_id=%s WHERE item_id=%s""",
+        (f"Bench item {i}*", "bench run", "Other", "found", user_ids[i], loc_id, item_ids[i])), repeat, log)
+    timed(cases, "items.page_first", lambda i: run_query(
+        "SELECT * FROM items ORDER BY item_id LIMIT %s", (200,)), repeat, log)
+    timed(cases, "items.page_after", lambda i: run_query(
+        "SELECT * FROM items WHERE item_id > %s ORDER BY item_id LIMIT %s",
+        (rnd.randint(item_lo, item_hi), 200)), repeat, log)
+    timed(cases, "items.page_sorted", lambda i: run_query(
+        "SELECT item_id, item_name FROM items WHERE item_name > %s OR (item_name = %s AND item_id > %s) "
+        "ORDER BY item_name, item_id LIMIT %s",
+        ("M", "M", rnd.randint(item_lo, item_hi), 200)), repeat, log)
+    timed(cases, "items.history", lambda i: run_query(
+        "SELECT event_time, event_type, actor_id, claim_id FROM item_events WHERE item_id = %s "
+        "ORDER BY event_time, event_id", (rnd.randint(item_lo, item_hi),)), repeat, log)
+    timed(cases, "items.search", lambda i: search_items(f"{rnd.choice(ADJECTIVES)} {rnd.choice(NOUNS)}"),
+          repeat, log)
+
+    # Claims tab
+    # Two competing claims per bench item: batch-approving the first one
+    # auto-rejects the second, which update_claim_status then decides again
+    claim_ids = []
+    def claim_add(i):
+        run_exec("INSERT INTO claims(item_id, claimer_id, remarks) VALUES(%s,%s,%s)",
+                 (item_ids[i // 2], user_ids[(i + 1) % repeat], "bench"))
+        claim_ids.append(run_query("SELECT MAX(claim_id) FROM claims")[0][0])
+    timed(cases, "claims.insert", claim_add, 2 * repeat, log)
+    timed(cases, "proc.batch_claim_status", lambda i: call_proc(
+        "batch_claim_status", (json.dumps([claim_ids[2 * i]]), "approved", "bench")), repeat, log)
+    timed(cases, "proc.update_claim_status", lambda i: call_proc(
+        "update_claim_status", (claim_ids[2 * i + 1], "rejected", "bench")), repeat, log)
+
+    # Query Hub
+    for name, (sql, _) in QUERY_HUB.items():
+        timed(cases, f"hub.{name}", lambda i, sql=sql: run_query(sql), repeat, log)
+    timed(cases, "function.count_items_by_user", lambda i: run_query(
+        "SELECT count_items_by_user(%s)", (rnd.randint(lo, hi),)), repeat, log)
+
+    # Clean up what the run created (children first)
+    timed(cases, "claims.delete", lambda i: run_exec("DELETE FROM claims WHERE claim_id=%s", (claim_ids[i],)),
+          2 * repeat, log)
+    timed(cases, "items.delete", lambda i: run_exec("DELETE FROM items WHERE item_id=%s", (item_ids[i],)),
+          repeat, log)
+    timed(cases, "locations.delete", lambda i: run_exec("DELETE FROM locations WHERE location_id=%s",
+                                                        (loc_ids[i],)), repeat, log)
+    timed(cases, "users.delete", lambda i: run_exec("DELETE FROM users WHERE user_id=%s", (user_ids[i],)),
+          repeat, log)
+    return cases
+
+def run_tree_cases(cases, repeat=None, log=print):
+    # fill_tree as main.py does it: delete + insert everything, and keyed
+    # (reconcile_tree) with 1% of the rows changed between refreshes
+    repeat = min(repeat or BENCH_CONFIG["repeat"], 20)
+    try:
+        import tkinter
+        from tkinter import ttk
+        root = tkinter.Tk()
+        root.withdraw()
+    except Exception as e:      # no display / no Tk
+        log(f"fill_tree cases skipped: {e}")
+        return f"skipped: {e}"
+    try:
+        rows = run_query("SELECT item_id,item_name,description,category,status,report_date,reported_by,location_id "
+                         "FROM items ORDER BY item_id LIMIT %s", (BENCH_CONFIG["tree_rows"],))
+        tree = ttk.Treeview(root, columns=[f"c{i}" for i in range(8)], show="headings")
+        def plain(i):
+            tree.delete(*tree.get_children())
+            for r in rows:
+                tree.insert("", "end", values=r)
+            tree.update_idletasks()
+        timed(cases, f"ui.fill_tree.plain.{len(rows)}", plain, repeat, log)
+        tree.delete(*tree.get_children())
+        shadow = {}
+        reconcile_tree(tree, rows, shadow)
+        step = max(1, len(rows) // 100)
+        def keyed(i):
+            changed = [r[:1] + (f"{r[1]} v{i}",) + r[2:] if k % step == 0 else r for k, r in enumerate(rows)]
+            reconcile_tree(tree, changed, shadow)
+            tree.update_idletasks()
+        timed(cases, f"ui.fill_tree.keyed.{len(rows)}", keyed, repeat, log)
+    finally:
+        root.destroy()
+    return "ok"
+
+# ---------------------- REPORTS ----------------------
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def dataset_size():
+    return {t: run_query(f"SELECT COUNT(*) FROM {t}")[0][0] for t in ("users", "locations", "items", "claims")}
+
+def run(args, log=print):
+    report = {"meta": {"commit": git_commit(), "time": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "python": platform.python_version(), "platform": platform.platform(),
+                       "repeat": args.repeat, "seed": args.seed}}
+    if args.scale:
+        report["populate"] = populate(args.scale, args.seed, log=log)
+    report["meta"]["server"] = run_query("SELECT VERSION()")[0][0]
+    report["meta"]["dataset"] = dataset_size()
+    profiler.reset()
+    report["cases"] = run_cases(args.repeat, args.seed, log)
+    report["meta"]["tk"] = run_tree_cases(report["cases"], args.repeat, log)
+    report["statements"] = profiler.stats()
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    log(f"Report written to {args.out}")
+    return report
+
+def compare(old_path, new_path, threshold=10.0, log=print):
+    """Print per-case p50/p95 changes; returns the regressed case names."""
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    log(f"{old['meta'].get('commit')} -> {new['meta'].get('commit')}")
+    regressed = []
+    for name in sorted(set(old["cases"]) & set(new["cases"])):
+        a, b = old["cases"][name], new["cases"][name]
+        line = f"{name:<34}"
+        slower = False
+        for key in ("p50_ms", "p95_ms"):
+            change = (b[key] - a[key]) / a[key] * 100.0 if a[key] else 0.0
+            line += f"  {key[:3]} {a[key]:>9.2f} -> {b[key]:>9.2f} ({change:+6.1f}%)"
+            # Ignore sub-0.5 ms jitter
+            slower = slower or (change > threshold and b[key] - a[key] > 0.5)
+        if slower:
+            regressed.append(name)
+            line += "  REGRESSION"
+        log(line)
+    for name in sorted(set(old["cases"]) ^ set(new["cases"])):
+        log(f"{name:<34}  only in {'old' if name in old['cases'] else 'new'} report")
+    return regressed
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Synthetic data and headless benchmarks.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for name in ("run", "populate"):
+        p = sub.add_parser(name)
+        p.add_argument("--scale", type=int, default=0 if name == "run" else 10000,
+                       help="items to generate (run: 0 = use the data already there)")
+        p.add_argument("--seed", type=int, default=1)
+        p.add_argument("--temp-server", action="store_true",
+                       help="start a throwaway mysqld / mariadbd and load main.sql into it")
+        p.add_argument("--mysqld", help="server binary for --temp-server")
+        p.add_argument("--keep", action="store_true", help="keep the temp server's data dir")
+        if name == "run":
+            p.add_argument("--repeat", type=int, default=BENCH_CONFIG["repeat"])
+            p.add_argument("--out", default="bench.json")
+    p = sub.add_parser("compare")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=10.0, help="percent slowdown that counts")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "compare":
+        return 1 if compare(args.old, args.new, args.threshold) else 0
+    work = (lambda: run(args)) if args.cmd == "run" else (lambda: print(populate(args.scale, args.seed)))
+    if not args.temp_server:
+        work()
+        return 0
+    with TempServer(args.mysqld, keep=args.keep) as server:
+        server.load_sql(os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.sql"))
+        use_server(server.config)
+        work()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
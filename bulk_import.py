@@ -0,0 +1,273 @@
+# Lost & Found DBMS Project - Bulk import (CSV / JSONL)
+# ------------------------------------------------
+# Streams users, locations or items from a CSV (header row) or JSONL file
+# into MySQL in batched multi-row INSERT transactions.
+# - Files are parsed row by row, never loaded whole.
+# - Foreign keys (reported_by, location_id) and unique emails are checked
+#   against id/email sets loaded once per import, so bad rows are rejected
+#   before they reach the server.
+# - Rows that still fail on insert are retried one by one so a single bad
+#   row only rejects itself, not its whole batch.
+# - Rejected rows go to a reject file with the source line and the reason.
+# - Items are inserted with plain INSERTs, so trg_item_insert (FOR EACH ROW)
+#   still logs an 'added' event for every row exactly like add_item().
+#
+# Headless usage:
+#   python bulk_import.py users students.csv --batch-size 1000
+#   python bulk_import.py items backlog.jsonl --rejects backlog.rejects.jsonl
+
+import argparse
+import csv
+import json
+import os
+import time
+
+from mysql.connector import Error
+
+from db import get_conn, run_query, note_write
+
+ENTITIES = {
+    "users": {
+        "columns": ("name", "email", "phone", "role"),
+        "required": ("name", "email"),
+        "enums": {"role": ("student", "staff", "admin")},
+        "defaults": {"role": "student"},
+    },
+    "locations": {
+        "columns": ("location_name", "building", "floor_no"),
+        "required": ("location_name",),
+        "ints": ("floor_no",),
+    },
+    "items": {
+        "columns": ("item_name", "description", "category", "status",
+                    "reported_by", "location_id"),
+        "required": ("item_name", "status", "reported_by", "location_id"),
+        "enums": {"status": ("lost", "found")},   # same domain as add_item()
+        "ints": ("reported_by", "location_id"),
+        "fks": {"reported_by": "users", "location_id": "locations"},
+    },
+}
+
+DEFAULT_BATCH_SIZE = 500
+
+# ---------------------- PARSING ----------------------
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    return "jsonl" if ext in (".jsonl", ".ndjson", ".json") else "csv"
+
+def read_rows(path, fmt=None):
+    # Yields (line_no, dict) one record at a time
+    fmt = fmt or detect_format(path)
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for rec in reader:
+                yield reader.line_num, rec
+        else:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                except ValueError as e:
+                    yield line_no, {"_raw": line, "_parse_error": str(e)}
+                    continue
+                if not isinstance(rec, dict):
+                    yield line_no, {"_raw": line,
+                                    "_parse_error": f"expected an object, got {type(rec).__name__}"}
+                    continue
+                yield line_no, rec
+
+# ---------------------- VALIDATION ----------------------
+class Validator:
+    """Checks one record against the entity spec and the cached key sets."""
+
+    def __init__(self, entity):
+        self.entity = entity
+        self.spec = ENTITIES[entity]
+        self.ids = {}
+        for col, table in self.spec.get("fks", {}).items():
+            key = "user_id" if table == "users" else "location_id"
+            self.ids[col] = {r[0] for r in run_query(f"SELECT {key} FROM {table}")}
+        self.emails = None
+        if entity == "users":
+            self.emails = {r[0].lower() for r in run_query("SELECT email FROM users")}
+
+    def check(self, rec):
+        # Returns (values tuple, None) or (None, reason)
+        if "_parse_error" in rec:
+            return None, "bad JSON: " + rec["_parse_error"]
+        spec = self.spec
+        values = []
+        for col in spec["columns"]:
+            v = rec.get(col)
+            if isinstance(v, str):
+                v = v.strip()
+            if v in ("", None):
+                v = spec.get("defaults", {}).get(col)
+            if v is None and col in spec["required"]:
+                return None, f"missing {col}"
+            if v is not None and col in spec.get("ints", ()):
+                try:
+                    v = int(v)
+                except (TypeError, ValueError):
+                    return None, f"{col} is not an integer: {v!r}"
+            allowed = spec.get("enums", {}).get(col)
+            if allowed and v is not None and v not in allowed:
+                return None, f"{col} must be one of {', '.join(allowed)}"
+            if col in self.ids and v not in self.ids[col]:
+                return None, f"unknown {col} {v}"
+            values.append(v)
+        if self.emails is not None:
+            email = values[1].lower()
+            if email in self.emails:
+                return None, f"duplicate email {values[1]}"
+            self.emails.add(email)
+        return tuple(values), None
+
+# ---------------------- REJECT FILE ----------------------
+class RejectWriter:
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self.count = 0
+        self._f = None
+        self._csv = None
+
+    def write(self, line_no, rec, reason):
+        self.count += 1
+        if self.path is None:
+            return
+        row = dict(rec)
+        row.pop("_parse_error", None)
+        row.pop(None, None)     # CSV cells beyond the header
+        row["_line"] = line_no
+        row["_error"] = reason
+        if self._f is None:
+            self._f = open(self.path, "w", newline="", encoding="utf-8")
+        if self.fmt == "csv":
+            if self._csv is None:
+                self._csv = csv.DictWriter(self._f, fieldnames=list(row), extrasaction="ignore")
+                self._csv.writeheader()
+            self._csv.writerow(row)
+        else:
+            self._f.write(json.dumps(row, default=str) + "\n")
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+
+def default_reject_path(path):
+    base, ext = os.path.splitext(path)
+    return f"{base}.rejects{ext or '.csv'}"
+
+# ---------------------- IMPORT ----------------------
+def insert_batch(entity, batch, rejects):
+    # batch: [(line_no, rec, values)]; returns rows inserted
+    cols = ENTITIES[entity]["columns"]
+    sql = (f"INSERT INTO {entity}({','.join(cols)}) "
+           f"VALUES({','.join(['%s'] * len(cols))})")
+    with get_conn() as con:
+        cur = con.cursor()
+        try:
+            try:
+                con.start_transaction()
+                # executemany() on an INSERT ... VALUES is sent as one multi-row INSERT
+                cur.executemany(sql, [values for _, _, values in batch])
+                con.commit()
+                return len(batch)
+            except Error:
+                con.rollback()
+            # Something in the batch was rejected by the server: isolate it
+            inserted = 0
+            for line_no, rec, values in batch:
+                try:
+                    con.start_transaction()
+                    cur.execute(sql, values)
+                    con.commit()
+                    inserted += 1
+                except Error as e:
+                    con.rollback()
+                    rejects.write(line_no, rec, str(e))
+            return inserted
+        finally:
+            cur.close()
+
+def import_file(entity, path, fmt=None, batch_size=DEFAULT_BATCH_SIZE,
+                reject_path=None, on_progress=None):
+    """Import `path` into `entity`; returns a summary dict.
+
+    on_progress(read, inserted, rejected) is called after every batch
+    (from the calling thread).
+    """
+    if entity not in ENTITIES:
+        raise ValueError(f"Unknown entity {entity!r}; choose from {', '.join(ENTITIES)}")
+    fmt = fmt or detect_format(path)
+    if reject_path is None:
+        reject_path = default_reject_path(path)
+    started = time.perf_counter()
+    validator = Validator(entity)
+    rejects = RejectWriter(reject_path, detect_format(reject_path))
+    read = inserted = batches = 0
+    batch = []
+    try:
+        for line_no, rec in read_rows(path, fmt):
+            read += 1
+            values, reason = validator.check(rec)
+            if reason:
+                rejects.write(line_no, rec, reason)
+                continue
+            batch.append((line_no, rec, values))
+            if len(batch) >= batch_size:
+                inserted += insert_batch(entity, batch, rejects)
+                batches += 1
+                batch = []
+                if on_progress:
+                    on_progress(read, inserted, rejects.count)
+        if batch:
+            inserted += insert_batch(entity, batch, rejects)
+            batches += 1
+            if on_progress:
+                on_progress(read, inserted, rejects.count)
+    finally:
+        rejects.close()
+        if inserted:
+            note_write(entity)
+    return {
+        "entity": entity,
+        "read": read,
+        "inserted": inserted,
+        "rejected": rejects.count,
+        "batches": batches,
+        "reject_file": reject_path if rejects.count else None,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+def format_summary(result):
+    text = (f"{result['entity']}: {result['inserted']:,} of {result['read']:,} rows imported "
+            f"in {result['batches']} batch(es), {result['seconds']}s.")
+    if result["rejected"]:
+        text += f"\n{result['rejected']:,} rejected -> {result['reject_file']}"
+    return text
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Bulk import users / locations / items.")
+    ap.add_argument("entity", choices=sorted(ENTITIES))
+    ap.add_argument("path")
+    ap.add_argument("--format", choices=("csv", "jsonl"))
+    ap.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    ap.add_argument("--rejects", help="reject file (default: <input>.rejects.<ext>)")
+    args = ap.parse_args(argv)
+
+    def progress(read, inserted, rejected):
+        print(f"\r{read:,} read, {inserted:,} inserted, {rejected:,} rejected", end="", flush=True)
+
+    result = import_file(args.entity, args.path, args.format, args.batch_size,
+                         args.rejects, on_progress=progress)
+    print()
+    print(format_summary(result))
+    return 1 if result["rejected"] else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
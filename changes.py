@@ -0,0 +1,87 @@
+# Lost & Found DBMS Project - Change tracking / incremental sync
+# ------------------------------------------------
+# Several desks share one database. Every tracked table has an indexed
+# `updated_at TIMESTAMP(6)` (set on insert, bumped ON UPDATE) and deletes
+# leave a row in `tombstones` (trg_*_tombstone; migration 6 / main.sql).
+# SyncPoller.poll() asks for rows changed since the client's high-water
+# mark: one index range scan per table plus one over tombstones, so an
+# idle database costs a handful of empty range reads per poll.
+#
+# The high-water mark is the server's NOW(6) taken at the start of the
+# previous poll, minus `overlap` seconds: a transaction that started
+# before the mark but committed after it still gets picked up. Rows seen
+# twice are harmless; applying them is idempotent (keyed reconcile).
+#
+# Usage:
+#   python changes.py purge [--days 7]     # drop old tombstones
+
+import argparse
+
+from db import get_conn, run_query
+from queries import LIST_COLUMNS
+
+SYNC_CONFIG = {
+    "interval_ms": 5000,      # GUI poll period
+    "overlap": 5.0,           # seconds re-read behind the high-water mark
+    "max_rows": 5000,         # per table per poll; more means "reload the tab"
+    "tombstone_days": 7,      # purge() keeps this much delete history
+}
+
+TRACKED = ("users", "locations", "items", "claims")
+
+class SyncPoller:
+    def __init__(self, tables=TRACKED, config=SYNC_CONFIG):
+        self.tables = tables
+        self.config = config
+        self.hwm = None           # server time of the last poll
+        self._sql = {
+            t: (f"SELECT {', '.join(LIST_COLUMNS[t])} FROM {t} "
+                f"WHERE updated_at >= %s - INTERVAL %s MICROSECOND ORDER BY updated_at LIMIT %s")
+            for t in tables}
+
+    def poll(self):
+        """Changes since the last poll (worker thread).
+
+        Returns {table: (changed_rows, deleted_ids, truncated)}; empty on
+        the first call, which only sets the high-water mark.
+        """
+        now = run_query("SELECT NOW(6)")[0][0]
+        since, self.hwm = self.hwm, now
+        if since is None:
+            return {}
+        overlap = int(self.config["overlap"] * 1e6)
+        limit = self.config["max_rows"]
+        changes = {}
+        for t in self.tables:
+            rows = run_query(self._sql[t], (since, overlap, limit + 1))
+            changes[t] = (rows[:limit], [], len(rows) > limit)
+        for table, row_id in run_query(
+                """SELECT table_name, row_id FROM tombstones
+                   WHERE deleted_at >= %s - INTERVAL %s MICROSECOND""", (since, overlap)):
+            if table in changes:
+                changes[table][1].append(row_id)
+        return {t: c for t, c in changes.items() if c[0] or c[1]}
+
+def purge(days=None):
+    days = SYNC_CONFIG["tombstone_days"] if days is None else days
+    with get_conn() as con:
+        cur = con.cursor()
+        try:
+            con.start_transaction()
+            cur.execute("DELETE FROM tombstones WHERE deleted_at < NOW(6) - INTERVAL %s DAY", (days,))
+            n = cur.rowcount
+            con.commit()
+        finally:
+            cur.close()
+    return n
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Change-tracking maintenance.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("purge", help="delete tombstones older than --days")
+    p.add_argument("--days", type=int, default=SYNC_CONFIG["tombstone_days"])
+    args = ap.parse_args(argv)
+    print(f"{purge(args.days):,} tombstone(s) purged.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+# Lost & Found DBMS Project - Database helpers (MySQL)
+# ------------------------------------------------
+# - DB_CONFIG / POOL_CONFIG: connection settings
+# - ConnectionPool: reusable warm connections (size, health check, checkout timeout)
+# - StatementCache: per-connection LRU of server-side prepared statements
+# - run_query / run_exec / call_proc: the helpers used by the GUI
+#   (every call is timed into profiler.profiler)
+# - table_version(): per-table write counters for client-side caches
+# - STORAGE_CONFIG / BACKENDS: which pool the helpers draw from; "mysql"
+#   (the server in DB_CONFIG) or "sqlite" (embedded, sqlite_backend.py)
+#
+# Requirements: pip install mysql-connector-python
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector.errors import InterfaceError, OperationalError, PoolError
+
+from profiler import profiler
+
+# ---------------------- CONFIG ----------------------
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",
+    "password": "Singh@786",
+    "database": "lostfound"
+}
+
+POOL_CONFIG = {
+    "size": 5,                # max open connections
+    "checkout_timeout": 10.0, # seconds to wait for a free connection
+    "ping_after": 30.0,       # idle seconds before a connection is health-checked
+    "stmt_cache_size": 64,    # prepared statements kept per connection (0 = off)
+}
+
+STORAGE_CONFIG = {
+    "backend": os.environ.get("LOSTFOUND_BACKEND", "mysql"),   # key of BACKENDS
+}
+
+# ---------------------- PREPARED STATEMENT CACHE ----------------------
+ER_UNKNOWN_STMT_HANDLER = 1243
+ER_UNSUPPORTED_PS = 1295
+ER_MAX_PREPARED_STMT_COUNT_REACHED = 1461
+ER_NEED_REPREPARE = 1615
+
+_unpreparable = set()         # SQL texts the server refused to prepare
+
+class StatementCache:
+    """Server-side prepared statements of one connection, LRU by SQL text.
+
+    The statement is parsed once per connection; later calls only send the
+    statement id and the bound values. Connector/Python re-uses a prepared
+    cursor's statement only when execute() gets the very same string object,
+    so each cursor is kept with the text it was prepared from.
+    """
+
+    def __init__(self, con, size, count):
+        self.con = con
+        self.size = size
+        self._count = count       # count(stat_name): the pool's counters
+        self._cursors = OrderedDict()   # sql -> (prepared cursor, sql)
+
+    def execute(self, sql, params):
+        """Execute `sql` prepared and return its cursor (owned by the cache).
+
+        Returns None, without executing anything, when the statement can
+        not be prepared; the caller then uses a plain cursor.
+        """
+        if sql in _unpreparable or "%" in sql.replace("%s", ""):
+            # Literal % / %% mean different things to the two protocols
+            self._count("stmt_fallbacks")
+            return None
+        entry = self._cursors.get(sql)
+        if entry is not None:
+            cur, text = entry
+            self._cursors.move_to_end(sql)
+            try:
+                cur.execute(text, params)
+                self._count("stmt_hits")
+                return cur
+            except Error as e:
+                if e.errno not in (ER_UNKNOWN_STMT_HANDLER, ER_NEED_REPREPARE):
+                    raise
+                self._drop(sql)   # gone on the server side: prepare it again
+        self._count("stmt_misses")
+        cur = self.con.cursor(prepared=True)
+        try:
+            cur.execute(sql, params)
+        except Error as e:
+            self._close(cur)
+            if e.errno == ER_UNSUPPORTED_PS:
+                _unpreparable.add(sql)
+            elif e.errno != ER_MAX_PREPARED_STMT_COUNT_REACHED:
+                raise
+            self._count("stmt_fallbacks")
+            return None
+        self._cursors[sql] = (cur, sql)
+        while len(self._cursors) > self.size:
+            _, (old, _) = self._cursors.popitem(last=False)
+            self._close(old)
+            self._count("stmt_evictions")
+        return cur
+
+    def _drop(self, sql):
+        cur, _ = self._cursors.pop(sql)
+        self._close(cur)
+
+    @staticmethod
+    def _close(cur):
+        try:
+            cur.close()       # deallocates the statement on the server
+        except Error:
+            pass
+
+    def __len__(self):
+        return len(self._cursors)
+
+# ---------------------- CONNECTION POOL ----------------------
+class ConnectionPool:
+    """Thread-safe pool of MySQL connections.
+
+    Connections are opened lazily up to `size`. A connection that sat idle
+    longer than `ping_after` seconds is pinged on checkout and reopened if
+    the server dropped it. When all connections are busy, checkout waits up
+    to `checkout_timeout` seconds and then raises PoolError. Each connection
+    carries a StatementCache of up to `stmt_cache_size` prepared statements.
+    """
+
+    def __init__(self, db_config, size=5, checkout_timeout=10.0, ping_after=30.0,
+                 stmt_cache_size=64):
+        self.db_config = dict(db_config)
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.ping_after = ping_after
+        self.stmt_cache_size = stmt_cache_size
+        self._idle = []          # [(con, last_used)], most recently used last
+        self._open = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stats = {"checkouts": 0, "hits": 0, "misses": 0, "waits": 0,
+                      "timeouts": 0, "reconnects": 0, "discarded": 0,
+                      "stmt_hits": 0, "stmt_misses": 0, "stmt_evictions": 0, "stmt_fallbacks": 0}
+
+    def _connect(self):
+        con = mysql.connector.connect(**self.db_config)
+        # Pooled connections outlive a single call, so plain reads must not
+        # leave a REPEATABLE READ snapshot open; writes start transactions.
+        con.autocommit = True
+        # Prepared statements live and die with their connection
+        con.stmt_cache = (StatementCache(con, self.stmt_cache_size, self._count)
+                          if self.stmt_cache_size > 0 else None)
+        return con
+
+    def _count(self, name):
+        with self._cond:
+            self.stats[name] += 1
+
+    def _check_health(self, con, last_used):
+        # Recently used: trust it without a round trip to the server
+        if time.monotonic() - last_used < self.ping_after:
+            return con
+        try:
+            con.ping(reconnect=False)
+            return con
+        except Error:
+            with self._cond:
+                self.stats["reconnects"] += 1
+            try:
+                con.close()
+            except Error:
+                pass
+            return self._connect()
+
+    def acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._cond:
+            if self._closed:
+                raise PoolError("Connection pool is closed")
+            self.stats["checkouts"] += 1
+            waited = False
+            while not self._idle and self._open >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats["timeouts"] += 1
+                    raise PoolError(
+                        f"No free connection after {self.checkout_timeout}s "
+                        f"(pool size {self.size})")
+                if not waited:
+                    self.stats["waits"] += 1
+                    waited = True
+                self._cond.wait(remaining)
+            if self._idle:
+                con, last_used = self._idle.pop()
+                self.stats["hits"] += 1
+            else:
+                con, last_used = None, None
+                self._open += 1
+                self.stats["misses"] += 1
+        # Network work happens outside the lock
+        try:
+            if con is None:
+                return self._connect()
+            return self._check_health(con, last_used)
+        except Exception:
+            self._forget()
+            raise
+
+    def release(self, con, broken=False):
+        if not broken:
+            try:
+                if con.in_transaction:
+                    con.rollback()
+            except Error:
+                broken = True
+        if broken or self._closed:
+            if broken:
+                with self._cond:
+                    self.stats["discarded"] += 1
+            try:
+                con.close()
+            except Error:
+                pass
+            self._forget()
+            return
+        with self._cond:
+            self._idle.append((con, time.monotonic()))
+            self._cond.notify()
+
+    def _forget(self):
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for con, _ in idle:
+            try:
+                con.close()
+            except Error:
+                pass
+
+    def snapshot(self):
+        with self._cond:
+            data = dict(self.stats)
+            data.update(size=self.size, open=self._open, idle=len(self._idle))
+        return data
+
+# ---------------------- BACKENDS ----------------------
+# name -> factory of the pool behind the helpers. A pool hands out
+# connections with the mysql.connector calls used here (cursor(),
+# start_transaction(), commit(), rollback(), callproc(), ...).
+def _mysql_pool():
+    return ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+
+def _sqlite_pool():
+    from sqlite_backend import SQLitePool
+    return SQLitePool(**POOL_CONFIG)
+
+BACKENDS = {"mysql": _mysql_pool, "sqlite": _sqlite_pool}
+
+def backend_name():
+    return STORAGE_CONFIG["backend"]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            backend = STORAGE_CONFIG["backend"]
+            if backend not in BACKENDS:
+                raise ValueError(f"Unknown storage backend {backend!r}; choose from {', '.join(BACKENDS)}")
+            _pool = BACKENDS[backend]()
+        return _pool
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+def pool_stats():
+    return get_pool().snapshot()
+
+# ---------------------- WRITE TRACKING ----------------------
+# Every write that goes through the helpers bumps a version counter for
+# the tables it touches (plus the tables their triggers write), so caches
+# can tell whether what they hold is still current by comparing versions.
+_WRITE_TARGET = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)", re.I)
+
+PROC_WRITES = {
+    "add_item": ("items",),
+    "update_claim_status": ("claims",),
+    "batch_claim_status": ("claims",),
+}
+
+TRIGGER_WRITES = {
+    "items": ("item_events", "item_category_counts", "user_item_counts"),
+    "claims": ("items", "claim_status_counts"),
+}
+
+_versions = {}
+_versions_lock = threading.Lock()
+
+def written_tables(sql):
+    m = _WRITE_TARGET.match(sql)
+    return (m.group(1).lower(),) if m else ()
+
+def note_write(*tables):
+    # Bump the version of each table and of everything its triggers touch
+    seen = set()
+    todo = list(tables)
+    while todo:
+        t = todo.pop()
+        if t not in seen:
+            seen.add(t)
+            todo.extend(TRIGGER_WRITES.get(t, ()))
+    with _versions_lock:
+        for t in seen:
+            _versions[t] = _versions.get(t, 0) + 1
+
+def table_version(table):
+    with _versions_lock:
+        return _versions.get(table, 0)
+
+# ---------------------- DB HELPERS ----------------------
+@contextmanager
+def get_conn():
+    # Checked-out connection; an unfinished transaction is rolled back on release
+    pool = get_pool()
+    con = pool.acquire()
+    broken = False
+    try:
+        yield con
+    except (InterfaceError, OperationalError):
+        # Lost connection / server gone: do not hand it back out
+        broken = True
+        raise
+    finally:
+        pool.release(con, broken=broken)
+
+def execute(con, sql, params=None):
+    """Execute on `con`, prepared when possible; returns (cursor, owned).
+
+    A cached prepared cursor belongs to the connection's StatementCache;
+    only an owned (plain) cursor is for the caller to close.
+    """
+    cache = getattr(con, "stmt_cache", None)
+    if cache is not None:
+        cur = cache.execute(sql, tuple(params or ()))
+        if cur is not None:
+            return cur, False
+    cur = con.cursor()
+    try:
+        cur.execute(sql, params or ())
+    except BaseException:
+        cur.close()
+        raise
+    return cur, True
+
+def run_query(sql, params=None):
+    t0 = time.perf_counter()
+    with get_conn() as con:
+        t1 = time.perf_counter()
+        cur, owned = None, False
+        t2 = t3 = t1
+        rows = None
+        try:
+            cur, owned = execute(con, sql, params)
+            t2 = time.perf_counter()
+            rows = cur.fetchall()
+            t3 = time.perf_counter()
+            return rows
+        finally:
+            if owned:
+                cur.close()
+            profiler.record(sql, t1 - t0, t2 - t1, t3 - t2,
+                            len(rows) if rows is not None else 0, params,
+                            error=None if rows is not None else True)
+
+def run_exec(sql, params=None, many=False):
+    t0 = time.perf_counter()
+    with get_conn() as con:
+        t1 = time.perf_counter()
+        cur, owned = None, False
+        ok = False
+        try:
+            con.start_transaction()
+            if many:
+                # Batches stay on a plain cursor: executemany() rewrites an
+                # INSERT into one multi-row statement, prepared would loop
+                cur, owned = con.cursor(), True
+                cur.executemany(sql, params)
+            else:
+                cur, owned = execute(con, sql, params)
+            con.commit()
+            ok = True
+            note_write(*written_tables(sql))
+            return cur.rowcount
+        finally:
+            t2 = time.perf_counter()
+            profiler.record(sql, t1 - t0, t2 - t1, 0.0, cur.rowcount if ok else 0,
+                            None if many else params, error=None if ok else True)
+            if owned:
+                cur.close()
+
+def call_proc(name, params=()):
+    t0 = time.perf_counter()
+    with get_conn() as con:
+        t1 = time.perf_counter()
+        cur = con.cursor()
+        t2 = t1
+        results = None
+        try:
+            con.start_transaction()
+            cur.callproc(name, params)
+            t2 = time.perf_counter()
+            # Collect any result sets from procedures (if they SELECT)
+            results = []
+            for result in cur.stored_results():
+                results.extend(result.fetchall())
+            con.commit()
+            note_write(*PROC_WRITES.get(name, ()))
+            return results
+        finally:
+            t3 = time.perf_counter()
+            profiler.record(f"CALL {name}({', '.join(['%s'] * len(params))})",
+                            t1 - t0, t2 - t1, t3 - t2, len(results or ()), params,
+                            error=None if results is not None else True)
+            cur.close()
@@ -0,0 +1,230 @@
+# Lost & Found DBMS Project - Streaming export (CSV / JSONL / Parquet)
+# ------------------------------------------------
+# Exports a table or a Query Hub result without materializing it:
+# rows are read from an unbuffered cursor (the server streams the result
+# set, the client holds one chunk at a time) with fetchmany(chunk_size)
+# and written out chunk by chunk, so memory stays flat for millions of
+# items / claims rows.
+# - CSV and JSONL need nothing extra.
+# - Parquet (columnar, one row group per chunk) needs pyarrow:
+#   pip install pyarrow
+#   The file schema comes from the cursor's column types, so a column that
+#   is all NULL in the first chunk still gets its real type.
+#
+# Headless usage:
+#   python export.py items items.csv
+#   python export.py join claims_report.jsonl --chunk-size 10000
+#   python export.py claims claims.parquet
+
+import argparse
+import csv
+import datetime
+import decimal
+import json
+import os
+import time
+
+from mysql.connector import FieldType
+
+from db import get_conn
+from queries import TABLE_SQL, TABLE_COLUMNS, QUERY_HUB
+
+DEFAULT_CHUNK_SIZE = 5000
+FORMATS = ("csv", "jsonl", "parquet")
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    if ext in ("parquet", "pq"):
+        return "parquet"
+    return "csv"
+
+def export_source(name):
+    # Table or Query Hub query -> (sql, column names)
+    if name in TABLE_SQL:
+        return TABLE_SQL[name], TABLE_COLUMNS[name]
+    if name in QUERY_HUB:
+        return QUERY_HUB[name]
+    raise ValueError(f"Unknown export source {name!r}; choose from "
+                     f"{', '.join(list(TABLE_SQL) + list(QUERY_HUB))}")
+
+# ---------------------- READING ----------------------
+def stream_rows(sql, params=None, chunk_size=DEFAULT_CHUNK_SIZE, on_describe=None):
+    """Yield lists of up to chunk_size rows from an unbuffered cursor.
+
+    on_describe(cursor.description) is called once, before the first chunk.
+    """
+    with get_conn() as con:
+        cur = con.cursor(buffered=False)
+        try:
+            cur.execute(sql, params or ())
+            if on_describe:
+                on_describe(cur.description)
+            while True:
+                chunk = cur.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            # Drain anything left (e.g. the consumer stopped early) so the
+            # connection can go back to the pool
+            try:
+                cur.fetchall()
+            except Exception:
+                pass
+            cur.close()
+
+# ---------------------- WRITERS ----------------------
+def _plain(v):
+    if isinstance(v, (datetime.date, datetime.datetime)):
+        return v.isoformat()
+    if isinstance(v, decimal.Decimal):
+        return str(v)
+    if isinstance(v, (bytes, bytearray)):
+        return v.decode("utf-8", "replace")
+    return v
+
+class CsvWriter:
+    def __init__(self, path, columns):
+        self._f = open(path, "w", newline="", encoding="utf-8")
+        self._w = csv.writer(self._f)
+        self._w.writerow(columns)
+
+    def write(self, chunk):
+        self._w.writerows(chunk)
+
+    def close(self):
+        self._f.close()
+
+class JsonlWriter:
+    def __init__(self, path, columns):
+        self._f = open(path, "w", encoding="utf-8")
+        self.columns = columns
+
+    def write(self, chunk):
+        cols = self.columns
+        self._f.writelines(
+            json.dumps({c: _plain(v) for c, v in zip(cols, r)}) + "\n" for r in chunk)
+
+    def close(self):
+        self._f.close()
+
+# MySQL column type -> Arrow type name; anything else is written as text
+ARROW_TYPES = {
+    FieldType.TINY: "int64", FieldType.SHORT: "int64", FieldType.LONG: "int64",
+    FieldType.INT24: "int64", FieldType.LONGLONG: "int64", FieldType.YEAR: "int64",
+    FieldType.BIT: "int64",
+    FieldType.FLOAT: "float64", FieldType.DOUBLE: "float64",
+    FieldType.DECIMAL: "float64", FieldType.NEWDECIMAL: "float64",
+    FieldType.DATE: "date32", FieldType.NEWDATE: "date32",
+    FieldType.DATETIME: "timestamp", FieldType.TIMESTAMP: "timestamp",
+    FieldType.TIME: "duration",
+}
+
+class ParquetWriter:
+    def __init__(self, path, columns):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.path = path
+        self.columns = columns
+        self.types = [None] * len(columns)   # Arrow type per column; None: from the first chunk
+        self._w = None
+
+    def describe(self, description):
+        # Column types from the cursor; a backend without MySQL type codes
+        # (SQLite) leaves them to the first chunk's values
+        pa = self._pa
+        known = {"int64": pa.int64(), "float64": pa.float64(), "date32": pa.date32(),
+                 "timestamp": pa.timestamp("us"), "duration": pa.duration("us")}
+        for i, d in enumerate((description or ())[:len(self.columns)]):
+            if d[1] is not None:
+                self.types[i] = known.get(ARROW_TYPES.get(d[1]), pa.string())
+
+    def _array(self, i, values):
+        pa = self._pa
+        t = self.types[i]
+        if t is None:
+            # Untyped: value-based, except an all-NULL column is text
+            t = pa.string() if all(v is None for v in values) else pa.array(values).type
+            self.types[i] = t
+        if t == pa.string():
+            values = [None if v is None else str(_plain(v)) for v in values]
+        elif t == pa.float64():
+            values = [None if v is None else float(v) for v in values]
+        return pa.array(values, type=t)
+
+    def write(self, chunk):
+        # One row group per chunk: transpose rows into column arrays
+        arrays = [self._array(i, [r[i] for r in chunk]) for i in range(len(self.columns))]
+        table = self._pa.Table.from_arrays(arrays, names=self.columns)
+        if self._w is None:
+            self._w = self._pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = table.cast(self._w.schema)
+        self._w.write_table(table)
+
+    def close(self):
+        if self._w is None:
+            # Empty result: still produce a valid file with the column names
+            pa = self._pa
+            empty = pa.Table.from_arrays([pa.array([], type=t or pa.null()) for t in self.types],
+                                         names=self.columns)
+            self._pq.write_table(empty, self.path)
+        else:
+            self._w.close()
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+# ---------------------- EXPORT ----------------------
+def export_query(sql, columns, path, fmt=None, params=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE, on_progress=None):
+    """Stream the result of `sql` into `path`; returns a summary dict.
+
+    on_progress(rows_written) is called after every chunk (calling thread).
+    """
+    fmt = fmt or detect_format(path)
+    started = time.perf_counter()
+    writer = WRITERS[fmt](path, list(columns))
+    rows = 0
+    try:
+        for chunk in stream_rows(sql, params, chunk_size, getattr(writer, "describe", None)):
+            writer.write(chunk)
+            rows += len(chunk)
+            if on_progress:
+                on_progress(rows)
+    finally:
+        writer.close()
+    return {"path": path, "format": fmt, "rows": rows,
+            "seconds": round(time.perf_counter() - started, 3)}
+
+def export(name, path, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE, on_progress=None):
+    sql, columns = export_source(name)
+    return export_query(sql, columns, path, fmt, chunk_size=chunk_size, on_progress=on_progress)
+
+def format_summary(result):
+    return (f"Exported {result['rows']:,} rows to {result['path']} "
+            f"({result['format']}, {result['seconds']}s).")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Stream a table or Query Hub result to a file.")
+    ap.add_argument("source", choices=list(TABLE_SQL) + list(QUERY_HUB))
+    ap.add_argument("path")
+    ap.add_argument("--format", choices=FORMATS)
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = ap.parse_args(argv)
+
+    def progress(rows):
+        print(f"\r{rows:,} rows", end="", flush=True)
+
+    result = export(args.source, args.path, args.format, args.chunk_size, progress)
+    print()
+    print(format_summary(result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# Lost & Found DBMS Project - Load test for service.py
+# ------------------------------------------------
+# Runs `concurrency` simulated clients against the HTTP service, each on
+# its own keep-alive connection sending one request after another,
+# for `duration` seconds per level, at increasing levels. For every level it
+# reports throughput (successful requests / s), p50 / p99 / max latency
+# and how many requests were shed with 503 (backpressure) or failed.
+#
+# Request mixes:
+#   read   keyset pages, single rows, Query Hub queries, item counts
+#   mixed  read + 10% writes (new claims on existing items; they stay in
+#          the database, so point it at a test copy)
+#
+# Usage:
+#   python loadtest.py [--url http://127.0.0.1:8080] [--levels 1,2,4,8,16,32,64]
+#                      [--duration 10] [--mix read] [--spawn] [--out load.json]
+# --spawn starts `python service.py` on the given port for the run.
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from profiler import percentile
+
+LOADTEST_CONFIG = {
+    "levels": [1, 2, 4, 8, 16, 32, 64],
+    "duration": 10.0,         # seconds per level
+    "timeout": 30.0,          # seconds per request
+    "sample_ids": 500,        # user / item ids fetched up front to pick from
+}
+
+class Client:
+    """Minimal HTTP/1.1 keep-alive client (one connection, one request at a time)."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, data=None):
+        """(status, decoded JSON body)."""
+        body = json.dumps(data).encode("utf-8") if data is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        for attempt in (0, 1):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                self.writer.write(head.encode("latin-1") + body)
+                await self.writer.drain()
+                return await self._response()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Server closed the keep-alive connection: reconnect once
+                self.close()
+                if attempt:
+                    raise
+
+    async def _response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, json.loads(body) if body else None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+# ---------------------- REQUEST MIXES ----------------------
+def read_requests(rng, ids):
+    users, items = ids["users"], ids["items"]
+    choices = [
+        (30, lambda: ("GET", f"/items?after={rng.choice(items) if items else 0}&limit=50", None)),
+        (25, lambda: ("GET", f"/items/{rng.choice(items) if items else 1}", None)),
+        (10, lambda: ("GET", f"/users/{rng.choice(users) if users else 1}", None)),
+        (15, lambda: ("GET", f"/queries/{rng.choice(['nested', 'aggregate', 'claim_status'])}", None)),
+        (10, lambda: ("GET", f"/users/{rng.choice(users) if users else 1}/item-count", None)),
+        (10, lambda: ("GET", "/claims?limit=50", None)),
+    ]
+    return choices
+
+def mixed_requests(rng, ids):
+    choices = read_requests(rng, ids)
+    if ids["users"] and ids["items"]:
+        choices.append((10, lambda: ("POST", "/claims", {
+            "item_id": rng.choice(ids["items"]), "claimer_id": rng.choice(ids["users"]),
+            "remarks": "loadtest"})))
+    return choices
+
+MIXES = {"read": read_requests, "mixed": mixed_requests}
+
+def picker(choices, rng):
+    weights = [w for w, _ in choices]
+    makers = [m for _, m in choices]
+    return lambda: rng.choices(makers, weights)[0]()
+
+# ---------------------- RUN ----------------------
+async def sample_ids(host, port, n):
+    client = Client(host, port)
+    try:
+        ids = {}
+        for entity, key in (("users", "user_id"), ("items", "item_id")):
+            status, body = await client.request("GET", f"/{entity}?limit={n}")
+            if status != 200:
+                raise RuntimeError(f"GET /{entity} returned {status}: {body}")
+            ids[entity] = [r[key] for r in body["rows"]]
+        return ids
+    finally:
+        client.close()
+
+async def run_level(host, port, concurrency, duration, mix, ids, seed, timeout):
+    latencies = []
+    counts = {"ok": 0, "shed": 0, "errors": 0}
+    deadline = time.perf_counter() + duration
+
+    async def user(n):
+        rng = random.Random(seed * 1000 + n)
+        next_request = picker(MIXES[mix](rng, ids), rng)
+        client = Client(host, port)
+        try:
+            while time.perf_counter() < deadline:
+                method, path, data = next_request()
+                t0 = time.perf_counter()
+                try:
+                    status, _ = await asyncio.wait_for(client.request(method, path, data), timeout)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                    counts["errors"] += 1
+                    client.close()
+                    continue
+                if status == 503:
+                    counts["shed"] += 1
+                    await asyncio.sleep(0.01)
+                elif status < 400:
+                    counts["ok"] += 1
+                    latencies.append((time.perf_counter() - t0) * 1000.0)
+                else:
+                    counts["errors"] += 1
+        finally:
+            client.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(user(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    values = sorted(latencies)
+    return {"concurrency": concurrency, "seconds": round(elapsed, 3),
+            "requests": counts["ok"], "shed_503": counts["shed"], "errors": counts["errors"],
+            "throughput": round(counts["ok"] / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(values, 50), 3), "p99_ms": round(percentile(values, 99), 3),
+            "max_ms": round(values[-1], 3) if values else 0.0}
+
+async def run(url, levels, duration, mix, seed=1, timeout=None, log=print):
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    timeout = timeout or LOADTEST_CONFIG["timeout"]
+    ids = await sample_ids(host, port, LOADTEST_CONFIG["sample_ids"])
+    log(f"{'clients':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'503s':>6} {'errors':>6}")
+    results = []
+    for level in levels:
+        r = await run_level(host, port, level, duration, mix, ids, seed, timeout)
+        results.append(r)
+        log(f"{r['concurrency']:>7} {r['throughput']:>9.1f} {r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f} "
+            f"{r['max_ms']:>9.2f} {r['shed_503']:>6} {r['errors']:>6}")
+    return results
+
+def spawn_service(url):
+    # python service.py on the port of `url`; returns the process once /health answers
+    parts = urlsplit(url)
+    proc = subprocess.Popen([sys.executable, "service.py", "--host", parts.hostname or "127.0.0.1",
+                             "--port", str(parts.port or 80)])
+
+    async def wait_ready():
+        client = Client(parts.hostname or "127.0.0.1", parts.port or 80)
+        for _ in range(100):
+            try:
+                status, _ = await client.request("GET", "/health")
+                if status == 200:
+                    return
+            except OSError:
+                await asyncio.sleep(0.1)
+            finally:
+                client.close()
+        raise RuntimeError("service did not start")
+
+    try:
+        asyncio.run(wait_ready())
+    except BaseException:
+        proc.terminate()
+        raise
+    return proc
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Load test the HTTP service.")
+    ap.add_argument("--url", default="http://127.0.0.1:8080")
+    ap.add_argument("--levels", default=",".join(map(str, LOADTEST_CONFIG["levels"])),
+                    help="comma-separated client counts")
+    ap.add_argument("--duration", type=float, default=LOADTEST_CONFIG["duration"])
+    ap.add_argument("--mix", choices=sorted(MIXES), default="read")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--spawn", action="store_true", help="start service.py for the run")
+    ap.add_argument("--out", help="also write the results as JSON")
+    args = ap.parse_args(argv)
+    levels = [int(n) for n in args.levels.split(",") if n.strip()]
+    proc = spawn_service(args.url) if args.spawn else None
+    try:
+        results = asyncio.run(run(args.url, levels, args.duration, args.mix, args.seed))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"url": args.url, "mix": args.mix, "duration": args.duration,
+                       "levels": results}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Lost & Found DBMS Project - Cached id/label lookups for the dropdowns
+# ------------------------------------------------
+# The user and location comboboxes used to re-query and rebuild their
+# full value lists after every write. A Lookup holds id -> label and
+# label -> id maps for one table and reloads only when
+# - a write through the DB helpers bumped the table's version
+#   (db.table_version), or
+# - `max_age` seconds passed (writes made by other clients).
+# Comboboxes are filled lazily with matches for what the user typed
+# (see filter()), never with the whole table.
+
+import threading
+import time
+
+from db import run_query, table_version
+from model import make_label
+
+class Lookup:
+    def __init__(self, table, sql, max_age=60.0):
+        self.table = table
+        self.sql = sql            # must return (id, name) rows
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._version = None
+        self._loaded_at = 0.0
+        self.by_id = {}           # id -> label
+        self.by_label = {}        # label -> id
+        self.labels = []          # labels in query order
+        self._search = []         # (lowercased name, label) for filter()
+
+    def stale(self):
+        return (self._version != table_version(self.table)
+                or time.monotonic() - self._loaded_at > self.max_age)
+
+    def get(self):
+        """Reload if stale (worker thread); returns True if the data changed."""
+        if not self.stale():
+            return False
+        version = table_version(self.table)
+        rows = run_query(self.sql)
+        by_id, by_label, labels, search = {}, {}, [], []
+        for row_id, name in rows:
+            label = make_label(row_id, name)
+            by_id[row_id] = label
+            by_label[label] = row_id
+            labels.append(label)
+            search.append((str(name).lower(), label))
+        with self._lock:
+            self.by_id, self.by_label, self.labels, self._search = by_id, by_label, labels, search
+            self._version = version
+            self._loaded_at = time.monotonic()
+        return True
+
+    def invalidate(self):
+        self._version = None
+
+    def label_for(self, row_id):
+        return self.by_id.get(row_id)
+
+    def id_for(self, text):
+        """Id for a label picked from the list, or for a bare typed id."""
+        text = text.strip()
+        row_id = self.by_label.get(text)
+        if row_id is None and text.isdigit() and int(text) in self.by_id:
+            row_id = int(text)
+        return row_id
+
+    def filter(self, text, limit=100):
+        """Labels matching `text` (id prefix if numeric, else name substring)."""
+        text = text.strip()
+        if not text:
+            return self.labels[:limit]
+        if text in self.by_label:
+            return [text]
+        text = text.lower()
+        out = []
+        if text.isdigit():
+            for label in self.labels:
+                if label.startswith(text):
+                    out.append(label)
+                    if len(out) >= limit:
+                        break
+            return out
+        for name, label in self._search:
+            if text in name:
+                out.append(label)
+                if len(out) >= limit:
+                    break
+        return out
@@ -9,64 +9,35 @@
 #
 # Requirements: pip install mysql-connector-python
 
-import mysql.connector
-from mysql.connector import Error
-from tkinter import *
-from tkinter import ttk, messagebox
-
-# ---------------------- CONFIG ----------------------
-DB_CONFIG = {
-    "host": "localhost",
-    "user": "root",
-    "password": "Singh@786",        
-    "database": "lostfound"
-}
-
-# ---------------------- DB HELPERS ----------------------
-def get_conn():
-    return mysql.connector.connect(**DB_CONFIG)
+import time
+STARTUP_T0 = time.perf_counter()   # time to first paint is measured from here
 
-def run_query(sql, params=None):
-    con = get_conn()
-    try:
-        cur = con.cursor()
-        cur.execute(sql, params or ())
-        rows = cur.fetchall()
-        return rows
-    finally:
-        con.close()
-
-def run_exec(sql, params=None, many=False):
-    con = get_conn()
-    try:
-        cur = con.cursor()
-        if many:
-            cur.executemany(sql, params)
-        else:
-            cur.execute(sql, params or ())
-        con.commit()
-        return cur.rowcount
-    finally:
-        con.close()
-
-def call_proc(name, params=()):
-    con = get_conn()
-    try:
-        cur = con.cursor()
-        cur.callproc(name, params)
-        con.commit()
-        # Collect any result sets from procedures (if they SELECT)
-        results = []
-        for result in cur.stored_results():
-            results.extend(result.fetchall())
-        return results
-    finally:
-        con.close()
+import logging
+from datetime import date
+from tkinter import *
+from tkinter import ttk, messagebox, filedialog
+
+# DB_CONFIG / POOL_CONFIG and the pooled helpers live in db.py
+from db import run_query, close_pool, pool_stats, note_write
+from profiler import profiler, parse_plan_tree
+from tasks import DbExecutor
+from lookups import Lookup
+from model import EntityIndex
+from paging import PagedTable
+from bulk_import import import_file, format_summary
+from export import export_query, format_summary as export_summary
+from changes import SyncPoller, SYNC_CONFIG
+from matching import MatchIndex, claim_remark
+from search import search_items, format_summary as search_summary
+from querycache import result_cache, format_stats as cache_stats
+from archive import archive, ARCHIVE_TABLES, format_summary as archive_summary
+from queries import (TABLE_SQL, TABLE_COLUMNS, QUERY_HUB, QUERY_HUB_ARCHIVED, SORTABLE,
+                     COLUMN_KINDS, TOTAL_SQL)
+import repository
 
 # ---------------------- COMMON UI HELPERS ----------------------
 def clear_tree(tree):
-    for i in tree.get_children():
-        tree.delete(i)
+    tree.delete(*tree.get_children())
 
 def fill_tree(tree, rows, columns=None):
     # Clear old data
@@ -91,11 +62,150 @@ def msg_info(text):
 def msg_err(e):
     messagebox.showerror("Error", str(e))
 
+def db_task(channel, fn, on_done=None, key=None):
+    # Run fn() on the DB executor; on_done(result) runs back on the Tk thread.
+    # Jobs with the same key in a channel supersede each other (refreshes).
+    return executor.submit(channel, fn, on_done, msg_err, key)
+
+def import_dialog(entity, channel, on_done):
+    # Pick a CSV/JSONL file and bulk-import it on the DB executor
+    path = filedialog.askopenfilename(
+        title=f"Import {entity}",
+        filetypes=[("CSV / JSONL", "*.csv *.jsonl *.ndjson"), ("All files", "*.*")])
+    if not path:
+        return
+    def done(result):
+        on_done()
+        msg_info(format_summary(result))
+    db_task(channel, lambda: import_file(entity, path), done)
+
+def export_dialog(name, sql, columns, params=None):
+    # Stream a table / query result to CSV, JSONL or Parquet in the background
+    path = filedialog.asksaveasfilename(
+        title=f"Export {name}", initialfile=f"{name}.csv", defaultextension=".csv",
+        filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Parquet", "*.parquet")])
+    if not path:
+        return
+    def progress(rows):
+        executor.post(lambda n: lbl_status.config(text=f"Exporting {name}: {n:,} rows"), rows)
+    db_task("export", lambda: export_query(sql, columns, path, params=params, on_progress=progress),
+            lambda result: msg_info(export_summary(result)))
+
+def export_table(table):
+    export_dialog(table, TABLE_SQL[table], TABLE_COLUMNS[table])
+
+FILTER_DEBOUNCE_MS = 300
+
+def make_pager(tree, scrollbar, bar, channel, table, columns, key, model=None, filter_bar=None):
+    # Keyset-paged model for a table + First/Prev/Next/Last bar; headers
+    # sort (indexed columns, click again to reverse), filter_bar gets one
+    # filter box per column. Both run server side (paging.PagedTable).
+    lbl = Label(bar, anchor="w")
+    pager = PagedTable(tree, table, columns, key,
+                       lambda fn, done, failed: executor.submit(channel, fn, done, failed, "page"),
+                       on_status=lambda text: lbl.config(text=text),
+                       on_error=msg_err, scrollbar=scrollbar, model=model,
+                       sortable=SORTABLE[table], kinds=COLUMN_KINDS[table],
+                       totals=TOTAL_SQL)
+    Button(bar, text="|< First", command=pager.first).pack(side=LEFT, padx=2)
+    Button(bar, text="< Prev", command=pager.prev_page).pack(side=LEFT, padx=2)
+    Button(bar, text="Next >", command=pager.next_page).pack(side=LEFT, padx=2)
+    Button(bar, text="Last >|", command=pager.last).pack(side=LEFT, padx=2)
+    if table in ARCHIVE_TABLES:
+        # Off by default: the live table is the small, fast working set
+        archived = BooleanVar(value=False)
+        Checkbutton(bar, text="Include archived", variable=archived,
+                    command=lambda: pager.set_sources(
+                        [table, ARCHIVE_TABLES[table]] if archived.get() else [table])
+                    ).pack(side=LEFT, padx=6)
+    lbl.pack(side=LEFT, padx=10)
+
+    def sort(column):
+        try:
+            pager.sort_by(column)
+        except ValueError as e:
+            return lbl.config(text=str(e))
+        for c in columns:
+            mark = (" \u25bc" if pager.descending else " \u25b2") if c == column else ""
+            tree.heading(c, text=c.upper() + mark)
+    for c in columns:
+        tree.heading(c, text=c.upper(), command=lambda c=c: sort(c))
+
+    if filter_bar is not None:
+        boxes = {}
+        pending = {"after_id": None}
+        def apply(event=None):
+            pending["after_id"] = None
+            try:
+                pager.set_filters({c: e.get() for c, e in boxes.items()})
+            except ValueError as e:
+                lbl.config(text=str(e))    # still typing; keep the old filters
+        def schedule(event=None):
+            if pending["after_id"] is not None:
+                root.after_cancel(pending["after_id"])
+            pending["after_id"] = root.after(FILTER_DEBOUNCE_MS, apply)
+        def clear():
+            for e in boxes.values():
+                e.delete(0, END)
+            apply()
+        Label(filter_bar, text="Filter").pack(side=LEFT)
+        for c in columns:
+            Label(filter_bar, text=c).pack(side=LEFT, padx=(8, 2))
+            boxes[c] = Entry(filter_bar, width=9)
+            boxes[c].pack(side=LEFT)
+            boxes[c].bind("<KeyRelease>", schedule)
+            boxes[c].bind("<Return>", apply)
+        Button(filter_bar, text="Clear", command=clear).pack(side=LEFT, padx=8)
+    return pager
+
 # ---------------------- MAIN WINDOW ----------------------
 root = Tk()
 root.title("Lost & Found - DBMS Project (MySQL + Tkinter)")
 root.geometry("1100x700")
 
+# Status bar: which tabs have DB work in flight
+lbl_status = Label(root, text="Ready", anchor="w", relief=SUNKEN)
+lbl_status.pack(side=BOTTOM, fill=X)
+busy_channels = {}
+
+def show_busy(channel, in_flight):
+    if in_flight:
+        busy_channels[channel] = in_flight
+    else:
+        busy_channels.pop(channel, None)
+    if busy_channels:
+        lbl_status.config(text="Working: " + ", ".join(sorted(busy_channels)))
+        root.config(cursor="watch")
+    else:
+        lbl_status.config(text="Ready")
+        root.config(cursor="")
+        if startup["data_ms"] is None and startup["paint_ms"] is not None:
+            startup_data_ready()
+
+executor = DbExecutor(root, on_busy=show_busy)
+startup = {"paint_ms": None, "data_ms": None}   # see INITIAL LOAD
+
+# Cached dropdown data, reloaded only after writes to the table (or when old)
+users_lookup = Lookup("users", "SELECT user_id, name FROM users ORDER BY name")
+locs_lookup = Lookup("locations", "SELECT location_id, location_name FROM locations ORDER BY location_name")
+
+combo_lookups = {}   # combobox -> Lookup it picks from
+
+def bind_lookup(combo, lookup):
+    # Type-ahead: the dropdown only ever holds the matches for the typed text
+    combo_lookups[combo] = lookup
+    def fill(event=None):
+        combo["values"] = lookup.filter(combo.get())
+    combo.configure(postcommand=fill)
+    combo.bind("<KeyRelease>", fill)
+
+# Keyed records behind each tab's Treeview (iid = primary key), so
+# selection handlers never read values back out of the widgets
+users_model = EntityIndex("users")
+locs_model = EntityIndex("locations")
+items_model = EntityIndex("items")
+claims_model = EntityIndex("claims")
+
 nb = ttk.Notebook(root)
 nb.pack(fill=BOTH, expand=True)
 
@@ -106,11 +216,21 @@ tab_users = Frame(nb)
 nb.add(tab_users, text="Users")
 
 u_cols = ("user_id", "name", "email", "phone", "role")
-tree_users = ttk.Treeview(tab_users, columns=u_cols, show="headings", height=12)
+frm_u_filter = Frame(tab_users)
+frm_u_filter.pack(fill=X, padx=10, pady=(10, 0))
+frm_u_tree = Frame(tab_users)
+frm_u_tree.pack(fill=BOTH, expand=True, padx=10, pady=10)
+tree_users = ttk.Treeview(frm_u_tree, name="users", columns=u_cols, show="headings", height=12)
 for c in u_cols:
-    tree_users.heading(c, text=c.upper())
     tree_users.column(c, width=150 if c!="email" else 220)
-tree_users.pack(fill=BOTH, expand=True, padx=10, pady=10)
+sb_users = ttk.Scrollbar(frm_u_tree, orient=VERTICAL, command=tree_users.yview)
+sb_users.pack(side=RIGHT, fill=Y)
+tree_users.pack(side=LEFT, fill=BOTH, expand=True)
+
+frm_u_pg = Frame(tab_users)
+frm_u_pg.pack(fill=X, padx=10)
+pager_users = make_pager(tree_users, sb_users, frm_u_pg, "users", "users", u_cols, "user_id",
+                         users_model, frm_u_filter)
 
 frm_u = Frame(tab_users)
 frm_u.pack(fill=X, padx=10, pady=6)
@@ -133,66 +253,57 @@ cmb_u_role.set("student")
 cmb_u_role.grid(row=0, column=7, padx=5)
 
 def refresh_users():
-    try:
-        rows = run_query("SELECT user_id, name, email, phone, role FROM users ORDER BY user_id")
-        fill_tree(tree_users, rows)
-    except Exception as e:
-        msg_err(e)
+    pager_users.reload()
 
-def user_add():
-    try:
-        name = ent_u_name.get().strip()
-        email = ent_u_email.get().strip()
-        phone = ent_u_phone.get().strip()
-        role = cmb_u_role.get()
-        if not name or not email:
-            return msg_info("Name and Email are required.")
-        run_exec("INSERT INTO users(name,email,phone,role) VALUES(%s,%s,%s,%s)",
-                 (name, email, phone, role))
+def after_user_write(text):
+    def done(_):
         refresh_users()
         refresh_dropdowns()
-        msg_info("User added.")
-    except Error as e:
-        msg_err(e)
+        msg_info(text)
+    return done
+
+def user_add():
+    name = ent_u_name.get().strip()
+    email = ent_u_email.get().strip()
+    phone = ent_u_phone.get().strip()
+    role = cmb_u_role.get()
+    if not name or not email:
+        return msg_info("Name and Email are required.")
+    db_task("users",
+            lambda: repository.create("users", {"name": name, "email": email,
+                                                "phone": phone, "role": role}),
+            after_user_write("User added."))
 
 
 def user_update():
     sel = tree_users.selection()
     if not sel:
         return msg_info("Select a user row to update.")
-    user_id = tree_users.item(sel[0])["values"][0]
-    try:
-        run_exec("UPDATE users SET name=%s, email=%s, phone=%s, role=%s WHERE user_id=%s",
-                 (ent_u_name.get().strip(), ent_u_email.get().strip(),
-                  ent_u_phone.get().strip(), cmb_u_role.get(), user_id))
-        refresh_users()
-        refresh_dropdowns()
-        msg_info("User updated.")
-    except Error as e:
-        msg_err(e)
+    user_id = users_model.from_iid(sel[0]).user_id
+    values = {"name": ent_u_name.get().strip(), "email": ent_u_email.get().strip(),
+              "phone": ent_u_phone.get().strip(), "role": cmb_u_role.get()}
+    db_task("users",
+            lambda: repository.update("users", user_id, values),
+            after_user_write("User updated."))
 
 
 def user_delete():
     sel = tree_users.selection()
     if not sel:
         return msg_info("Select a user row to delete.")
-    user_id = tree_users.item(sel[0])["values"][0]
-    try:
-        run_exec("DELETE FROM users WHERE user_id=%s", (user_id,))
-        refresh_users()
-        refresh_dropdowns()
-        msg_info("User deleted.")
-    except Error as e:
-        msg_err(e)
+    user_id = users_model.from_iid(sel[0]).user_id
+    db_task("users",
+            lambda: repository.delete("users", user_id),
+            after_user_write("User deleted."))
 
 def user_on_select(event):
     sel = tree_users.selection()
     if not sel: return
-    vals = tree_users.item(sel[0])["values"]
-    ent_u_name.delete(0, END); ent_u_name.insert(0, vals[1])
-    ent_u_email.delete(0, END); ent_u_email.insert(0, vals[2])
-    ent_u_phone.delete(0, END); ent_u_phone.insert(0, vals[3])
-    cmb_u_role.set(vals[4])
+    u = users_model.from_iid(sel[0])
+    ent_u_name.delete(0, END); ent_u_name.insert(0, u.name)
+    ent_u_email.delete(0, END); ent_u_email.insert(0, u.email)
+    ent_u_phone.delete(0, END); ent_u_phone.insert(0, u.phone or "")
+    cmb_u_role.set(u.role)
 
 tree_users.bind("<<TreeviewSelect>>", user_on_select)
 
@@ -202,6 +313,10 @@ Button(btn_u_bar, text="Add User", command=user_add, bg="#b6f2b6").pack(side=LEF
 Button(btn_u_bar, text="Update User", command=user_update, bg="#ffd27f").pack(side=LEFT, padx=4)
 Button(btn_u_bar, text="Delete User", command=user_delete, bg="#ff9a9a").pack(side=LEFT, padx=4)
 Button(btn_u_bar, text="Refresh", command=refresh_users).pack(side=LEFT, padx=4)
+Button(btn_u_bar, text="Import CSV/JSONL",
+       command=lambda: import_dialog("users", "users", lambda: (refresh_users(), refresh_dropdowns()))
+       ).pack(side=LEFT, padx=4)
+Button(btn_u_bar, text="Export...", command=lambda: export_table("users")).pack(side=LEFT, padx=4)
 
 # ============================================================
 # TAB 2: LOCATIONS (CRUD)
@@ -210,11 +325,21 @@ tab_locs = Frame(nb)
 nb.add(tab_locs, text="Locations")
 
 l_cols = ("location_id", "location_name", "building", "floor_no")
-tree_locs = ttk.Treeview(tab_locs, columns=l_cols, show="headings", height=10)
+frm_l_filter = Frame(tab_locs)
+frm_l_filter.pack(fill=X, padx=10, pady=(10, 0))
+frm_l_tree = Frame(tab_locs)
+frm_l_tree.pack(fill=BOTH, expand=True, padx=10, pady=10)
+tree_locs = ttk.Treeview(frm_l_tree, name="locations", columns=l_cols, show="headings", height=10)
 for c in l_cols:
-    tree_locs.heading(c, text=c.upper())
     tree_locs.column(c, width=200 if c=="location_name" else 120)
-tree_locs.pack(fill=BOTH, expand=True, padx=10, pady=10)
+sb_locs = ttk.Scrollbar(frm_l_tree, orient=VERTICAL, command=tree_locs.yview)
+sb_locs.pack(side=RIGHT, fill=Y)
+tree_locs.pack(side=LEFT, fill=BOTH, expand=True)
+
+frm_l_pg = Frame(tab_locs)
+frm_l_pg.pack(fill=X, padx=10)
+pager_locs = make_pager(tree_locs, sb_locs, frm_l_pg, "locations", "locations", l_cols, "location_id",
+                        locs_model, frm_l_filter)
 
 frm_l = Frame(tab_locs)
 frm_l.pack(fill=X, padx=10, pady=6)
@@ -232,55 +357,49 @@ ent_l_floor = Entry(frm_l, width=8)
 ent_l_floor.grid(row=0, column=5, padx=5)
 
 def refresh_locs():
-    try:
-        rows = run_query("SELECT location_id, location_name, building, floor_no FROM locations ORDER BY location_id")
-        fill_tree(tree_locs, rows)
-        refresh_dropdowns()  # keep dependent dropdowns in sync
-    except Exception as e:
-        msg_err(e)
+    pager_locs.reload()
+    refresh_dropdowns()  # keep dependent dropdowns in sync
 
-def loc_add():
-    try:
-        run_exec("INSERT INTO locations(location_name,building,floor_no) VALUES(%s,%s,%s)",
-                 (ent_l_name.get().strip(), ent_l_building.get().strip(), ent_l_floor.get() or None))
+def after_loc_write(text):
+    def done(_):
         refresh_locs()
-        msg_info("Location added.")
-    except Error as e:
-        msg_err(e)
+        msg_info(text)
+    return done
+
+def loc_add():
+    values = {"location_name": ent_l_name.get().strip(), "building": ent_l_building.get().strip(),
+              "floor_no": ent_l_floor.get() or None}
+    db_task("locations",
+            lambda: repository.create("locations", values),
+            after_loc_write("Location added."))
 
 def loc_update():
     sel = tree_locs.selection()
     if not sel:
         return msg_info("Select a location row to update.")
-    loc_id = tree_locs.item(sel[0])["values"][0]
-    try:
-        run_exec("UPDATE locations SET location_name=%s,building=%s,floor_no=%s WHERE location_id=%s",
-                 (ent_l_name.get().strip(), ent_l_building.get().strip(),
-                  ent_l_floor.get() or None, loc_id))
-        refresh_locs()
-        msg_info("Location updated.")
-    except Error as e:
-        msg_err(e)
+    loc_id = locs_model.from_iid(sel[0]).location_id
+    values = {"location_name": ent_l_name.get().strip(), "building": ent_l_building.get().strip(),
+              "floor_no": ent_l_floor.get() or None}
+    db_task("locations",
+            lambda: repository.update("locations", loc_id, values),
+            after_loc_write("Location updated."))
 
 def loc_delete():
     sel = tree_locs.selection()
     if not sel:
         return msg_info("Select a location row to delete.")
-    loc_id = tree_locs.item(sel[0])["values"][0]
-    try:
-        run_exec("DELETE FROM locations WHERE location_id=%s", (loc_id,))
-        refresh_locs()
-        msg_info("Location deleted.")
-    except Error as e:
-        msg_err(e)
+    loc_id = locs_model.from_iid(sel[0]).location_id
+    db_task("locations",
+            lambda: repository.delete("locations", loc_id),
+            after_loc_write("Location deleted."))
 
 def loc_on_select(event):
     sel = tree_locs.selection()
     if not sel: return
-    vals = tree_locs.item(sel[0])["values"]
-    ent_l_name.delete(0, END); ent_l_name.insert(0, vals[1])
-    ent_l_building.delete(0, END); ent_l_building.insert(0, vals[2] if vals[2] is not None else "")
-    ent_l_floor.delete(0, END); ent_l_floor.insert(0, "" if vals[3] is None else vals[3])
+    loc = locs_model.from_iid(sel[0])
+    ent_l_name.delete(0, END); ent_l_name.insert(0, loc.location_name)
+    ent_l_building.delete(0, END); ent_l_building.insert(0, loc.building if loc.building is not None else "")
+    ent_l_floor.delete(0, END); ent_l_floor.insert(0, "" if loc.floor_no is None else loc.floor_no)
 
 tree_locs.bind("<<TreeviewSelect>>", loc_on_select)
 
@@ -290,6 +409,9 @@ Button(btn_l_bar, text="Add Location", command=loc_add, bg="#b6f2b6").pack(side=
 Button(btn_l_bar, text="Update", command=loc_update, bg="#ffd27f").pack(side=LEFT, padx=4)
 Button(btn_l_bar, text="Delete", command=loc_delete, bg="#ff9a9a").pack(side=LEFT, padx=4)
 Button(btn_l_bar, text="Refresh", command=refresh_locs).pack(side=LEFT, padx=4)
+Button(btn_l_bar, text="Import CSV/JSONL",
+       command=lambda: import_dialog("locations", "locations", refresh_locs)).pack(side=LEFT, padx=4)
+Button(btn_l_bar, text="Export...", command=lambda: export_table("locations")).pack(side=LEFT, padx=4)
 
 # ============================================================
 # TAB 3: ITEMS (CRUD + Procedure add_item + Trigger on insert)
@@ -297,12 +419,41 @@ Button(btn_l_bar, text="Refresh", command=refresh_locs).pack(side=LEFT, padx=4)
 tab_items = Frame(nb)
 nb.add(tab_items, text="Items")
 
-i_cols = ("item_id","item_name","description","category","status","report_date","reported_by","location_id")
-tree_items = ttk.Treeview(tab_items, columns=i_cols, show="headings", height=12)
+# No description column: list queries leave the TEXT out (item_on_select reads it)
+i_cols = ("item_id","item_name","category","status","report_date","reported_by","location_id")
+# Search bar: full-text search + filters (search.py), run as you type
+frm_i_search = Frame(tab_items)
+frm_i_search.pack(fill=X, padx=10, pady=(10, 0))
+Label(frm_i_search, text="Search").pack(side=LEFT)
+ent_s_text = Entry(frm_i_search, width=28); ent_s_text.pack(side=LEFT, padx=5)
+Label(frm_i_search, text="Status").pack(side=LEFT)
+cmb_s_status = ttk.Combobox(frm_i_search, values=["", "lost", "found", "claimed"], width=8, state="readonly")
+cmb_s_status.pack(side=LEFT, padx=5)
+Label(frm_i_search, text="Category").pack(side=LEFT)
+ent_s_cat = Entry(frm_i_search, width=12); ent_s_cat.pack(side=LEFT, padx=5)
+Label(frm_i_search, text="Location").pack(side=LEFT)
+cmb_s_loc = ttk.Combobox(frm_i_search, width=16); cmb_s_loc.pack(side=LEFT, padx=5)
+bind_lookup(cmb_s_loc, locs_lookup)
+Label(frm_i_search, text="From").pack(side=LEFT)
+ent_s_from = Entry(frm_i_search, width=10); ent_s_from.pack(side=LEFT, padx=5)
+Label(frm_i_search, text="To").pack(side=LEFT)
+ent_s_to = Entry(frm_i_search, width=10); ent_s_to.pack(side=LEFT, padx=5)
+
+frm_i_filter = Frame(tab_items)
+frm_i_filter.pack(fill=X, padx=10, pady=(6, 0))
+frm_i_tree = Frame(tab_items)
+frm_i_tree.pack(fill=BOTH, expand=True, padx=10, pady=10)
+tree_items = ttk.Treeview(frm_i_tree, columns=i_cols, show="headings", height=12)
 for c in i_cols:
-    tree_items.heading(c, text=c.upper())
-    tree_items.column(c, width=150 if c not in ("description","item_name") else 240)
-tree_items.pack(fill=BOTH, expand=True, padx=10, pady=10)
+    tree_items.column(c, width=150 if c != "item_name" else 240)
+sb_items = ttk.Scrollbar(frm_i_tree, orient=VERTICAL, command=tree_items.yview)
+sb_items.pack(side=RIGHT, fill=Y)
+tree_items.pack(side=LEFT, fill=BOTH, expand=True)
+
+frm_i_pg = Frame(tab_items)
+frm_i_pg.pack(fill=X, padx=10)
+pager_items = make_pager(tree_items, sb_items, frm_i_pg, "items", "items", i_cols, "item_id",
+                         items_model, frm_i_filter)
 
 frm_i = Frame(tab_items)
 frm_i.pack(fill=X, padx=10, pady=6)
@@ -318,111 +469,304 @@ cmb_i_status = ttk.Combobox(frm_i, values=["lost","found"], width=10, state="rea
 cmb_i_status.set("lost"); cmb_i_status.grid(row=0, column=5, padx=5)
 
 Label(frm_i, text="User (reported_by)").grid(row=1, column=0, sticky="w")
-cmb_i_user = ttk.Combobox(frm_i, width=22, state="readonly")
+cmb_i_user = ttk.Combobox(frm_i, width=22)
 cmb_i_user.grid(row=1, column=1, padx=5)
+bind_lookup(cmb_i_user, users_lookup)
 
 Label(frm_i, text="Location").grid(row=1, column=2, sticky="w")
-cmb_i_loc = ttk.Combobox(frm_i, width=16, state="readonly")
+cmb_i_loc = ttk.Combobox(frm_i, width=16)
 cmb_i_loc.grid(row=1, column=3, padx=5)
+bind_lookup(cmb_i_loc, locs_lookup)
 
 Label(frm_i, text="Description").grid(row=1, column=4, sticky="w")
 ent_i_desc = Entry(frm_i, width=40); ent_i_desc.grid(row=1, column=5, padx=5)
 
 def refresh_dropdowns():
-    # Users
-    users = run_query("SELECT user_id, name FROM users ORDER BY name")
-    if users:
-        cmb_i_user["values"] = [f"{u[0]} - {u[1]}" for u in users]
-        cmb_c_claimer["values"] = [f"{u[0]} - {u[1]}" for u in users]
-        cmb_q_user["values"] = [f"{u[0]} - {u[1]}" for u in users]
-    # Locations
-    locs = run_query("SELECT location_id, location_name FROM locations ORDER BY location_name")
-    if locs:
-        cmb_i_loc["values"] = [f"{l[0]} - {l[1]}" for l in locs]
+    # Warm the lookup caches; a no-op unless users / locations were written.
+    # Comboboxes fill themselves from the cache as the user types.
+    db_task("lookups", lambda: (users_lookup.get(), locs_lookup.get()), key="refresh")
 
 def get_selected_id_from_combo(combo):
-    val = combo.get().strip()
-    if not val or "-" not in val: return None
-    return int(val.split("-")[0].strip())
+    # Exact label (or typed id) -> id via the combo's lookup; no string parsing
+    return combo_lookups[combo].id_for(combo.get())
 
 def refresh_items():
+    if pager_items.paused:
+        run_search(search_state["page"])   # the tree is showing search results
+    else:
+        pager_items.reload()
+
+# ---------------------- ITEM SEARCH ----------------------
+SEARCH_DEBOUNCE_MS = 250
+search_state = {"page": 0, "more": False, "after_id": None}
+
+def search_filters():
+    filters = {"status": cmb_s_status.get() or None,
+               "category": ent_s_cat.get().strip() or None,
+               "location_id": get_selected_id_from_combo(cmb_s_loc),
+               "date_from": ent_s_from.get().strip() or None,
+               "date_to": ent_s_to.get().strip() or None}
+    for name in ("date_from", "date_to"):
+        if filters[name]:
+            filters[name] = date.fromisoformat(filters[name])
+    return filters
+
+def run_search(page=0):
+    if search_state["after_id"] is not None:
+        root.after_cancel(search_state["after_id"])
+        search_state["after_id"] = None
+    text = ent_s_text.get()
     try:
-        rows = run_query("""SELECT item_id,item_name,description,category,status,report_date,reported_by,location_id
-                            FROM items ORDER BY item_id""")
-        fill_tree(tree_items, rows)
-    except Exception as e:
-        msg_err(e)
+        filters = search_filters()
+    except ValueError:
+        return  # date still being typed
+    if not text.strip() and not any(filters.values()):
+        return pager_items.resume()
+    search_state["page"] = page
+    def done(result):
+        search_state["more"] = result["more"]
+        pager_items.show_rows(result["rows"], search_summary(result))
+    # Same key: a newer search drops the queued one and discards a running one
+    db_task("search", lambda: search_items(text, page=page, **filters), done, key="search")
+
+def schedule_search(event=None):
+    # Debounce: search once typing pauses for SEARCH_DEBOUNCE_MS
+    if search_state["after_id"] is not None:
+        root.after_cancel(search_state["after_id"])
+    search_state["after_id"] = root.after(SEARCH_DEBOUNCE_MS, run_search)
+
+def search_page(step):
+    page = search_state["page"] + step
+    if not pager_items.paused or page < 0 or (step > 0 and not search_state["more"]):
+        return
+    run_search(page)
+
+def search_clear():
+    for ent in (ent_s_text, ent_s_cat, ent_s_from, ent_s_to):
+        ent.delete(0, END)
+    cmb_s_status.set(""); cmb_s_loc.set("")
+    run_search()
+
+for w in (ent_s_text, ent_s_cat, ent_s_from, ent_s_to):
+    w.bind("<KeyRelease>", schedule_search)
+    w.bind("<Return>", lambda e: run_search())
+cmb_s_loc.bind("<KeyRelease>", schedule_search, add="+")
+for w in (cmb_s_status, cmb_s_loc):
+    w.bind("<<ComboboxSelected>>", lambda e: run_search())
+Button(frm_i_search, text="< Prev", command=lambda: search_page(-1)).pack(side=LEFT, padx=2)
+Button(frm_i_search, text="More >", command=lambda: search_page(1)).pack(side=LEFT, padx=2)
+Button(frm_i_search, text="Clear", command=search_clear).pack(side=LEFT, padx=2)
+
+def after_item_write(text):
+    def done(_):
+        refresh_items()
+        msg_info(text)
+    return done
 
 def item_add_via_proc():
-    try:
-        name = ent_i_name.get().strip()
-        desc = ent_i_desc.get().strip()
-        cat = ent_i_cat.get().strip()
-        status = cmb_i_status.get()
-        uid = get_selected_id_from_combo(cmb_i_user)
-        lid = get_selected_id_from_combo(cmb_i_loc)
-        if not (name and uid and lid and status):
-            return msg_info("Name, Status, User, Location required.")
-        # CALL add_item(p_name, p_desc, p_cat, p_status, p_user, p_loc)
-        call_proc('add_item', (name, desc, cat, status, uid, lid))
-        refresh_items()
-        msg_info("Item added via procedure. (Insert trigger auto-appended timestamp to description.)")
-    except Error as e:
-        msg_err(e)
+    name = ent_i_name.get().strip()
+    desc = ent_i_desc.get().strip()
+    cat = ent_i_cat.get().strip()
+    status = cmb_i_status.get()
+    uid = get_selected_id_from_combo(cmb_i_user)
+    lid = get_selected_id_from_combo(cmb_i_loc)
+    if not (name and uid and lid and status):
+        return msg_info("Name, Status, User, Location required.")
+    written = after_item_write("Item added via procedure. (Insert trigger logged an 'added' event.)")
+    def done(result):
+        written(result)
+        match_new_items()
+    db_task("items", lambda: repository.add_item(name, desc, cat, status, uid, lid), done)
 
 def item_update():
     sel = tree_items.selection()
     if not sel:
         return msg_info("Select an item row to update.")
-    item_id = tree_items.item(sel[0])["values"][0]
-    try:
-        run_exec("""UPDATE items SET item_name=%s, description=%s, category=%s, status=%s,
-                                reported_by=%s, location_id=%s WHERE item_id=%s""",
-                 (ent_i_name.get().strip(), ent_i_desc.get().strip(), ent_i_cat.get().strip(),
-                  cmb_i_status.get(), get_selected_id_from_combo(cmb_i_user),
-                  get_selected_id_from_combo(cmb_i_loc), item_id))
-        refresh_items()
-        msg_info("Item updated.")
-    except Error as e:
-        msg_err(e)
+    item_id = items_model.from_iid(sel[0]).item_id
+    if pager_items.source_of(item_id) != "items":
+        return msg_info("Archived items are read-only.")
+    values = {"item_name": ent_i_name.get().strip(), "category": ent_i_cat.get().strip(),
+              "status": cmb_i_status.get(), "reported_by": get_selected_id_from_combo(cmb_i_user),
+              "location_id": get_selected_id_from_combo(cmb_i_loc)}
+    if item_desc["item_id"] == item_id:
+        # Only write back a description that was actually read in
+        values["description"] = ent_i_desc.get().strip()
+    written = after_item_write("Item updated.")
+    def done(rows):
+        if not rows:
+            refresh_items()
+            return msg_err(f"Item {item_id} no longer exists; nothing was updated.")
+        written(rows)
+        match_refresh([item_id])
+    db_task("items", lambda: repository.update("items", item_id, values), done)
 
 def item_delete():
     sel = tree_items.selection()
     if not sel:
         return msg_info("Select an item row to delete.")
-    item_id = tree_items.item(sel[0])["values"][0]
-    try:
-        run_exec("DELETE FROM items WHERE item_id=%s", (item_id,))
-        refresh_items()
-        msg_info("Item deleted.")
-    except Error as e:
-        msg_err(e)
+    item_id = items_model.from_iid(sel[0]).item_id
+    if pager_items.source_of(item_id) != "items":
+        return msg_info("Archived items are read-only.")
+    written = after_item_write("Item deleted.")
+    def done(rows):
+        if not rows:
+            refresh_items()
+            return msg_err(f"Item {item_id} no longer exists; nothing was deleted.")
+        written(rows)
+        match_refresh([item_id])
+    db_task("items", lambda: repository.delete("items", item_id), done)
+
+item_desc = {"item_id": None}   # whose description ent_i_desc holds
 
 def item_on_select(event):
     sel = tree_items.selection()
     if not sel: return
-    vals = tree_items.item(sel[0])["values"]
-    ent_i_name.delete(0, END); ent_i_name.insert(0, vals[1])
-    ent_i_desc.delete(0, END); ent_i_desc.insert(0, vals[2] if vals[2] else "")
-    ent_i_cat.delete(0, END); ent_i_cat.insert(0, vals[3] if vals[3] else "")
-    cmb_i_status.set(vals[4])
-    # set user and location combos to matching id prefix
-    uid = vals[6]; lid = vals[7]
-    for v in cmb_i_user["values"]:
-        if v.startswith(str(uid) + " -"):
-            cmb_i_user.set(v); break
-    for v in cmb_i_loc["values"]:
-        if v.startswith(str(lid) + " -"):
-            cmb_i_loc.set(v); break
+    it = items_model.from_iid(sel[0])
+    ent_i_name.delete(0, END); ent_i_name.insert(0, it.item_name)
+    ent_i_desc.delete(0, END)
+    ent_i_cat.delete(0, END); ent_i_cat.insert(0, it.category or "")
+    cmb_i_status.set(it.status)
+    # set user and location combos from the lookup caches (dict hits)
+    cmb_i_user.set(users_lookup.label_for(it.reported_by) or "")
+    cmb_i_loc.set(locs_lookup.label_for(it.location_id) or "")
+    # The description is not in the list rows: read it for this row only
+    item_desc["item_id"] = None
+    def show(description):
+        if tree_items.selection()[:1] != (sel[0],):
+            return              # selection moved on meanwhile
+        ent_i_desc.delete(0, END); ent_i_desc.insert(0, description or "")
+        item_desc["item_id"] = it.item_id
+    archived = len(pager_items.sources) > 1
+    db_task("items", lambda: repository.item_description(it.item_id, archived), show,
+            key="description")
 
 tree_items.bind("<<TreeviewSelect>>", item_on_select)
 
+def item_history():
+    sel = tree_items.selection()
+    if not sel:
+        return msg_info("Select an item row to see its history.")
+    item_id = items_model.from_iid(sel[0]).item_id
+    def show(rows):
+        win = Toplevel(root)
+        win.title(f"Item {item_id} history")
+        cols = ("event_time", "event_type", "actor_id", "claim_id")
+        tree = ttk.Treeview(win, columns=cols, show="headings", height=10)
+        for c in cols:
+            tree.heading(c, text=c.upper())
+            tree.column(c, width=160)
+        tree.pack(fill=BOTH, expand=True, padx=10, pady=10)
+        fill_tree(tree, rows)
+    db_task("items", lambda: repository.item_history(item_id), show)
+
+# ---------------------- LOST/FOUND MATCHING ----------------------
+MATCH_LIMIT = 200
+matcher = MatchIndex()
+match_win = {}     # widgets of the open Matches window
+match_rows = {}    # Matches tree iid -> Suggestion
+
+def match_new_items():
+    # Incremental: only items added since the last sync are scored
+    def load():
+        seen = matcher.max_id
+        return [m for m in matcher.sync()
+                if max(m.lost.item_id, m.found.item_id) > seen]
+    def done(found):
+        if found:
+            show_matches(found, f"{len(found)} possible match(es) for the new item")
+    db_task("matching", load, done, key="sync")
+
+def match_refresh(item_ids):
+    # Edited / deleted / claimed items: re-read them in the index. Always on
+    # the "matching" channel, never from the Tk thread, since the index is
+    # read and written by that channel's jobs.
+    ids = list(item_ids)
+    if ids:
+        db_task("matching", lambda: matcher.refresh(ids))
+
+def open_matches(full=False):
+    def load():
+        matcher.sync(full=full)
+        return matcher.suggestions(MATCH_LIMIT)
+    db_task("matching", load,
+            lambda found: show_matches(found, f"Suggested lost/found matches ({matcher.last_ms:.0f} ms)"),
+            key="sync")
+
+def show_matches(suggestions, title):
+    win = match_win.get("win")
+    if win is None or not win.winfo_exists():
+        win = Toplevel(root)
+        cols = ("score", "lost_id", "lost_item", "found_id", "found_item", "category", "days")
+        tree = ttk.Treeview(win, columns=cols, show="headings", height=14)
+        for c in cols:
+            tree.heading(c, text=c.upper())
+            tree.column(c, width=170 if c.endswith("item") else 80)
+        tree.pack(fill=BOTH, expand=True, padx=10, pady=10)
+        bar = Frame(win); bar.pack(fill=X, padx=10, pady=6)
+        Button(bar, text="Create Claim", command=match_claim, bg="#b6f2b6").pack(side=LEFT, padx=4)
+        Button(bar, text="Show All", command=open_matches).pack(side=LEFT, padx=4)
+        Button(bar, text="Rescan", command=lambda: open_matches(full=True)).pack(side=LEFT, padx=4)
+        match_win.update(win=win, tree=tree)
+    win.title(title)
+    tree = match_win["tree"]
+    tree.delete(*tree.get_children())
+    match_rows.clear()
+    for m in suggestions:
+        iid = f"{m.lost.item_id}:{m.found.item_id}"
+        days = abs((m.lost.report_date - m.found.report_date).days)
+        tree.insert("", "end", iid=iid, values=(f"{m.score:.2f}", m.lost.item_id, m.lost.item_name,
+                                                m.found.item_id, m.found.item_name, m.lost.category, days))
+        match_rows[iid] = m
+    win.lift()
+
+def match_claim():
+    # One click: the lost item's reporter claims the matching found item
+    tree = match_win["tree"]
+    sel = tree.selection()
+    if not sel:
+        return msg_info("Select a suggested match.")
+    iid = sel[0]
+    m = match_rows[iid]
+    if m.lost.reported_by is None:
+        return msg_info("The lost item has no reporter to claim it for.")
+    def done(_):
+        db_task("matching", lambda: matcher.drop_pair(m.lost.item_id, m.found.item_id))
+        if tree.exists(iid):
+            tree.delete(iid)
+        refresh_claims()
+        msg_info(f"Claim added for found item {m.found.item_id} by user {m.lost.reported_by} (status=pending).")
+    db_task("claims",
+            lambda: repository.create("claims", {"item_id": m.found.item_id,
+                                                 "claimer_id": m.lost.reported_by,
+                                                 "remarks": claim_remark(m)}),
+            done)
+
+def archive_old():
+    # Move claimed items / decided claims older than a year out of the live tables
+    if not messagebox.askyesno("Archive", "Move claimed items and decided claims older than "
+                               "a year into the archive tables?"):
+        return
+    def progress(result):
+        executor.post(lambda r: lbl_status.config(
+            text=f"Archiving: {r['items']:,} items, {r['claims']:,} claims"), result)
+    def done(result):
+        refresh_items()
+        refresh_claims()
+        msg_info(archive_summary(result))
+    db_task("archive", lambda: archive(max_seconds=120, on_progress=progress), done)
+
 btn_i_bar = Frame(tab_items)
 btn_i_bar.pack(fill=X, padx=10, pady=6)
 Button(btn_i_bar, text="Add Item (Procedure)", command=item_add_via_proc, bg="#b6f2b6").pack(side=LEFT, padx=4)
 Button(btn_i_bar, text="Update", command=item_update, bg="#ffd27f").pack(side=LEFT, padx=4)
 Button(btn_i_bar, text="Delete", command=item_delete, bg="#ff9a9a").pack(side=LEFT, padx=4)
 Button(btn_i_bar, text="Refresh", command=refresh_items).pack(side=LEFT, padx=4)
+Button(btn_i_bar, text="History", command=item_history).pack(side=LEFT, padx=4)
+Button(btn_i_bar, text="Matches", command=open_matches, bg="#e1bee7").pack(side=LEFT, padx=4)
+Button(btn_i_bar, text="Archive Old", command=archive_old).pack(side=LEFT, padx=4)
+Button(btn_i_bar, text="Import CSV/JSONL",
+       command=lambda: import_dialog("items", "items", refresh_items)).pack(side=LEFT, padx=4)
+Button(btn_i_bar, text="Export...", command=lambda: export_table("items")).pack(side=LEFT, padx=4)
 
 # ============================================================
 # TAB 4: CLAIMS (CRUD + Procedure approve/reject + Trigger updates item)
@@ -431,11 +775,22 @@ tab_claims = Frame(nb)
 nb.add(tab_claims, text="Claims")
 
 c_cols = ("claim_id","item_id","claimer_id","claim_date","status","remarks")
-tree_claims = ttk.Treeview(tab_claims, columns=c_cols, show="headings", height=12)
+frm_c_filter = Frame(tab_claims)
+frm_c_filter.pack(fill=X, padx=10, pady=(10, 0))
+frm_c_tree = Frame(tab_claims)
+frm_c_tree.pack(fill=BOTH, expand=True, padx=10, pady=10)
+tree_claims = ttk.Treeview(frm_c_tree, columns=c_cols, show="headings", height=12,
+                           selectmode="extended")
 for c in c_cols:
-    tree_claims.heading(c, text=c.upper())
     tree_claims.column(c, width=150)
-tree_claims.pack(fill=BOTH, expand=True, padx=10, pady=10)
+sb_claims = ttk.Scrollbar(frm_c_tree, orient=VERTICAL, command=tree_claims.yview)
+sb_claims.pack(side=RIGHT, fill=Y)
+tree_claims.pack(side=LEFT, fill=BOTH, expand=True)
+
+frm_c_pg = Frame(tab_claims)
+frm_c_pg.pack(fill=X, padx=10)
+pager_claims = make_pager(tree_claims, sb_claims, frm_c_pg, "claims", "claims", c_cols, "claim_id",
+                          claims_model, frm_c_filter)
 
 frm_c1 = Frame(tab_claims); frm_c1.pack(fill=X, padx=10, pady=6)
 
@@ -443,7 +798,8 @@ Label(frm_c1, text="Item ID").grid(row=0, column=0, sticky="w")
 ent_c_item = Entry(frm_c1, width=10); ent_c_item.grid(row=0, column=1, padx=5)
 
 Label(frm_c1, text="Claimer").grid(row=0, column=2, sticky="w")
-cmb_c_claimer = ttk.Combobox(frm_c1, width=28, state="readonly"); cmb_c_claimer.grid(row=0, column=3, padx=5)
+cmb_c_claimer = ttk.Combobox(frm_c1, width=28); cmb_c_claimer.grid(row=0, column=3, padx=5)
+bind_lookup(cmb_c_claimer, users_lookup)
 
 Label(frm_c1, text="Remarks").grid(row=0, column=4, sticky="w")
 ent_c_remarks = Entry(frm_c1, width=40); ent_c_remarks.grid(row=0, column=5, padx=5)
@@ -451,55 +807,72 @@ ent_c_remarks = Entry(frm_c1, width=40); ent_c_remarks.grid(row=0, column=5, pad
 frm_c2 = Frame(tab_claims); frm_c2.pack(fill=X, padx=10, pady=6)
 
 def refresh_claims():
-    try:
-        rows = run_query("SELECT claim_id,item_id,claimer_id,claim_date,status,remarks FROM claims ORDER BY claim_id")
-        fill_tree(tree_claims, rows)
-    except Exception as e:
-        msg_err(e)
+    pager_claims.reload()
 
 def claim_add():
     try:
         item_id = int(ent_c_item.get())
-        claimer = get_selected_id_from_combo(cmb_c_claimer)
-        remarks = ent_c_remarks.get().strip()
-        run_exec("INSERT INTO claims(item_id, claimer_id, remarks) VALUES(%s,%s,%s)",
-                 (item_id, claimer, remarks))
+    except ValueError as e:
+        return msg_err(e)
+    claimer = get_selected_id_from_combo(cmb_c_claimer)
+    remarks = ent_c_remarks.get().strip()
+    def done(_):
         refresh_claims()
         msg_info("Claim added (status=pending).")
-    except Exception as e:
-        msg_err(e)
+    db_task("claims",
+            lambda: repository.create("claims", {"item_id": item_id, "claimer_id": claimer,
+                                                 "remarks": remarks}),
+            done)
 
 def claim_update_status(decision):
+    # Every selected claim (ctrl/shift-click) in one CALL / one transaction
     sel = tree_claims.selection()
     if not sel:
-        return msg_info("Select a claim row first.")
-    claim_id = tree_claims.item(sel[0])["values"][0]
-    try:
-        # CALL update_claim_status(p_claim_id, p_status, p_remark)
-        call_proc('update_claim_status', (int(claim_id), decision, ent_c_remarks.get().strip()))
+        return msg_info("Select one or more claim rows first.")
+    claim_ids = [claims_model.from_iid(iid).claim_id for iid in sel]
+    item_ids = {claims_model.from_iid(iid).item_id for iid in sel}
+    remark = ent_c_remarks.get().strip()
+    def done(result):
+        decided, auto_rejected, skipped = (result["decided"], result["auto_rejected"],
+                                           result["skipped"])
         refresh_claims()
-        refresh_items()
-        msg_info(f"Claim {decision}. (Trigger updated item status/description if approved.)")
-    except Exception as e:
-        msg_err(e)
+        if decision == "approved" and decided:
+            refresh_items()
+            match_refresh(item_ids)     # now claimed: no longer matchable
+        text = f"{decided} claim(s) {decision}."
+        if auto_rejected:
+            text += f" {auto_rejected} competing claim(s) auto-rejected."
+        if skipped:
+            text += f" {skipped} skipped (not pending)."
+        if decision == "approved":
+            text += " (Trigger updated item status and logged the event.)"
+        msg_info(text)
+    db_task("claims",
+            lambda: repository.decide_claims(claim_ids, decision, remark),
+            done)
 
 def claim_delete():
     sel = tree_claims.selection()
     if not sel:
         return msg_info("Select a claim row to delete.")
-    cid = tree_claims.item(sel[0])["values"][0]
-    try:
-        run_exec("DELETE FROM claims WHERE claim_id=%s", (cid,))
+    cid = claims_model.from_iid(sel[0]).claim_id
+    if pager_claims.source_of(cid) != "claims":
+        return msg_info("Archived claims are read-only.")
+    def done(rows):
         refresh_claims()
+        if not rows:
+            return msg_err(f"Claim {cid} no longer exists; nothing was deleted.")
         msg_info("Claim deleted.")
-    except Exception as e:
-        msg_err(e)
+    db_task("claims",
+            lambda: repository.delete("claims", cid),
+            done)
 
 Button(frm_c2, text="Add Claim", command=claim_add, bg="#b6f2b6").pack(side=LEFT, padx=4)
 Button(frm_c2, text="Approve (Procedure+Trigger)", command=lambda: claim_update_status('approved'), bg="#99ffcc").pack(side=LEFT, padx=4)
 Button(frm_c2, text="Reject (Procedure)", command=lambda: claim_update_status('rejected'), bg="#ffd27f").pack(side=LEFT, padx=4)
 Button(frm_c2, text="Delete", command=claim_delete, bg="#ff9a9a").pack(side=LEFT, padx=4)
 Button(frm_c2, text="Refresh", command=refresh_claims).pack(side=LEFT, padx=4)
+Button(frm_c2, text="Export...", command=lambda: export_table("claims")).pack(side=LEFT, padx=4)
 
 # ============================================================
 # TAB 5: QUERIES (Nested / Join / Aggregate) + Function call
@@ -519,92 +892,243 @@ frm_q = Frame(tab_queries); frm_q.pack(fill=X, padx=10, pady=6)
 
 # Function: count_items_by_user
 Label(frm_q, text="User for count_items_by_user():").grid(row=0, column=0, sticky="w")
-cmb_q_user = ttk.Combobox(frm_q, width=30, state="readonly"); cmb_q_user.grid(row=0, column=1, padx=5)
+cmb_q_user = ttk.Combobox(frm_q, width=30); cmb_q_user.grid(row=0, column=1, padx=5)
+bind_lookup(cmb_q_user, users_lookup)
 
 def show_function_count():
     uid = get_selected_id_from_combo(cmb_q_user)
     if not uid:
         return msg_info("Choose a user.")
-    try:
-        rows = run_query("SELECT count_items_by_user(%s)", (uid,))
-        columns = ["User ID", "Total Items Reported"]
-        fill_tree(tree_q, [(uid, rows[0][0])], columns)
-    except Exception as e:
-        msg_err(e)
+    columns = ["User ID", "Total Items Reported"]
+    last_query.update(sql="SELECT %s AS user_id, count_items_by_user(%s)", params=(uid, uid),
+                      columns=columns, name="count_items_by_user")
+    def show(count):
+        fill_tree(tree_q, [(uid, count)], columns)
+        show_cache_stats()
+    db_task("queries", lambda: repository.count_items_by_user(uid), show, key="query")
+
+last_query = {}   # what tree_q shows: sql, params, columns (for Export)
+
+def run_hub_query(name):
+    sql, columns = QUERY_HUB[name]
+    archived = q_archived.get()
+    if archived:
+        sql = QUERY_HUB_ARCHIVED.get(name, sql)
+    last_query.update(sql=sql, params=None, columns=columns, name=name)
+    def show(result):
+        fill_tree(tree_q, result[1], columns)
+        show_cache_stats()
+    # Cached until a write touches a table the query reads (or the TTL)
+    db_task("queries", lambda: repository.hub_query(name, archived), show, key="query")
+
+def show_cache_stats():
+    lbl_q_cache.config(text=cache_stats(result_cache.snapshot()))
+
+def clear_result_cache():
+    result_cache.clear()
+    show_cache_stats()
 
 # Nested query
 def run_nested_query():
-    sql = """
-    SELECT name, user_id
-    FROM users
-    WHERE user_id IN (
-        SELECT reported_by
-        FROM items
-        GROUP BY reported_by
-        HAVING COUNT(item_id) > (
-            SELECT AVG(item_count)
-            FROM (
-                SELECT COUNT(item_id) AS item_count
-                FROM items
-                GROUP BY reported_by
-            ) AS sub
-        )
-    )
-    """
-    try:
-        rows = run_query(sql)
-        columns = ["Name", "User ID"]
-        fill_tree(tree_q, rows, columns)
-    except Exception as e:
-        msg_err(e)
+    run_hub_query("nested")
 
 # Join query
 def run_join_query():
-    sql = """
-    SELECT 
-        c.claim_id,
-        i.item_name,
-        u.name AS claimer_name,
-        c.status AS claim_status,
-        i.status AS item_status
-    FROM claims c
-    JOIN items i ON c.item_id = i.item_id
-    JOIN users u ON c.claimer_id = u.user_id
-    ORDER BY c.claim_id
-    """
-    try:
-        rows = run_query(sql)
-        columns = ["Claim ID", "Item Name", "Claimer Name", "Claim Status", "Item Status"]
-        fill_tree(tree_q, rows, columns)
-    except Exception as e:
-        msg_err(e)
+    run_hub_query("join")
 
 # Aggregate query
 def run_aggregate_query():
-    sql = """
-    SELECT category, COUNT(item_id) AS total_items
-    FROM items
-    GROUP BY category
-    ORDER BY total_items DESC
-    """
-    try:
-        rows = run_query(sql)
-        columns = ["Category", "Total Items"]
-        fill_tree(tree_q, rows, columns)
-    except Exception as e:
-        msg_err(e)
+    run_hub_query("aggregate")
+
+# Claims per status (summary table)
+def run_claim_status_query():
+    run_hub_query("claim_status")
 
 btn_q_bar = Frame(tab_queries); btn_q_bar.pack(fill=X, padx=10, pady=6)
+lbl_q_cache = Label(tab_queries, anchor="w")
+lbl_q_cache.pack(fill=X, padx=10, pady=(0, 6))
 Button(btn_q_bar, text="Run Nested Query", command=run_nested_query, bg="#e0f7fa").pack(side=LEFT, padx=4)
 Button(btn_q_bar, text="Run Join Query", command=run_join_query, bg="#e8f5e9").pack(side=LEFT, padx=4)
+# Counts always include archived rows; this adds them to the Join listing
+q_archived = BooleanVar(value=False)
+Checkbutton(btn_q_bar, text="Include archived", variable=q_archived).pack(side=LEFT, padx=4)
 Button(btn_q_bar, text="Run Aggregate Query", command=run_aggregate_query, bg="#fff9c4").pack(side=LEFT, padx=4)
+Button(btn_q_bar, text="Claims by Status", command=run_claim_status_query, bg="#ffe0b2").pack(side=LEFT, padx=4)
 Button(btn_q_bar, text="Function: count_items_by_user()", command=show_function_count, bg="#d1c4e9").pack(side=LEFT, padx=4)
 
+def export_query_result():
+    if not last_query:
+        return msg_info("Run a query first.")
+    export_dialog(last_query["name"], last_query["sql"], last_query["columns"], last_query["params"])
+
+Button(btn_q_bar, text="Export Result...", command=export_query_result).pack(side=LEFT, padx=4)
+Button(btn_q_bar, text="Clear Cache", command=clear_result_cache).pack(side=LEFT, padx=4)
+show_cache_stats()
+
+# ============================================================
+# TAB 6: PERFORMANCE (per-statement timings, slow log, EXPLAIN ANALYZE)
+# ============================================================
+tab_perf = Frame(nb)
+nb.add(tab_perf, text="Performance")
+
+p_cols = ("statement", "calls", "rows", "errors", "total_ms",
+          "connect_p95", "execute_p50", "execute_p95", "execute_p99", "fetch_p95")
+tree_perf = ttk.Treeview(tab_perf, columns=p_cols, show="headings", height=10)
+for c in p_cols:
+    tree_perf.heading(c, text=c.upper())
+    tree_perf.column(c, width=420 if c == "statement" else 85, anchor="w" if c == "statement" else "e")
+tree_perf.pack(fill=BOTH, expand=True, padx=10, pady=(10, 4))
+
+lbl_pool = Label(tab_perf, anchor="w")
+lbl_pool.pack(fill=X, padx=10)
+
+frm_perf_low = Frame(tab_perf)
+frm_perf_low.pack(fill=BOTH, expand=True, padx=10, pady=4)
+
+# Recent slow statements
+tree_slow = ttk.Treeview(frm_perf_low, columns=("time", "ms", "sql"), show="headings", height=8)
+for c, w in (("time", 70), ("ms", 70), ("sql", 360)):
+    tree_slow.heading(c, text=c.upper())
+    tree_slow.column(c, width=w)
+tree_slow.pack(side=LEFT, fill=BOTH, expand=True)
+
+# EXPLAIN ANALYZE plan, one tree node per plan step
+tree_plan = ttk.Treeview(frm_perf_low, show="tree", height=8)
+tree_plan.column("#0", width=560)
+tree_plan.pack(side=LEFT, fill=BOTH, expand=True, padx=(8, 0))
+
+def perf_refresh():
+    rows = [(s["fingerprint"], s["calls"], s["rows"], s["errors"], s["total_ms"],
+             s["connect_p95"], s["execute_p50"], s["execute_p95"], s["execute_p99"], s["fetch_p95"])
+            for s in profiler.stats()]
+    fill_tree(tree_perf, rows)
+    fill_tree(tree_slow, list(reversed(profiler.slow_queries())))
+    ps = pool_stats()
+    lbl_pool.config(text=(f"Pool: {ps['open']}/{ps['size']} open, {ps['idle']} idle  |  "
+                          f"checkouts {ps['checkouts']}, hits {ps['hits']}, waits {ps['waits']}, "
+                          f"timeouts {ps['timeouts']}, reconnects {ps['reconnects']}  |  "
+                          f"prepared hits {ps['stmt_hits']}, misses {ps['stmt_misses']}, "
+                          f"evicted {ps['stmt_evictions']}, unprepared {ps['stmt_fallbacks']}  |  "
+                          f"slow threshold {profiler.config['slow_ms']:.0f} ms"))
+
+def perf_tick():
+    # Live view: only repaint while the Performance tab is showing
+    if nb.select() == str(tab_perf):
+        perf_refresh()
+    root.after(1000, perf_tick)
+
+def perf_reset():
+    profiler.reset()
+    perf_refresh()
+
+def explain_analyze(name):
+    sql = QUERY_HUB[name][0]
+    def load():
+        try:
+            return "tree", run_query("EXPLAIN ANALYZE " + sql)[0][0]
+        except Exception:
+            # Servers without EXPLAIN ANALYZE (MySQL < 8.0.18, MariaDB): plain EXPLAIN
+            return "table", run_query("EXPLAIN " + sql)
+    def show(result):
+        kind, plan = result
+        tree_plan.delete(*tree_plan.get_children())
+        tree_plan.insert("", "end", text=f"{name} query", open=True, iid="root")
+        if kind == "tree":
+            parents = {-1: "root"}
+            for depth, text in parse_plan_tree(plan):
+                parents[depth] = tree_plan.insert(parents.get(depth - 1, "root"), "end",
+                                                  text=text, open=True)
+        else:
+            for r in plan:
+                tree_plan.insert("root", "end", text="  ".join(str(v) for v in r if v is not None))
+    db_task("perf", load, show, key="explain")
+
+btn_p_bar = Frame(tab_perf); btn_p_bar.pack(fill=X, padx=10, pady=6)
+Button(btn_p_bar, text="Refresh", command=perf_refresh).pack(side=LEFT, padx=4)
+Button(btn_p_bar, text="Reset Stats", command=perf_reset, bg="#ff9a9a").pack(side=LEFT, padx=4)
+Button(btn_p_bar, text="EXPLAIN ANALYZE Nested", command=lambda: explain_analyze("nested"), bg="#e0f7fa").pack(side=LEFT, padx=4)
+Button(btn_p_bar, text="EXPLAIN ANALYZE Join", command=lambda: explain_analyze("join"), bg="#e8f5e9").pack(side=LEFT, padx=4)
+Button(btn_p_bar, text="EXPLAIN ANALYZE Aggregate", command=lambda: explain_analyze("aggregate"), bg="#fff9c4").pack(side=LEFT, padx=4)
+
+# ---------------------- MULTI-DESK SYNC ----------------------
+# Other desks' inserts / updates / deletes, fetched by updated_at range
+# and folded into the open tabs with keyed reconciliation
+sync_poller = SyncPoller()
+
+def sync_tick():
+    db_task("sync", sync_poller.poll, apply_sync, key="poll")
+    root.after(SYNC_CONFIG["interval_ms"], sync_tick)
+
+sync_pagers = {"users": pager_users, "locations": pager_locs,
+               "items": pager_items, "claims": pager_claims}
+
+def apply_sync(changes):
+    for table, (rows, deleted, truncated) in changes.items():
+        if table == "items":
+            # Claimed / edited / deleted at another desk: drop stale matches
+            if truncated:
+                db_task("matching", lambda: matcher.sync(full=True))
+            else:
+                match_refresh([r[0] for r in rows] + list(deleted))
+        pager = sync_pagers[table]
+        model = pager.model
+        # Only news (not the echo of our own writes) invalidates the caches
+        # keyed on table versions, e.g. the dropdown lookups
+        if (any(model.get(r[0]) != tuple(r) for r in rows)
+                or any(model.get(k) is not None for k in deleted)):
+            note_write(table)
+        if not pager.rows:
+            continue            # tab not loaded yet; it will read fresh rows
+        if truncated:
+            pager.reload()      # too many changes: reload instead
+        else:
+            pager.apply_changes(rows, deleted)
+
 # ---------------------- INITIAL LOAD ----------------------
-refresh_dropdowns()
-refresh_users()
-refresh_locs()
-refresh_items()
-refresh_claims()
+# Only the visible tab loads before the window is usable; the others load
+# on first activation, or in the background once the visible tab is in.
+PREFETCH_DELAY_MS = 200
+startup_log = logging.getLogger("lostfound.startup")
+
+tab_loaders = {   # tab -> loader, removed once it ran
+    str(tab_users): refresh_users,
+    str(tab_locs): refresh_locs,
+    str(tab_items): lambda: (refresh_items(), refresh_dropdowns()),
+    str(tab_claims): lambda: (refresh_claims(), refresh_dropdowns()),
+    str(tab_queries): refresh_dropdowns,
+}
+
+def load_tab(tab):
+    loader = tab_loaders.pop(tab, None)
+    if loader is not None:
+        loader()
+
+nb.bind("<<NotebookTabChanged>>", lambda e: load_tab(nb.select()))
+
+def startup_data_ready():
+    # First time all DB work is done after the window showed up
+    startup["data_ms"] = (time.perf_counter() - STARTUP_T0) * 1000.0
+    text = f"Startup: window {startup['paint_ms']:.0f} ms, first tab data {startup['data_ms']:.0f} ms"
+    startup_log.info(text)
+    lbl_status.config(text="Ready  |  " + text)
+    root.after(PREFETCH_DELAY_MS, prefetch)
+
+def prefetch():
+    # Warm the tabs not opened yet; channels run in parallel on the executor
+    for tab in list(tab_loaders):
+        load_tab(tab)
+    db_task("matching", matcher.sync, key="sync")   # warm the match index
+
+root.wait_visibility(nb)
+root.update_idletasks()
+startup["paint_ms"] = (time.perf_counter() - STARTUP_T0) * 1000.0
+load_tab(nb.select())
+if not busy_channels:
+    startup_data_ready()
+
+perf_tick()
+sync_tick()
 
 root.mainloop()
+executor.shutdown()
+close_pool()
@@ -9,7 +9,8 @@ CREATE TABLE users (
   name VARCHAR(100) NOT NULL,
   email VARCHAR(100) UNIQUE NOT NULL,
   phone VARCHAR(15),
-  role ENUM('student','staff','admin') DEFAULT 'student'
+  role ENUM('student','staff','admin') DEFAULT 'student',
+  updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)
 );
 
 -- TABLE 2: LOCATIONS  (Separate table for normalization)
@@ -17,7 +18,8 @@ CREATE TABLE locations (
   location_id INT AUTO_INCREMENT PRIMARY KEY,
   location_name VARCHAR(100) NOT NULL,
   building VARCHAR(50),
-  floor_no INT
+  floor_no INT,
+  updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)
 );
 
 -- TABLE 3: ITEMS
@@ -30,6 +32,7 @@ CREATE TABLE items (
   report_date DATE DEFAULT (CURRENT_DATE),
   reported_by INT,
   location_id INT,
+  updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
   FOREIGN KEY (reported_by) REFERENCES users(user_id),
   FOREIGN KEY (location_id) REFERENCES locations(location_id)
 );
@@ -42,21 +45,38 @@ CREATE TABLE claims (
   claim_date DATE DEFAULT (CURRENT_DATE),
   status ENUM('pending','approved','rejected') DEFAULT 'pending',
   remarks VARCHAR(255),
+  updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
   FOREIGN KEY (item_id) REFERENCES items(item_id),
   FOREIGN KEY (claimer_id) REFERENCES users(user_id)
 );
 
--- FUNCTION: Count how many items a user has reported
-DELIMITER //
-CREATE FUNCTION count_items_by_user(p_user_id INT)
-RETURNS INT
-DETERMINISTIC
-BEGIN
-  DECLARE total INT;
-  SELECT COUNT(*) INTO total FROM items WHERE reported_by = p_user_id;
-  RETURN total;
-END //
-DELIMITER ;
+-- INDEXES: hot query paths (migration 1, see migrations.py)
+CREATE INDEX idx_items_category_status ON items(category, status);
+CREATE INDEX idx_items_status_date ON items(status, report_date);
+CREATE INDEX idx_claims_status_date ON claims(status, claim_date);
+CREATE INDEX idx_users_name ON users(name);
+CREATE INDEX idx_locations_name ON locations(location_name);
+-- Item search (search.py): ranked MATCH ... AGAINST over the text columns
+CREATE FULLTEXT INDEX ft_items_text ON items(item_name, description, category);
+-- Change tracking (changes.py): "rows changed since" range scans
+CREATE INDEX idx_users_updated ON users(updated_at);
+CREATE INDEX idx_locations_updated ON locations(updated_at);
+CREATE INDEX idx_items_updated ON items(updated_at);
+CREATE INDEX idx_claims_updated ON claims(updated_at);
+-- Header sorting (paging.py): (column, primary key) order for sorted pages
+CREATE INDEX idx_items_name ON items(item_name);
+CREATE INDEX idx_items_report_date ON items(report_date);
+CREATE INDEX idx_locations_building ON locations(building);
+CREATE INDEX idx_claims_date ON claims(claim_date);
+
+-- SCHEMA VERSION: migrations already contained in this script
+CREATE TABLE schema_migrations (
+  version INT PRIMARY KEY,
+  name VARCHAR(100) NOT NULL,
+  applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  explain_before LONGTEXT,
+  explain_after LONGTEXT
+);
 
 -- PROCEDURE 1: Add a Lost or Found Item
 DELIMITER //
@@ -89,37 +109,304 @@ BEGIN
 END //
 DELIMITER ;
 
--- TRIGGER 1: Auto-append timestamp info when a new item is inserted
+-- MIGRATED SCHEMA: the tables, triggers and routines the migrations add
+-- (summary tables, item_events, batch_claim_status, tombstones, archive
+-- tables), generated from migrations.py so the two cannot drift
+-- BEGIN GENERATED by `python migrations.py schema --write`: edit migrations.py, not this block
 DELIMITER //
-CREATE TRIGGER trg_item_insert
-BEFORE INSERT ON items
+
+INSERT INTO schema_migrations (version, name) VALUES
+(1, 'hot path indexes'),
+(2, 'trigger-maintained summary tables'),
+(3, 'item_events audit table'),
+(4, 'items full-text index'),
+(5, 'batch claim decisions'),
+(6, 'change tracking'),
+(7, 'sort indexes'),
+(8, 'archive tables'),
+(9, 'batch claim decisions in the caller transaction'),
+(10, 'archived rows in the summary tables') //
+
+-- Migration 2: trigger-maintained summary tables
+CREATE TABLE IF NOT EXISTS item_category_counts (
+  category VARCHAR(50) NOT NULL,
+  status VARCHAR(10) NOT NULL,
+  item_count INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (category, status)
+) //
+
+CREATE TABLE IF NOT EXISTS user_item_counts (
+  user_id INT PRIMARY KEY,
+  item_count INT NOT NULL DEFAULT 0
+) //
+
+CREATE TABLE IF NOT EXISTS claim_status_counts (
+  status VARCHAR(10) PRIMARY KEY,
+  claim_count INT NOT NULL DEFAULT 0
+) //
+
+CREATE TRIGGER trg_items_summary_ins
+AFTER INSERT ON items
 FOR EACH ROW
 BEGIN
-  -- Automatically append timestamp info to description
-  SET NEW.description = CONCAT(
-      COALESCE(NEW.description, ''),
-      ' [Added on: ', DATE_FORMAT(NOW(), '%Y-%m-%d %H:%i:%s'), ']'
-  );
+  INSERT INTO item_category_counts(category, status, item_count)
+  VALUES (COALESCE(NEW.category, ''), COALESCE(NEW.status, ''), 1)
+  ON DUPLICATE KEY UPDATE item_count = item_count + 1;
+  IF NEW.reported_by IS NOT NULL THEN
+    INSERT INTO user_item_counts(user_id, item_count) VALUES (NEW.reported_by, 1)
+    ON DUPLICATE KEY UPDATE item_count = item_count + 1;
+  END IF;
 END //
-DELIMITER ;
 
--- TRIGGER 2: Auto-update item status when claim is approved
-DELIMITER //
+CREATE TRIGGER trg_items_summary_upd
+AFTER UPDATE ON items
+FOR EACH ROW
+BEGIN
+  IF NOT (OLD.category <=> NEW.category AND OLD.status <=> NEW.status) THEN
+    UPDATE item_category_counts SET item_count = item_count - 1
+    WHERE category = COALESCE(OLD.category, '') AND status = COALESCE(OLD.status, '');
+    INSERT INTO item_category_counts(category, status, item_count)
+    VALUES (COALESCE(NEW.category, ''), COALESCE(NEW.status, ''), 1)
+    ON DUPLICATE KEY UPDATE item_count = item_count + 1;
+  END IF;
+  IF NOT (OLD.reported_by <=> NEW.reported_by) THEN
+    IF OLD.reported_by IS NOT NULL THEN
+      UPDATE user_item_counts SET item_count = item_count - 1 WHERE user_id = OLD.reported_by;
+    END IF;
+    IF NEW.reported_by IS NOT NULL THEN
+      INSERT INTO user_item_counts(user_id, item_count) VALUES (NEW.reported_by, 1)
+      ON DUPLICATE KEY UPDATE item_count = item_count + 1;
+    END IF;
+  END IF;
+END //
+
+CREATE TRIGGER trg_items_summary_del
+AFTER DELETE ON items
+FOR EACH ROW
+BEGIN
+  UPDATE item_category_counts SET item_count = item_count - 1
+  WHERE category = COALESCE(OLD.category, '') AND status = COALESCE(OLD.status, '');
+  IF OLD.reported_by IS NOT NULL THEN
+    UPDATE user_item_counts SET item_count = item_count - 1 WHERE user_id = OLD.reported_by;
+  END IF;
+END //
+
+CREATE TRIGGER trg_claims_summary_ins
+AFTER INSERT ON claims
+FOR EACH ROW
+INSERT INTO claim_status_counts(status, claim_count)
+VALUES (COALESCE(NEW.status, ''), 1)
+ON DUPLICATE KEY UPDATE claim_count = claim_count + 1 //
+
+CREATE TRIGGER trg_claims_summary_upd
+AFTER UPDATE ON claims
+FOR EACH ROW
+BEGIN
+  IF NOT (OLD.status <=> NEW.status) THEN
+    UPDATE claim_status_counts SET claim_count = claim_count - 1
+    WHERE status = COALESCE(OLD.status, '');
+    INSERT INTO claim_status_counts(status, claim_count)
+    VALUES (COALESCE(NEW.status, ''), 1)
+    ON DUPLICATE KEY UPDATE claim_count = claim_count + 1;
+  END IF;
+END //
+
+CREATE TRIGGER trg_claims_summary_del
+AFTER DELETE ON claims
+FOR EACH ROW
+UPDATE claim_status_counts SET claim_count = claim_count - 1
+WHERE status = COALESCE(OLD.status, '') //
+
+
+-- Migration 3: item_events audit table
+CREATE TABLE IF NOT EXISTS item_events (
+  event_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  item_id INT NOT NULL,
+  event_type ENUM('added','claim_approved') NOT NULL,
+  event_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  actor_id INT,
+  claim_id INT,
+  INDEX idx_item_events_item (item_id, event_time)
+) //
+
+CREATE TRIGGER trg_item_insert
+AFTER INSERT ON items
+FOR EACH ROW
+INSERT INTO item_events(item_id, event_type, actor_id)
+VALUES (NEW.item_id, 'added', NEW.reported_by) //
+
 CREATE TRIGGER trg_claim_approve
 AFTER UPDATE ON claims
 FOR EACH ROW
 BEGIN
-  IF NEW.status = 'approved' THEN
-    UPDATE items 
-    SET status='claimed',
-        description = CONCAT(
-            COALESCE(description,''), 
-            ' [Claim approved on ', DATE_FORMAT(NOW(), '%Y-%m-%d %H:%i:%s'), ']'
-        )
-    WHERE item_id=NEW.item_id;
+  IF NEW.status = 'approved' AND NOT (OLD.status <=> 'approved') THEN
+    UPDATE items SET status = 'claimed' WHERE item_id = NEW.item_id;
+    INSERT INTO item_events(item_id, event_type, actor_id, claim_id)
+    VALUES (NEW.item_id, 'claim_approved', NEW.claimer_id, NEW.claim_id);
+  END IF;
+END //
+
+
+-- Migration 6: change tracking
+CREATE TABLE IF NOT EXISTS tombstones (
+  tombstone_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  table_name VARCHAR(20) NOT NULL,
+  row_id INT NOT NULL,
+  deleted_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+  INDEX idx_tombstones_deleted (deleted_at)
+) //
+
+CREATE TRIGGER trg_users_tombstone
+AFTER DELETE ON users
+FOR EACH ROW
+INSERT INTO tombstones(table_name, row_id) VALUES ('users', OLD.user_id) //
+
+CREATE TRIGGER trg_locations_tombstone
+AFTER DELETE ON locations
+FOR EACH ROW
+INSERT INTO tombstones(table_name, row_id) VALUES ('locations', OLD.location_id) //
+
+CREATE TRIGGER trg_items_tombstone
+AFTER DELETE ON items
+FOR EACH ROW
+INSERT INTO tombstones(table_name, row_id) VALUES ('items', OLD.item_id) //
+
+CREATE TRIGGER trg_claims_tombstone
+AFTER DELETE ON claims
+FOR EACH ROW
+INSERT INTO tombstones(table_name, row_id) VALUES ('claims', OLD.claim_id) //
+
+
+-- Migration 8: archive tables
+CREATE TABLE IF NOT EXISTS items_archive (
+  item_id INT NOT NULL,
+  item_name VARCHAR(100) NOT NULL,
+  description TEXT,
+  category VARCHAR(50),
+  status ENUM('lost','found','claimed'),
+  report_date DATE NOT NULL,
+  reported_by INT,
+  location_id INT,
+  updated_at TIMESTAMP(6) NOT NULL,
+  archived_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+  PRIMARY KEY (item_id, report_date),
+  INDEX idx_items_archive_name (item_name),
+  INDEX idx_items_archive_date (report_date),
+  INDEX idx_items_archive_user (reported_by),
+  INDEX idx_items_archive_loc (location_id)
+) PARTITION BY RANGE COLUMNS(report_date) (PARTITION p_old VALUES LESS THAN ('2020-01-01'), PARTITION pmax VALUES LESS THAN (MAXVALUE)) //
+
+CREATE TABLE IF NOT EXISTS claims_archive (
+  claim_id INT NOT NULL,
+  item_id INT,
+  claimer_id INT,
+  claim_date DATE NOT NULL,
+  status ENUM('pending','approved','rejected'),
+  remarks VARCHAR(255),
+  updated_at TIMESTAMP(6) NOT NULL,
+  archived_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+  PRIMARY KEY (claim_id, claim_date),
+  INDEX idx_claims_archive_item (item_id),
+  INDEX idx_claims_archive_claimer (claimer_id),
+  INDEX idx_claims_archive_date (claim_date)
+) PARTITION BY RANGE COLUMNS(claim_date) (PARTITION p_old VALUES LESS THAN ('2020-01-01'), PARTITION pmax VALUES LESS THAN (MAXVALUE)) //
+
+
+-- Migration 9: batch claim decisions in the caller transaction
+CREATE PROCEDURE batch_claim_status(
+  IN p_claim_ids JSON,
+  IN p_status ENUM('approved','rejected'),
+  IN p_remark VARCHAR(255)
+)
+BEGIN
+  DECLARE v_selected INT DEFAULT 0;
+  DECLARE v_decided INT DEFAULT 0;
+  DECLARE v_competing INT DEFAULT 0;
+  DECLARE EXIT HANDLER FOR SQLEXCEPTION
+  BEGIN
+    ROLLBACK;
+    RESIGNAL;
+  END;
+
+  DROP TEMPORARY TABLE IF EXISTS tmp_batch_claims, tmp_batch_winners;
+  CREATE TEMPORARY TABLE tmp_batch_claims (
+    claim_id INT PRIMARY KEY,
+    item_id INT,
+    item_claimed BOOL NOT NULL,
+    INDEX (item_id)
+  );
+  CREATE TEMPORARY TABLE tmp_batch_winners (
+    claim_id INT PRIMARY KEY,
+    item_id INT UNIQUE
+  );
+
+  -- The listed claims that are still pending
+  INSERT INTO tmp_batch_claims(claim_id, item_id, item_claimed)
+  SELECT c.claim_id, c.item_id, COALESCE(i.status = 'claimed', FALSE)
+  FROM JSON_TABLE(p_claim_ids, '$[*]' COLUMNS (claim_id INT PATH '$')) AS j
+  JOIN claims c ON c.claim_id = j.claim_id
+  LEFT JOIN items i ON i.item_id = c.item_id
+  WHERE c.status = 'pending';
+  SET v_selected = ROW_COUNT();
+
+  IF p_status = 'approved' THEN
+    -- One winner per item (the oldest listed claim), none for claimed items
+    INSERT INTO tmp_batch_winners(claim_id, item_id)
+    SELECT MIN(claim_id), item_id
+    FROM tmp_batch_claims
+    WHERE NOT item_claimed
+    GROUP BY item_id;
+
+    UPDATE claims c
+    JOIN tmp_batch_winners w ON w.claim_id = c.claim_id
+    SET c.status = 'approved', c.remarks = p_remark;
+    SET v_decided = ROW_COUNT();
+
+    -- Every other pending claim on those items loses (listed or not)
+    UPDATE claims c
+    JOIN tmp_batch_winners w ON w.item_id = c.item_id
+    SET c.status = 'rejected', c.remarks = CONCAT('Claim #', w.claim_id, ' was approved for this item')
+    WHERE c.status = 'pending';
+    SET v_competing = ROW_COUNT();
+
+    UPDATE claims c
+    JOIN tmp_batch_claims b ON b.claim_id = c.claim_id
+    SET c.status = 'rejected', c.remarks = 'Item was already claimed'
+    WHERE b.item_claimed AND c.status = 'pending';
+    SET v_competing = v_competing + ROW_COUNT();
+  ELSE
+    UPDATE claims c
+    JOIN tmp_batch_claims b ON b.claim_id = c.claim_id
+    SET c.status = 'rejected', c.remarks = p_remark;
+    SET v_decided = ROW_COUNT();
   END IF;
+
+  DROP TEMPORARY TABLE IF EXISTS tmp_batch_claims, tmp_batch_winners;
+  SELECT v_decided AS decided, v_competing AS auto_rejected,
+         JSON_LENGTH(p_claim_ids) - v_selected AS skipped;
 END //
+
+
+-- Migration 10: archived rows in the summary tables
+ALTER TABLE item_category_counts ADD COLUMN archived_count INT NOT NULL DEFAULT 0 //
+
+ALTER TABLE user_item_counts ADD COLUMN archived_count INT NOT NULL DEFAULT 0 //
+
+ALTER TABLE claim_status_counts ADD COLUMN archived_count INT NOT NULL DEFAULT 0 //
+
+CREATE FUNCTION count_items_by_user(p_user_id INT)
+RETURNS INT
+DETERMINISTIC
+BEGIN
+  DECLARE total INT;
+  SELECT COALESCE((SELECT item_count + archived_count FROM user_item_counts
+                   WHERE user_id = p_user_id), 0)
+  INTO total;
+  RETURN total;
+END //
+
 DELIMITER ;
+-- END GENERATED
 
 
 -- SAMPLE DATA POPULATION (DML)
@@ -187,6 +474,13 @@ FROM items
 GROUP BY category
 ORDER BY total_items DESC;
 
+-- Same answer in O(groups) from the summary table (what the Query Hub runs)
+SELECT category, SUM(item_count) AS total_items
+FROM item_category_counts
+GROUP BY category
+HAVING total_items > 0
+ORDER BY total_items DESC;
+
 -- Correlated Query: Items reported by users who have claimed items
 SELECT 
     u.user_id,
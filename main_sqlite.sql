@@ -0,0 +1,308 @@
+-- Lost & Found schema for the embedded SQLite backend (sqlite_backend.py).
+-- Mirrors main.sql: same tables, columns, indexes, triggers and sample data.
+-- ENUMs are CHECK constraints; ON UPDATE CURRENT_TIMESTAMP(6) is a trigger;
+-- the stored procedures and count_items_by_user() are Python functions
+-- registered by sqlite_backend.py. No FULLTEXT index (search.py uses LIKE)
+-- and the archive tables are not partitioned.
+-- Timestamps are local time as text, 'YYYY-MM-DD HH:MM:SS.ffffff'.
+
+-- TABLE 1: USERS
+CREATE TABLE users (
+  user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name VARCHAR(100) NOT NULL,
+  email VARCHAR(100) UNIQUE NOT NULL,
+  phone VARCHAR(15),
+  role VARCHAR(10) DEFAULT 'student' CHECK (role IN ('student','staff','admin')),
+  updated_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime'))
+);
+
+-- TABLE 2: LOCATIONS
+CREATE TABLE locations (
+  location_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  location_name VARCHAR(100) NOT NULL,
+  building VARCHAR(50),
+  floor_no INT,
+  updated_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime'))
+);
+
+-- TABLE 3: ITEMS
+CREATE TABLE items (
+  item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  item_name VARCHAR(100) NOT NULL,
+  description TEXT,
+  category VARCHAR(50),
+  status VARCHAR(10) DEFAULT 'lost' CHECK (status IN ('lost','found','claimed')),
+  report_date DATE DEFAULT (date('now', 'localtime')),
+  reported_by INT REFERENCES users(user_id),
+  location_id INT REFERENCES locations(location_id),
+  updated_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime'))
+);
+
+-- TABLE 4: CLAIMS
+CREATE TABLE claims (
+  claim_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  item_id INT REFERENCES items(item_id),
+  claimer_id INT REFERENCES users(user_id),
+  claim_date DATE DEFAULT (date('now', 'localtime')),
+  status VARCHAR(10) DEFAULT 'pending' CHECK (status IN ('pending','approved','rejected')),
+  remarks VARCHAR(255),
+  updated_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime'))
+);
+
+-- INDEXES (same names as main.sql; MySQL indexes foreign keys implicitly)
+CREATE INDEX idx_items_category_status ON items(category, status);
+CREATE INDEX idx_items_status_date ON items(status, report_date);
+CREATE INDEX idx_claims_status_date ON claims(status, claim_date);
+CREATE INDEX idx_users_name ON users(name);
+CREATE INDEX idx_locations_name ON locations(location_name);
+CREATE INDEX idx_users_updated ON users(updated_at);
+CREATE INDEX idx_locations_updated ON locations(updated_at);
+CREATE INDEX idx_items_updated ON items(updated_at);
+CREATE INDEX idx_claims_updated ON claims(updated_at);
+CREATE INDEX idx_items_name ON items(item_name);
+CREATE INDEX idx_items_report_date ON items(report_date);
+CREATE INDEX idx_locations_building ON locations(building);
+CREATE INDEX idx_claims_date ON claims(claim_date);
+CREATE INDEX idx_items_reported_by ON items(reported_by);
+CREATE INDEX idx_items_location ON items(location_id);
+CREATE INDEX idx_claims_item ON claims(item_id);
+CREATE INDEX idx_claims_claimer ON claims(claimer_id);
+
+-- SCHEMA VERSION: the MySQL migrations this schema corresponds to
+CREATE TABLE schema_migrations (
+  version INT PRIMARY KEY,
+  name VARCHAR(100) NOT NULL,
+  applied_at DATETIME DEFAULT (datetime('now', 'localtime')),
+  explain_before TEXT,
+  explain_after TEXT
+);
+
+INSERT INTO schema_migrations (version, name) VALUES
+(1, 'hot path indexes'),
+(2, 'trigger-maintained summary tables'),
+(3, 'item_events audit table'),
+(4, 'items full-text index'),
+(5, 'batch claim decisions'),
+(6, 'change tracking'),
+(7, 'sort indexes'),
+(8, 'archive tables'),
+(9, 'batch claim decisions in the caller transaction'),
+(10, 'archived rows in the summary tables');
+
+-- ITEM EVENTS: append-only item history written by the triggers
+CREATE TABLE item_events (
+  event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  item_id INT NOT NULL,
+  event_type VARCHAR(20) NOT NULL CHECK (event_type IN ('added','claim_approved')),
+  event_time DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+  actor_id INT,
+  claim_id INT
+);
+CREATE INDEX idx_item_events_item ON item_events(item_id, event_time);
+
+-- TOMBSTONES: one row per deleted users / locations / items / claims row
+CREATE TABLE tombstones (
+  tombstone_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  table_name VARCHAR(20) NOT NULL,
+  row_id INT NOT NULL,
+  deleted_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime'))
+);
+CREATE INDEX idx_tombstones_deleted ON tombstones(deleted_at);
+
+-- ARCHIVE: archive.py moves resolved rows here, as on MySQL (no partitions)
+CREATE TABLE items_archive (
+  item_id INT NOT NULL,
+  item_name VARCHAR(100) NOT NULL,
+  description TEXT,
+  category VARCHAR(50),
+  status VARCHAR(10) CHECK (status IN ('lost','found','claimed')),
+  report_date DATE NOT NULL,
+  reported_by INT,
+  location_id INT,
+  updated_at TIMESTAMP NOT NULL,
+  archived_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime')),
+  PRIMARY KEY (item_id, report_date)
+);
+CREATE INDEX idx_items_archive_name ON items_archive(item_name);
+CREATE INDEX idx_items_archive_date ON items_archive(report_date);
+CREATE INDEX idx_items_archive_user ON items_archive(reported_by);
+CREATE INDEX idx_items_archive_loc ON items_archive(location_id);
+
+CREATE TABLE claims_archive (
+  claim_id INT NOT NULL,
+  item_id INT,
+  claimer_id INT,
+  claim_date DATE NOT NULL,
+  status VARCHAR(10) CHECK (status IN ('pending','approved','rejected')),
+  remarks VARCHAR(255),
+  updated_at TIMESTAMP NOT NULL,
+  archived_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime')),
+  PRIMARY KEY (claim_id, claim_date)
+);
+CREATE INDEX idx_claims_archive_item ON claims_archive(item_id);
+CREATE INDEX idx_claims_archive_claimer ON claims_archive(claimer_id);
+CREATE INDEX idx_claims_archive_date ON claims_archive(claim_date);
+
+-- SUMMARY TABLES: kept current by the trg_*_summary_* triggers below;
+-- archived_count is added to by archive.py as rows move to the archive
+CREATE TABLE item_category_counts (
+  category VARCHAR(50) NOT NULL,
+  status VARCHAR(10) NOT NULL,
+  item_count INT NOT NULL DEFAULT 0,
+  archived_count INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (category, status)
+);
+
+CREATE TABLE user_item_counts (
+  user_id INT PRIMARY KEY,
+  item_count INT NOT NULL DEFAULT 0,
+  archived_count INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE claim_status_counts (
+  status VARCHAR(10) PRIMARY KEY,
+  claim_count INT NOT NULL DEFAULT 0,
+  archived_count INT NOT NULL DEFAULT 0
+);
+
+-- ON UPDATE CURRENT_TIMESTAMP(6): bump updated_at unless the UPDATE set it
+CREATE TRIGGER trg_users_touch AFTER UPDATE ON users FOR EACH ROW
+  WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+  UPDATE users SET updated_at = strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime')
+  WHERE user_id = NEW.user_id;
+END;
+CREATE TRIGGER trg_locations_touch AFTER UPDATE ON locations FOR EACH ROW
+  WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+  UPDATE locations SET updated_at = strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime')
+  WHERE location_id = NEW.location_id;
+END;
+CREATE TRIGGER trg_items_touch AFTER UPDATE ON items FOR EACH ROW
+  WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+  UPDATE items SET updated_at = strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime')
+  WHERE item_id = NEW.item_id;
+END;
+CREATE TRIGGER trg_claims_touch AFTER UPDATE ON claims FOR EACH ROW
+  WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+  UPDATE claims SET updated_at = strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime')
+  WHERE claim_id = NEW.claim_id;
+END;
+
+-- TRIGGER 1: Log an 'added' event when a new item is inserted
+CREATE TRIGGER trg_item_insert AFTER INSERT ON items FOR EACH ROW
+BEGIN
+  INSERT INTO item_events(item_id, event_type, actor_id)
+  VALUES (NEW.item_id, 'added', NEW.reported_by);
+END;
+
+-- TRIGGER 2: Auto-update item status (and log the event) when a claim is approved
+CREATE TRIGGER trg_claim_approve AFTER UPDATE ON claims FOR EACH ROW
+  WHEN NEW.status = 'approved' AND OLD.status IS NOT 'approved'
+BEGIN
+  UPDATE items SET status = 'claimed' WHERE item_id = NEW.item_id;
+  INSERT INTO item_events(item_id, event_type, actor_id, claim_id)
+  VALUES (NEW.item_id, 'claim_approved', NEW.claimer_id, NEW.claim_id);
+END;
+
+-- SUMMARY TRIGGERS: keep the *_counts tables current
+CREATE TRIGGER trg_items_summary_ins AFTER INSERT ON items FOR EACH ROW
+BEGIN
+  INSERT INTO item_category_counts(category, status, item_count)
+  VALUES (COALESCE(NEW.category, ''), COALESCE(NEW.status, ''), 1)
+  ON CONFLICT(category, status) DO UPDATE SET item_count = item_count + 1;
+  INSERT INTO user_item_counts(user_id, item_count)
+  SELECT NEW.reported_by, 1 WHERE NEW.reported_by IS NOT NULL
+  ON CONFLICT(user_id) DO UPDATE SET item_count = item_count + 1;
+END;
+
+CREATE TRIGGER trg_items_summary_upd AFTER UPDATE ON items FOR EACH ROW
+  WHEN NOT (OLD.category IS NEW.category AND OLD.status IS NEW.status
+            AND OLD.reported_by IS NEW.reported_by)
+BEGIN
+  UPDATE item_category_counts SET item_count = item_count - 1
+  WHERE NOT (OLD.category IS NEW.category AND OLD.status IS NEW.status)
+    AND category = COALESCE(OLD.category, '') AND status = COALESCE(OLD.status, '');
+  INSERT INTO item_category_counts(category, status, item_count)
+  SELECT COALESCE(NEW.category, ''), COALESCE(NEW.status, ''), 1
+  WHERE NOT (OLD.category IS NEW.category AND OLD.status IS NEW.status)
+  ON CONFLICT(category, status) DO UPDATE SET item_count = item_count + 1;
+  UPDATE user_item_counts SET item_count = item_count - 1
+  WHERE OLD.reported_by IS NOT NEW.reported_by AND user_id = OLD.reported_by;
+  INSERT INTO user_item_counts(user_id, item_count)
+  SELECT NEW.reported_by, 1
+  WHERE OLD.reported_by IS NOT NEW.reported_by AND NEW.reported_by IS NOT NULL
+  ON CONFLICT(user_id) DO UPDATE SET item_count = item_count + 1;
+END;
+
+CREATE TRIGGER trg_items_summary_del AFTER DELETE ON items FOR EACH ROW
+BEGIN
+  UPDATE item_category_counts SET item_count = item_count - 1
+  WHERE category = COALESCE(OLD.category, '') AND status = COALESCE(OLD.status, '');
+  UPDATE user_item_counts SET item_count = item_count - 1 WHERE user_id = OLD.reported_by;
+END;
+
+CREATE TRIGGER trg_claims_summary_ins AFTER INSERT ON claims FOR EACH ROW
+BEGIN
+  INSERT INTO claim_status_counts(status, claim_count)
+  VALUES (COALESCE(NEW.status, ''), 1)
+  ON CONFLICT(status) DO UPDATE SET claim_count = claim_count + 1;
+END;
+
+CREATE TRIGGER trg_claims_summary_upd AFTER UPDATE ON claims FOR EACH ROW
+  WHEN OLD.status IS NOT NEW.status
+BEGIN
+  UPDATE claim_status_counts SET claim_count = claim_count - 1
+  WHERE status = COALESCE(OLD.status, '');
+  INSERT INTO claim_status_counts(status, claim_count)
+  VALUES (COALESCE(NEW.status, ''), 1)
+  ON CONFLICT(status) DO UPDATE SET claim_count = claim_count + 1;
+END;
+
+CREATE TRIGGER trg_claims_summary_del AFTER DELETE ON claims FOR EACH ROW
+BEGIN
+  UPDATE claim_status_counts SET claim_count = claim_count - 1
+  WHERE status = COALESCE(OLD.status, '');
+END;
+
+-- TOMBSTONE TRIGGERS: record deletes for the incremental sync
+CREATE TRIGGER trg_users_tombstone AFTER DELETE ON users FOR EACH ROW
+BEGIN
+  INSERT INTO tombstones(table_name, row_id) VALUES ('users', OLD.user_id);
+END;
+CREATE TRIGGER trg_locations_tombstone AFTER DELETE ON locations FOR EACH ROW
+BEGIN
+  INSERT INTO tombstones(table_name, row_id) VALUES ('locations', OLD.location_id);
+END;
+CREATE TRIGGER trg_items_tombstone AFTER DELETE ON items FOR EACH ROW
+BEGIN
+  INSERT INTO tombstones(table_name, row_id) VALUES ('items', OLD.item_id);
+END;
+CREATE TRIGGER trg_claims_tombstone AFTER DELETE ON claims FOR EACH ROW
+BEGIN
+  INSERT INTO tombstones(table_name, row_id) VALUES ('claims', OLD.claim_id);
+END;
+
+-- SAMPLE DATA (as in main.sql)
+INSERT INTO users (name, email, phone, role) VALUES
+('Shivam Anand', 'shivam@example.com', '9999999999', 'student'),
+('Priya Verma', 'priya@example.com', '8888888888', 'staff'),
+('Ravi Adram', 'ravi.admin@example.com', '7777777777', 'admin');
+
+INSERT INTO locations (location_name, building, floor_no) VALUES
+('Library', 'Block A', 1),
+('Cafeteria', 'Block B', 0),
+('Main Ground', 'Block C', 0);
+
+INSERT INTO items (item_name, description, category, status, reported_by, location_id)
+VALUES
+('Black Wallet', 'Leather wallet with ID card', 'Accessories', 'lost', 1, 1),
+('Water Bottle', 'Blue Milton bottle', 'Daily Use', 'found', 2, 2),
+('Laptop Charger', 'HP charger 65W', 'Electronics', 'lost', 1, 3);
+
+INSERT INTO claims (item_id, claimer_id, status, remarks)
+VALUES
+(2, 1, 'pending', 'Looks like my bottle'),
+(1, 2, 'approved', 'Owner confirmed');
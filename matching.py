@@ -0,0 +1,277 @@
+# Lost & Found DBMS Project - Lost <-> found matching
+# ------------------------------------------------
+# Suggests which `found` report answers which `lost` report.
+#
+# Blocking: items are bucketed by (status, category, report week). A lost
+# item is only compared with found items of the same category reported
+# within `max_days` of it (the neighbouring week buckets), so the work is
+# the sum of the block sizes, not lost x found.
+#
+# Scoring, per pair, weighted:
+# - text:  cosine of hashed word vectors of item_name (x2) + description
+# - place: same location 1.0, same building 0.6, else 0
+# - date:  exp(-days apart / date_scale)
+# Within a block the scores are computed as one matrix product when NumPy
+# is installed (pip install numpy), with a pure-Python fallback.
+#
+# MatchIndex.sync() is incremental: after the first load it only fetches
+# items with a higher item_id than it has seen and scores those against
+# their blocks (so a new add_item() report is matched immediately).
+# Items edited, deleted or claimed after they were loaded are passed to
+# MatchIndex.refresh(), which re-reads them (dropping the ones no longer
+# lost / found) so their stale pairs are not offered until the next reload.
+# The index is not locked: the GUI only touches it from one executor channel.
+#
+# Usage:
+#   python matching.py [--limit 20]
+
+import argparse
+import math
+import re
+import time
+import zlib
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from db import run_query
+
+MATCH_CONFIG = {
+    "dims": 512,              # hashed text feature dimensions
+    "max_days": 30,           # only pair reports this close in time
+    "date_scale": 7.0,        # days for the date score to drop to 1/e
+    "min_score": 0.35,        # pairs below this are not kept
+    "max_age": 300.0,         # seconds before sync() reloads everything
+    "weights": {"text": 0.55, "place": 0.25, "date": 0.20},
+}
+
+MATCH_SQL = """
+    SELECT i.item_id, i.item_name, i.description, i.category, i.status,
+           i.report_date, i.reported_by, i.location_id, l.building
+    FROM items i
+    LEFT JOIN locations l ON l.location_id = i.location_id
+    WHERE i.status IN ('lost', 'found') AND i.item_id > %s
+    ORDER BY i.item_id
+    """
+
+MATCH_IDS_SQL = """
+    SELECT i.item_id, i.item_name, i.description, i.category, i.status,
+           i.report_date, i.reported_by, i.location_id, l.building
+    FROM items i
+    LEFT JOIN locations l ON l.location_id = i.location_id
+    WHERE i.status IN ('lost', 'found') AND i.item_id IN ({marks})
+    ORDER BY i.item_id
+    """
+
+MatchItem = namedtuple("MatchItem", "item_id item_name description category status "
+                                    "report_date reported_by location_id building")
+Suggestion = namedtuple("Suggestion", "score lost found")
+
+_WORD = re.compile(r"[a-z0-9]+")
+STOP_WORDS = {"a", "an", "the", "and", "or", "of", "with", "in", "on", "at", "to", "my", "is"}
+
+def tokens(text):
+    return [w for w in _WORD.findall((text or "").lower()) if w not in STOP_WORDS]
+
+def text_vector(item, dims):
+    """Hashed, L2-normalized word vector {dim: weight} (name words count double)."""
+    vec = {}
+    for weight, text in ((2.0, item.item_name), (1.0, item.description)):
+        for w in tokens(text):
+            d = zlib.crc32(w.encode()) % dims
+            vec[d] = vec.get(d, 0.0) + weight
+    norm = math.sqrt(sum(v * v for v in vec.values()))
+    return {d: v / norm for d, v in vec.items()} if norm else {}
+
+def block_key(item):
+    return ((item.category or "").strip().lower(),
+            item.report_date.toordinal() // 7 if item.report_date else None)
+
+class MatchIndex:
+    def __init__(self, config=MATCH_CONFIG):
+        self.config = config
+        self.last_ms = 0.0
+        self._reset()
+
+    def _reset(self):
+        self.items = {}           # item_id -> MatchItem
+        self.vectors = {}         # item_id -> sparse text vector
+        self.blocks = {}          # (status, category, week) -> [item_id]
+        self.pairs = {}           # (lost_id, found_id) -> score
+        self.buildings = {}       # building name -> small int (for vector compares)
+        self.max_id = 0
+        self.loaded_at = None
+
+    # ---------------------- loading (worker thread) ----------------------
+    def sync(self, full=False):
+        """Bring the index up to date; returns the new Suggestions found."""
+        t0 = time.perf_counter()
+        if (full or self.loaded_at is None
+                or time.monotonic() - self.loaded_at > self.config["max_age"]):
+            self._reset()
+            self.loaded_at = time.monotonic()
+        rows = run_query(MATCH_SQL, (self.max_id,))
+        new = [self._add(MatchItem._make(r)) for r in rows]
+        found = self._score_new(new)
+        self.last_ms = (time.perf_counter() - t0) * 1000.0
+        return found
+
+    def _add(self, item):
+        self.items[item.item_id] = item
+        self.vectors[item.item_id] = text_vector(item, self.config["dims"])
+        category, week = block_key(item)
+        self.blocks.setdefault((item.status, category, week), []).append(item.item_id)
+        self.max_id = max(self.max_id, item.item_id)
+        return item
+
+    def refresh(self, item_ids):
+        """Re-read items changed since they were loaded; returns their new Suggestions.
+
+        Ids above max_id are left to sync() so no item is skipped there.
+        """
+        ids = sorted({int(i) for i in item_ids if int(i) <= self.max_id})
+        if self.loaded_at is None or not ids:
+            return []
+        self.discard(ids)
+        rows = run_query(MATCH_IDS_SQL.format(marks=", ".join(["%s"] * len(ids))), ids)
+        return self._score_new([self._add(MatchItem._make(r)) for r in rows])
+
+    def drop_pair(self, lost_id, found_id):
+        # A suggestion acted on (claim created): stop offering it
+        self.pairs.pop((lost_id, found_id), None)
+
+    def discard(self, item_ids):
+        # Items claimed / deleted: drop them and every pair they are in
+        gone = set(item_ids)
+        for item_id in gone:
+            item = self.items.pop(item_id, None)
+            if item is None:
+                continue
+            self.vectors.pop(item_id, None)
+            category, week = block_key(item)
+            block = self.blocks.get((item.status, category, week))
+            if block and item_id in block:
+                block.remove(item_id)
+        self.pairs = {p: s for p, s in self.pairs.items() if p[0] not in gone and p[1] not in gone}
+
+    # ---------------------- blocking ----------------------
+    def _neighbours(self, status, category, week):
+        reach = math.ceil(self.config["max_days"] / 7)
+        out = []
+        for w in range(week - reach, week + reach + 1):
+            out.extend(self.blocks.get((status, category, w), ()))
+        return out
+
+    def _score_new(self, new):
+        # Group the new items by block, then score each group against the
+        # opposite status in the neighbouring weeks in one go
+        groups = {}
+        for item in new:
+            category, week = block_key(item)
+            if week is not None:
+                groups.setdefault((item.status, category, week), []).append(item.item_id)
+        new_ids = {item.item_id for item in new}
+        found = []
+        for (status, category, week), ids in groups.items():
+            other = "found" if status == "lost" else "lost"
+            # A pair of two new items is scored once, from its lost side
+            cands = [c for c in self._neighbours(other, category, week)
+                     if other == "found" or c not in new_ids]
+            if not cands:
+                continue
+            lost, fnd = (ids, cands) if status == "lost" else (cands, ids)
+            for li, fi, score in self.score(lost, fnd):
+                self.pairs[(li, fi)] = score
+                found.append(Suggestion(score, self.items[li], self.items[fi]))
+        found.sort(key=lambda s: -s.score)
+        return found
+
+    # ---------------------- scoring ----------------------
+    def _building(self, item):
+        if not item.building:
+            return -1
+        return self.buildings.setdefault(item.building, len(self.buildings))
+
+    def score(self, lost_ids, found_ids):
+        """[(lost_id, found_id, score)] for pairs within max_days and >= min_score."""
+        if np is not None:
+            return self._score_numpy(lost_ids, found_ids)
+        return self._score_python(lost_ids, found_ids)
+
+    def _score_numpy(self, lost_ids, found_ids):
+        cfg, wt = self.config, self.config["weights"]
+        def matrix(ids):
+            m = np.zeros((len(ids), cfg["dims"]), dtype=np.float32)
+            for row, item_id in enumerate(ids):
+                for d, v in self.vectors[item_id].items():
+                    m[row, d] = v
+            return m
+        def column(ids, fn):
+            return np.array([fn(self.items[i]) for i in ids], dtype=np.int64)
+        text = matrix(lost_ids) @ matrix(found_ids).T
+        day = lambda it: it.report_date.toordinal()
+        days = np.abs(column(lost_ids, day)[:, None] - column(found_ids, day)[None, :])
+        loc = lambda it: it.location_id if it.location_id is not None else -1
+        lloc, floc = column(lost_ids, loc)[:, None], column(found_ids, loc)[None, :]
+        lb, fb = column(lost_ids, self._building)[:, None], column(found_ids, self._building)[None, :]
+        place = np.where((lloc == floc) & (lloc >= 0), 1.0,
+                         np.where((lb == fb) & (lb >= 0), 0.6, 0.0))
+        score = (wt["text"] * text + wt["place"] * place
+                 + wt["date"] * np.exp(-days / cfg["date_scale"]))
+        score[days > cfg["max_days"]] = 0.0
+        li, fi = np.nonzero(score >= cfg["min_score"])
+        return [(lost_ids[a], found_ids[b], round(float(score[a, b]), 3)) for a, b in zip(li, fi)]
+
+    def _score_python(self, lost_ids, found_ids):
+        cfg, wt = self.config, self.config["weights"]
+        out = []
+        for li in lost_ids:
+            lost, lvec = self.items[li], self.vectors[li]
+            for fi in found_ids:
+                found = self.items[fi]
+                days = abs(lost.report_date.toordinal() - found.report_date.toordinal())
+                if days > cfg["max_days"]:
+                    continue
+                fvec = self.vectors[fi]
+                text = sum(v * fvec.get(d, 0.0) for d, v in lvec.items())
+                if lost.location_id is not None and lost.location_id == found.location_id:
+                    place = 1.0
+                elif lost.building and lost.building == found.building:
+                    place = 0.6
+                else:
+                    place = 0.0
+                score = (wt["text"] * text + wt["place"] * place
+                         + wt["date"] * math.exp(-days / cfg["date_scale"]))
+                if score >= cfg["min_score"]:
+                    out.append((li, fi, round(score, 3)))
+        return out
+
+    # ---------------------- results ----------------------
+    def suggestions(self, limit=100, item_id=None):
+        """Best pairs first, optionally only those involving `item_id`."""
+        pairs = self.pairs.items()
+        if item_id is not None:
+            pairs = [(p, s) for p, s in pairs if item_id in p]
+        best = sorted(pairs, key=lambda ps: -ps[1])[:limit]
+        return [Suggestion(s, self.items[li], self.items[fi]) for (li, fi), s in best]
+
+def claim_remark(suggestion):
+    return f"Auto-match with lost item {suggestion.lost.item_id} (score {suggestion.score:.2f})"
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Suggest lost/found item matches.")
+    ap.add_argument("--limit", type=int, default=20)
+    args = ap.parse_args(argv)
+    index = MatchIndex()
+    index.sync()
+    for s in index.suggestions(args.limit):
+        print(f"{s.score:.2f}  lost {s.lost.item_id} {s.lost.item_name!r}  <->  "
+              f"found {s.found.item_id} {s.found.item_name!r}")
+    print(f"{len(index.items):,} open items, {len(index.pairs):,} candidate pairs "
+          f"({index.last_ms:.0f} ms, {'numpy' if np is not None else 'pure Python'})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,733 @@
+# Lost & Found DBMS Project - Schema migrations
+# ------------------------------------------------
+# Upgrades an existing `lostfound` database in place. main.sql always
+# builds the latest schema (and marks every migration as applied); the
+# migrations here bring older databases up to the same point.
+#
+# The migrations are the one source of the tables, triggers and routines
+# they create: main.sql carries them in a block generated from the steps
+# here (schema_sql()), which test_migrations.py checks is current.
+#
+# - Applied versions are recorded in `schema_migrations`.
+# - Each migration lists the application queries it is meant to speed
+#   up; their EXPLAIN plans are captured before and after the migration
+#   and stored with it, so a full scan (type=ALL) turning into an index
+#   lookup (ref / range / index) can be checked afterwards.
+#
+# Usage:
+#   python migrations.py status
+#   python migrations.py upgrade [--to VERSION]
+#   python migrations.py plans VERSION
+#   python migrations.py schema [--write | --check]   (main.sql's generated block)
+
+import argparse
+import functools
+import json
+import os
+import re
+import sys
+import textwrap
+
+from db import get_conn
+from queries import (TABLE_SQL, NESTED_SQL, JOIN_SQL, AGGREGATE_SQL, QUERY_HUB,
+                     ITEM_HISTORY_SQL)
+import summaries
+import archive
+
+# ---------------------- STEP HELPERS ----------------------
+def index_exists(cur, table, name):
+    cur.execute("""SELECT 1 FROM information_schema.statistics
+                   WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+                   LIMIT 1""", (table, name))
+    return cur.fetchone() is not None
+
+def add_index(table, name, columns, kind="INDEX"):
+    # Idempotent CREATE INDEX (MySQL has no CREATE INDEX IF NOT EXISTS)
+    def step(cur):
+        if not index_exists(cur, table, name):
+            cur.execute(f"ALTER TABLE {table} ADD {kind} {name} ({columns})")
+    step.__doc__ = f"ADD {kind} {name} ON {table}({columns})"
+    return step
+
+def column_exists(cur, table, name):
+    cur.execute("""SELECT 1 FROM information_schema.columns
+                   WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+                   LIMIT 1""", (table, name))
+    return cur.fetchone() is not None
+
+def add_column(table, name, definition):
+    def step(cur):
+        if not column_exists(cur, table, name):
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+    step.__doc__ = f"ADD COLUMN {table}.{name}"
+    step.sql = f"ALTER TABLE {table} ADD COLUMN {name} {definition}"   # for schema_sql()
+    step.table = table
+    return step
+
+# Query Hub SQL as it was before migration 2 moved it onto the summary
+# tables (plans of older migrations must keep measuring the same text)
+SCAN_NESTED_SQL = """
+    SELECT name, user_id FROM users
+    WHERE user_id IN (
+        SELECT reported_by FROM items GROUP BY reported_by
+        HAVING COUNT(item_id) > (
+            SELECT AVG(item_count) FROM (
+                SELECT COUNT(item_id) AS item_count FROM items GROUP BY reported_by
+            ) AS sub))"""
+SCAN_AGGREGATE_SQL = """
+    SELECT category, COUNT(item_id) AS total_items
+    FROM items GROUP BY category ORDER BY total_items DESC"""
+SCAN_COUNT_SQL = "SELECT COUNT(*) FROM items WHERE reported_by = 1"
+SCAN_CLAIM_STATUS_SQL = "SELECT status, COUNT(*) FROM claims GROUP BY status"
+
+# ... and as migration 2 left it, before migration 10 added archived_count
+SUMMARY_NESTED_SQL = """
+    SELECT u.name, u.user_id FROM users u
+    JOIN user_item_counts c ON c.user_id = u.user_id
+    WHERE c.item_count > (
+        SELECT t.total * 1.0 / NULLIF(r.reporters + CASE WHEN t.total > r.reported THEN 1 ELSE 0 END, 0)
+        FROM (SELECT COALESCE(SUM(item_count), 0) AS total FROM item_category_counts) AS t,
+             (SELECT COUNT(*) AS reporters, COALESCE(SUM(item_count), 0) AS reported
+              FROM user_item_counts WHERE item_count > 0) AS r)"""
+SUMMARY_AGGREGATE_SQL = """
+    SELECT category, SUM(item_count) AS total_items FROM item_category_counts
+    GROUP BY category HAVING total_items > 0 ORDER BY total_items DESC"""
+SUMMARY_CLAIM_STATUS_SQL = "SELECT status, claim_count FROM claim_status_counts WHERE claim_count > 0 ORDER BY status"
+
+# ---------------------- MIGRATION 2: summary tables ----------------------
+SUMMARY_STEPS = [
+    """CREATE TABLE IF NOT EXISTS item_category_counts (
+         category VARCHAR(50) NOT NULL,
+         status VARCHAR(10) NOT NULL,
+         item_count INT NOT NULL DEFAULT 0,
+         PRIMARY KEY (category, status)
+       )""",
+    """CREATE TABLE IF NOT EXISTS user_item_counts (
+         user_id INT PRIMARY KEY,
+         item_count INT NOT NULL DEFAULT 0
+       )""",
+    """CREATE TABLE IF NOT EXISTS claim_status_counts (
+         status VARCHAR(10) PRIMARY KEY,
+         claim_count INT NOT NULL DEFAULT 0
+       )""",
+    "DROP TRIGGER IF EXISTS trg_items_summary_ins",
+    """CREATE TRIGGER trg_items_summary_ins
+       AFTER INSERT ON items
+       FOR EACH ROW
+       BEGIN
+         INSERT INTO item_category_counts(category, status, item_count)
+         VALUES (COALESCE(NEW.category, ''), COALESCE(NEW.status, ''), 1)
+         ON DUPLICATE KEY UPDATE item_count = item_count + 1;
+         IF NEW.reported_by IS NOT NULL THEN
+           INSERT INTO user_item_counts(user_id, item_count) VALUES (NEW.reported_by, 1)
+           ON DUPLICATE KEY UPDATE item_count = item_count + 1;
+         END IF;
+       END""",
+    "DROP TRIGGER IF EXISTS trg_items_summary_upd",
+    """CREATE TRIGGER trg_items_summary_upd
+       AFTER UPDATE ON items
+       FOR EACH ROW
+       BEGIN
+         IF NOT (OLD.category <=> NEW.category AND OLD.status <=> NEW.status) THEN
+           UPDATE item_category_counts SET item_count = item_count - 1
+           WHERE category = COALESCE(OLD.category, '') AND status = COALESCE(OLD.status, '');
+           INSERT INTO item_category_counts(category, status, item_count)
+           VALUES (COALESCE(NEW.category, ''), COALESCE(NEW.status, ''), 1)
+           ON DUPLICATE KEY UPDATE item_count = item_count + 1;
+         END IF;
+         IF NOT (OLD.reported_by <=> NEW.reported_by) THEN
+           IF OLD.reported_by IS NOT NULL THEN
+             UPDATE user_item_counts SET item_count = item_count - 1 WHERE user_id = OLD.reported_by;
+           END IF;
+           IF NEW.reported_by IS NOT NULL THEN
+             INSERT INTO user_item_counts(user_id, item_count) VALUES (NEW.reported_by, 1)
+             ON DUPLICATE KEY UPDATE item_count = item_count + 1;
+           END IF;
+         END IF;
+       END""",
+    "DROP TRIGGER IF EXISTS trg_items_summary_del",
+    """CREATE TRIGGER trg_items_summary_del
+       AFTER DELETE ON items
+       FOR EACH ROW
+       BEGIN
+         UPDATE item_category_counts SET item_count = item_count - 1
+         WHERE category = COALESCE(OLD.category, '') AND status = COALESCE(OLD.status, '');
+         IF OLD.reported_by IS NOT NULL THEN
+           UPDATE user_item_counts SET item_count = item_count - 1 WHERE user_id = OLD.reported_by;
+         END IF;
+       END""",
+    "DROP TRIGGER IF EXISTS trg_claims_summary_ins",
+    """CREATE TRIGGER trg_claims_summary_ins
+       AFTER INSERT ON claims
+       FOR EACH ROW
+       INSERT INTO claim_status_counts(status, claim_count)
+       VALUES (COALESCE(NEW.status, ''), 1)
+       ON DUPLICATE KEY UPDATE claim_count = claim_count + 1""",
+    "DROP TRIGGER IF EXISTS trg_claims_summary_upd",
+    """CREATE TRIGGER trg_claims_summary_upd
+       AFTER UPDATE ON claims
+       FOR EACH ROW
+       BEGIN
+         IF NOT (OLD.status <=> NEW.status) THEN
+           UPDATE claim_status_counts SET claim_count = claim_count - 1
+           WHERE status = COALESCE(OLD.status, '');
+           INSERT INTO claim_status_counts(status, claim_count)
+           VALUES (COALESCE(NEW.status, ''), 1)
+           ON DUPLICATE KEY UPDATE claim_count = claim_count + 1;
+         END IF;
+       END""",
+    "DROP TRIGGER IF EXISTS trg_claims_summary_del",
+    """CREATE TRIGGER trg_claims_summary_del
+       AFTER DELETE ON claims
+       FOR EACH ROW
+       UPDATE claim_status_counts SET claim_count = claim_count - 1
+       WHERE status = COALESCE(OLD.status, '')""",
+    "DROP FUNCTION IF EXISTS count_items_by_user",
+    """CREATE FUNCTION count_items_by_user(p_user_id INT)
+       RETURNS INT
+       DETERMINISTIC
+       BEGIN
+         DECLARE total INT;
+         SELECT COALESCE((SELECT item_count FROM user_item_counts WHERE user_id = p_user_id), 0)
+         INTO total;
+         RETURN total;
+       END""",
+    # Fill the new tables from what is already there
+    functools.partial(summaries.rebuild, archived=False),
+]
+
+# ---------------------- MIGRATION 3: item_events ----------------------
+ADDED_STAMP = re.compile(r"\s*\[Added on: (\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\]")
+APPROVED_STAMP = re.compile(r"\s*\[Claim approved on (\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\]")
+
+def extract_description_stamps(cur, batch_size=1000):
+    # Move the stamps the old triggers appended to items.description into
+    # item_events, one keyset batch (and one short transaction) at a time.
+    last_id = 0
+    while True:
+        cur.execute("""SELECT item_id, description, reported_by FROM items
+                       WHERE item_id > %s AND (description LIKE %s OR description LIKE %s)
+                       ORDER BY item_id LIMIT %s""",
+                    (last_id, "%[Added on: %", "%[Claim approved on %", batch_size))
+        rows = cur.fetchall()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        approved = {}
+        ids = [r[0] for r in rows]
+        cur.execute(f"""SELECT item_id, claim_id, claimer_id FROM claims
+                        WHERE status = 'approved' AND item_id IN ({','.join(['%s'] * len(ids))})
+                        ORDER BY claim_id""", ids)
+        for item_id, claim_id, claimer_id in cur.fetchall():
+            approved[item_id] = (claim_id, claimer_id)
+        events, updates = [], []
+        for item_id, desc, reported_by in rows:
+            for stamp in ADDED_STAMP.findall(desc):
+                events.append((item_id, "added", stamp, reported_by, None))
+            claim_id, claimer_id = approved.get(item_id, (None, None))
+            for stamp in APPROVED_STAMP.findall(desc):
+                events.append((item_id, "claim_approved", stamp, claimer_id, claim_id))
+            updates.append((APPROVED_STAMP.sub("", ADDED_STAMP.sub("", desc)), item_id))
+        cur.execute("START TRANSACTION")
+        cur.executemany("""INSERT INTO item_events(item_id, event_type, event_time, actor_id, claim_id)
+                           VALUES(%s,%s,%s,%s,%s)""", events)
+        cur.executemany("UPDATE items SET description=%s WHERE item_id=%s", updates)
+        cur.execute("COMMIT")
+
+EVENT_STEPS = [
+    """CREATE TABLE IF NOT EXISTS item_events (
+         event_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+         item_id INT NOT NULL,
+         event_type ENUM('added','claim_approved') NOT NULL,
+         event_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+         actor_id INT,
+         claim_id INT,
+         INDEX idx_item_events_item (item_id, event_time)
+       )""",
+    # Swap the triggers first so no new stamps appear behind the extraction
+    "DROP TRIGGER IF EXISTS trg_item_insert",
+    """CREATE TRIGGER trg_item_insert
+       AFTER INSERT ON items
+       FOR EACH ROW
+       INSERT INTO item_events(item_id, event_type, actor_id)
+       VALUES (NEW.item_id, 'added', NEW.reported_by)""",
+    "DROP TRIGGER IF EXISTS trg_claim_approve",
+    """CREATE TRIGGER trg_claim_approve
+       AFTER UPDATE ON claims
+       FOR EACH ROW
+       BEGIN
+         IF NEW.status = 'approved' AND NOT (OLD.status <=> 'approved') THEN
+           UPDATE items SET status = 'claimed' WHERE item_id = NEW.item_id;
+           INSERT INTO item_events(item_id, event_type, actor_id, claim_id)
+           VALUES (NEW.item_id, 'claim_approved', NEW.claimer_id, NEW.claim_id);
+         END IF;
+       END""",
+    extract_description_stamps,
+]
+
+# ---------------------- MIGRATION 5: batch claim decisions ----------------------
+# One CALL approves / rejects a list of claims in a single transaction;
+# approving also rejects the other pending claims on the same items.
+# p_claim_ids is a JSON array of claim ids; returns one row: decided,
+# auto_rejected, skipped (ids that were not pending). The transaction is
+# the caller's (db.call_proc, as for update_claim_status); on an error the
+# handler rolls it back and re-raises.
+BATCH_CLAIM_STEPS = [
+    "DROP PROCEDURE IF EXISTS batch_claim_status",
+    """CREATE PROCEDURE batch_claim_status(
+  IN p_claim_ids JSON,
+  IN p_status ENUM('approved','rejected'),
+  IN p_remark VARCHAR(255)
+)
+BEGIN
+  DECLARE v_selected INT DEFAULT 0;
+  DECLARE v_decided INT DEFAULT 0;
+  DECLARE v_competing INT DEFAULT 0;
+  DECLARE EXIT HANDLER FOR SQLEXCEPTION
+  BEGIN
+    ROLLBACK;
+    RESIGNAL;
+  END;
+
+  DROP TEMPORARY TABLE IF EXISTS tmp_batch_claims, tmp_batch_winners;
+  CREATE TEMPORARY TABLE tmp_batch_claims (
+    claim_id INT PRIMARY KEY,
+    item_id INT,
+    item_claimed BOOL NOT NULL,
+    INDEX (item_id)
+  );
+  CREATE TEMPORARY TABLE tmp_batch_winners (
+    claim_id INT PRIMARY KEY,
+    item_id INT UNIQUE
+  );
+
+  -- The listed claims that are still pending
+  INSERT INTO tmp_batch_claims(claim_id, item_id, item_claimed)
+  SELECT c.claim_id, c.item_id, COALESCE(i.status = 'claimed', FALSE)
+  FROM JSON_TABLE(p_claim_ids, '$[*]' COLUMNS (claim_id INT PATH '$')) AS j
+  JOIN claims c ON c.claim_id = j.claim_id
+  LEFT JOIN items i ON i.item_id = c.item_id
+  WHERE c.status = 'pending';
+  SET v_selected = ROW_COUNT();
+
+  IF p_status = 'approved' THEN
+    -- One winner per item (the oldest listed claim), none for claimed items
+    INSERT INTO tmp_batch_winners(claim_id, item_id)
+    SELECT MIN(claim_id), item_id
+    FROM tmp_batch_claims
+    WHERE NOT item_claimed
+    GROUP BY item_id;
+
+    UPDATE claims c
+    JOIN tmp_batch_winners w ON w.claim_id = c.claim_id
+    SET c.status = 'approved', c.remarks = p_remark;
+    SET v_decided = ROW_COUNT();
+
+    -- Every other pending claim on those items loses (listed or not)
+    UPDATE claims c
+    JOIN tmp_batch_winners w ON w.item_id = c.item_id
+    SET c.status = 'rejected', c.remarks = CONCAT('Claim #', w.claim_id, ' was approved for this item')
+    WHERE c.status = 'pending';
+    SET v_competing = ROW_COUNT();
+
+    UPDATE claims c
+    JOIN tmp_batch_claims b ON b.claim_id = c.claim_id
+    SET c.status = 'rejected', c.remarks = 'Item was already claimed'
+    WHERE b.item_claimed AND c.status = 'pending';
+    SET v_competing = v_competing + ROW_COUNT();
+  ELSE
+    UPDATE claims c
+    JOIN tmp_batch_claims b ON b.claim_id = c.claim_id
+    SET c.status = 'rejected', c.remarks = p_remark;
+    SET v_decided = ROW_COUNT();
+  END IF;
+
+  DROP TEMPORARY TABLE IF EXISTS tmp_batch_claims, tmp_batch_winners;
+  SELECT v_decided AS decided, v_competing AS auto_rejected,
+         JSON_LENGTH(p_claim_ids) - v_selected AS skipped;
+END""",
+]
+
+# ---------------------- MIGRATION 6: change tracking ----------------------
+# updated_at + tombstones for the incremental multi-desk sync (changes.py)
+TRACKED_KEYS = {"users": "user_id", "locations": "location_id",
+                "items": "item_id", "claims": "claim_id"}
+
+CHANGE_STEPS = [
+    """CREATE TABLE IF NOT EXISTS tombstones (
+         tombstone_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+         table_name VARCHAR(20) NOT NULL,
+         row_id INT NOT NULL,
+         deleted_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+         INDEX idx_tombstones_deleted (deleted_at)
+       )""",
+]
+for _table, _key in TRACKED_KEYS.items():
+    CHANGE_STEPS += [
+        add_column(_table, "updated_at",
+                   "TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"),
+        add_index(_table, f"idx_{_table}_updated", "updated_at"),
+        f"DROP TRIGGER IF EXISTS trg_{_table}_tombstone",
+        f"""CREATE TRIGGER trg_{_table}_tombstone
+            AFTER DELETE ON {_table}
+            FOR EACH ROW
+            INSERT INTO tombstones(table_name, row_id) VALUES ('{_table}', OLD.{_key})""",
+    ]
+
+# ---------------------- MIGRATION 10: archived counts ----------------------
+# Archiving takes rows out of the live tables (and, through the delete
+# triggers, out of the live counts); archive.py adds them to archived_count
+# instead, so the Query Hub and count_items_by_user() keep counting them
+ARCHIVED_COUNT_STEPS = [
+    add_column("item_category_counts", "archived_count", "INT NOT NULL DEFAULT 0"),
+    add_column("user_item_counts", "archived_count", "INT NOT NULL DEFAULT 0"),
+    add_column("claim_status_counts", "archived_count", "INT NOT NULL DEFAULT 0"),
+    "DROP FUNCTION IF EXISTS count_items_by_user",
+    """CREATE FUNCTION count_items_by_user(p_user_id INT)
+       RETURNS INT
+       DETERMINISTIC
+       BEGIN
+         DECLARE total INT;
+         SELECT COALESCE((SELECT item_count + archived_count FROM user_item_counts
+                          WHERE user_id = p_user_id), 0)
+         INTO total;
+         RETURN total;
+       END""",
+    # Count what earlier runs already archived
+    summaries.rebuild,
+]
+
+# ---------------------- MIGRATIONS ----------------------
+# version -> name, steps (SQL strings or callables taking a cursor),
+# explain (queries whose plans are recorded before/after)
+MIGRATIONS = [
+    {
+        "version": 1,
+        "name": "hot path indexes",
+        "steps": [
+            # Query Hub aggregate: GROUP BY category -> covering index scan,
+            # no temporary table (item_id rides along as the PK)
+            add_index("items", "idx_items_category_status", "category, status"),
+            # Status filters, newest first
+            add_index("items", "idx_items_status_date", "status, report_date"),
+            add_index("claims", "idx_claims_status_date", "status, claim_date"),
+            # refresh_dropdowns: ORDER BY name / location_name from the index
+            add_index("users", "idx_users_name", "name"),
+            add_index("locations", "idx_locations_name", "location_name"),
+        ],
+        "explain": [
+            SCAN_AGGREGATE_SQL,
+            SCAN_NESTED_SQL,
+            JOIN_SQL,
+            "SELECT item_id, item_name FROM items WHERE status = 'lost' ORDER BY report_date DESC",
+            "SELECT claim_id, item_id FROM claims WHERE status = 'pending'",
+            "SELECT user_id, name FROM users ORDER BY name",
+            "SELECT location_id, location_name FROM locations ORDER BY location_name",
+            TABLE_SQL["items"],
+        ],
+    },
+    {
+        "version": 2,
+        "name": "trigger-maintained summary tables",
+        "steps": SUMMARY_STEPS,
+        # (before, after): the Query Hub switches from scans to summaries
+        "explain": [
+            (SCAN_AGGREGATE_SQL, SUMMARY_AGGREGATE_SQL),
+            (SCAN_NESTED_SQL, SUMMARY_NESTED_SQL),
+            (SCAN_COUNT_SQL, "SELECT item_count FROM user_item_counts WHERE user_id = 1"),
+            (SCAN_CLAIM_STATUS_SQL, SUMMARY_CLAIM_STATUS_SQL),
+        ],
+    },
+    {
+        "version": 3,
+        "name": "item_events audit table",
+        "steps": EVENT_STEPS,
+        "explain": [
+            ("SELECT item_id, description FROM items WHERE description LIKE '%[Added on: %'",
+             ITEM_HISTORY_SQL.replace("%s", "1")),
+        ],
+    },
+    {
+        "version": 4,
+        "name": "items full-text index",
+        "steps": [
+            # search.py: MATCH(item_name, description, category) AGAINST (...)
+            add_index("items", "ft_items_text", "item_name, description, category", kind="FULLTEXT INDEX"),
+        ],
+        "explain": [
+            ("""SELECT item_id FROM items
+                WHERE item_name LIKE '%wallet%' OR category LIKE '%wallet%' OR description LIKE '%wallet%'""",
+             """SELECT item_id FROM items
+                WHERE MATCH(item_name, description, category) AGAINST ('+wallet*' IN BOOLEAN MODE)"""),
+        ],
+    },
+    {
+        "version": 5,
+        "name": "batch claim decisions",
+        "steps": BATCH_CLAIM_STEPS,
+        # Competing claims are found through the claims.item_id (FK) index
+        "explain": [
+            "SELECT claim_id FROM claims WHERE item_id = 1 AND status = 'pending'",
+        ],
+    },
+    {
+        "version": 6,
+        "name": "change tracking",
+        "steps": CHANGE_STEPS,
+        # Steady-state sync poll: a full scan per table -> an updated_at range
+        "explain": [
+            ("SELECT item_id FROM items ORDER BY item_id",
+             "SELECT item_id FROM items WHERE updated_at >= NOW(6) - INTERVAL 10 SECOND"),
+            ("SELECT claim_id FROM claims ORDER BY claim_id",
+             "SELECT claim_id FROM claims WHERE updated_at >= NOW(6) - INTERVAL 10 SECOND"),
+            ("SELECT 1", "SELECT table_name, row_id FROM tombstones WHERE deleted_at >= NOW(6) - INTERVAL 10 SECOND"),
+        ],
+    },
+    {
+        "version": 7,
+        "name": "sort indexes",
+        # Header sorting (queries.SORTABLE) keysets on (column, primary key):
+        # a secondary index is exactly that order, so a page is a range read
+        "steps": [
+            add_index("items", "idx_items_name", "item_name"),
+            add_index("items", "idx_items_report_date", "report_date"),
+            add_index("locations", "idx_locations_building", "building"),
+            add_index("claims", "idx_claims_date", "claim_date"),
+        ],
+        "explain": [
+            """SELECT item_id, item_name FROM items
+               WHERE item_name > 'M' OR (item_name = 'M' AND item_id > 0)
+               ORDER BY item_name, item_id LIMIT 200""",
+            "SELECT item_id, report_date FROM items ORDER BY report_date DESC, item_id DESC LIMIT 200",
+            "SELECT claim_id, claim_date FROM claims ORDER BY claim_date, claim_id LIMIT 200",
+            "SELECT location_id, building FROM locations WHERE building LIKE 'Sci%' ORDER BY location_id",
+        ],
+    },
+    {
+        "version": 8,
+        "name": "archive tables",
+        # items_archive / claims_archive, partitioned by year (archive.py)
+        "steps": archive.archive_ddl(),
+        "explain": [
+            archive.CLAIM_CANDIDATES_SQL.replace("%s", "'2025-01-01'", 1).replace("%s", "500"),
+            archive.ITEM_CANDIDATES_SQL.replace("%s", "'2025-01-01'", 2).replace("%s", "500"),
+        ],
+    },
+    {
+        "version": 9,
+        "name": "batch claim decisions in the caller transaction",
+        # Migration 5's procedure opened and committed its own transaction
+        # inside the one db.call_proc already holds
+        "steps": BATCH_CLAIM_STEPS,
+    },
+    {
+        "version": 10,
+        "name": "archived rows in the summary tables",
+        "steps": ARCHIVED_COUNT_STEPS,
+        # Same summary reads, now adding archived_count
+        "explain": [
+            (SUMMARY_AGGREGATE_SQL, AGGREGATE_SQL),
+            (SUMMARY_NESTED_SQL, NESTED_SQL),
+            (SUMMARY_CLAIM_STATUS_SQL, QUERY_HUB["claim_status"][0]),
+        ],
+    },
+]
+
+# ---------------------- RUNNER ----------------------
+def ensure_table(cur):
+    cur.execute("""CREATE TABLE IF NOT EXISTS schema_migrations (
+                     version INT PRIMARY KEY,
+                     name VARCHAR(100) NOT NULL,
+                     applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                     explain_before LONGTEXT,
+                     explain_after LONGTEXT
+                   )""")
+
+def applied_versions(cur):
+    ensure_table(cur)
+    cur.execute("SELECT version FROM schema_migrations")
+    return {r[0] for r in cur.fetchall()}
+
+def explain(cur, sql):
+    cur.execute("EXPLAIN " + sql)
+    cols = cur.column_names
+    return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+def explain_all(cur, queries, when):
+    # Entries are a query, or a (before, after) pair when the migration
+    # replaces the query itself
+    plans = []
+    for q in queries:
+        if isinstance(q, tuple):
+            q = q[0] if when == "before" else q[1]
+        plans.append({"sql": " ".join(q.split()), "plan": explain(cur, q)})
+    return plans
+
+def plan_line(plan):
+    # One line per query: table:type(key) for every table the plan touches
+    return ", ".join(f"{p.get('table')}:{p.get('type')}({p.get('key') or '-'})" for p in plan)
+
+def compare_plans(before, after):
+    lines = []
+    for b, a in zip(before, after):
+        lines.append(b["sql"][:90])
+        if a["sql"] != b["sql"]:
+            lines.append(" -> " + a["sql"][:90])
+        lines.append("   before: " + plan_line(b["plan"]))
+        lines.append("   after:  " + plan_line(a["plan"]))
+    return "\n".join(lines)
+
+def run_step(cur, step):
+    if callable(step):
+        step(cur)
+    else:
+        cur.execute(step)
+    # Steps may SELECT (helpers, procedures); never leave results unread
+    if cur.with_rows:
+        cur.fetchall()
+
+def upgrade(to=None, log=print):
+    """Apply pending migrations in order; returns the versions applied."""
+    done = []
+    with get_conn() as con:
+        cur = con.cursor()
+        try:
+            have = applied_versions(cur)
+            for m in MIGRATIONS:
+                if m["version"] in have or (to is not None and m["version"] > to):
+                    continue
+                log(f"Applying {m['version']:03d} {m['name']} ...")
+                before = explain_all(cur, m.get("explain", ()), "before")
+                for step in m["steps"]:
+                    run_step(cur, step)
+                after = explain_all(cur, m.get("explain", ()), "after")
+                cur.execute("""INSERT INTO schema_migrations(version, name, explain_before, explain_after)
+                               VALUES(%s,%s,%s,%s)""",
+                            (m["version"], m["name"], json.dumps(before, default=str),
+                             json.dumps(after, default=str)))
+                con.commit()
+                if before:
+                    log(compare_plans(before, after))
+                done.append(m["version"])
+        finally:
+            cur.close()
+    return done
+
+def status(log=print):
+    with get_conn() as con:
+        cur = con.cursor()
+        try:
+            have = applied_versions(cur)
+        finally:
+            cur.close()
+    for m in MIGRATIONS:
+        mark = "applied" if m["version"] in have else "pending"
+        log(f"{m['version']:03d}  {mark:8}  {m['name']}")
+
+def show_plans(version, log=print):
+    with get_conn() as con:
+        cur = con.cursor()
+        try:
+            ensure_table(cur)
+            cur.execute("SELECT explain_before, explain_after FROM schema_migrations WHERE version=%s",
+                        (version,))
+            row = cur.fetchone()
+        finally:
+            cur.close()
+    if row is None:
+        return log(f"Migration {version} has not been applied.")
+    if not row[0]:
+        return log(f"Migration {version} came with the schema (main.sql); no plans recorded.")
+    log(compare_plans(json.loads(row[0]), json.loads(row[1])))
+
+# ---------------------- main.sql ----------------------
+MAIN_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.sql")
+SCHEMA_BEGIN = "-- BEGIN GENERATED by `python migrations.py schema --write`: edit migrations.py, not this block"
+SCHEMA_END = "-- END GENERATED"
+
+_CREATE = re.compile(r"CREATE\s+(?:TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?|TRIGGER\s+|FUNCTION\s+|PROCEDURE\s+)(\w+)", re.I)
+
+def _ddl(step):
+    # A step as it reads in main.sql: continuation lines dedented
+    first, _, rest = step.strip().partition("\n")
+    return (first + "\n" + textwrap.dedent(rest)).rstrip() if rest else first
+
+def _quote(text):
+    return "'" + text.replace("'", "''") + "'"
+
+def schema_sql():
+    """main.sql's generated block: the schema_migrations rows, then every
+    table / trigger / routine a migration creates, in migration order. An
+    object created again by a later migration appears once, as redefined;
+    columns added to those tables (add_column) follow as ALTER TABLE."""
+    created = {}    # object name -> (version, DDL)
+    for m in MIGRATIONS:
+        for step in m["steps"]:
+            if not isinstance(step, str):
+                if getattr(step, "table", None) in created:
+                    created[step.sql] = (m["version"], step.sql)
+                continue
+            match = _CREATE.match(step.strip())
+            if match:
+                created.pop(match.group(1), None)
+                created[match.group(1)] = (m["version"], _ddl(step))
+    names = {m["version"]: m["name"] for m in MIGRATIONS}
+    lines = [SCHEMA_BEGIN, "DELIMITER //", "",
+             "INSERT INTO schema_migrations (version, name) VALUES",
+             ",\n".join(f"({v}, {_quote(name)})" for v, name in names.items()) + " //"]
+    version = None
+    for v, ddl in created.values():
+        if v != version:
+            version = v
+            lines += ["", f"-- Migration {v}: {names[v]}"]
+        lines += [ddl + " //", ""]
+    return "\n".join(lines + ["DELIMITER ;", SCHEMA_END])
+
+def schema_block(path=MAIN_SQL):
+    """The generated block as it currently is in `path`."""
+    with open(path) as f:
+        text = f.read()
+    return text[text.index(SCHEMA_BEGIN):text.index(SCHEMA_END) + len(SCHEMA_END)]
+
+def write_schema(path=MAIN_SQL):
+    """Regenerate the block in `path`; returns True when it changed."""
+    old = schema_block(path)
+    new = schema_sql()
+    if old == new:
+        return False
+    with open(path) as f:
+        text = f.read()
+    with open(path, "w") as f:
+        f.write(text.replace(old, new, 1))
+    return True
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Upgrade the lostfound schema in place.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("status")
+    up = sub.add_parser("upgrade")
+    up.add_argument("--to", type=int)
+    pl = sub.add_parser("plans")
+    pl.add_argument("version", type=int)
+    sc = sub.add_parser("schema")
+    mode = sc.add_mutually_exclusive_group()
+    mode.add_argument("--write", action="store_true", help="update main.sql in place")
+    mode.add_argument("--check", action="store_true", help="exit 1 if main.sql is out of date")
+    args = ap.parse_args(argv)
+    if args.cmd == "status":
+        status()
+    elif args.cmd == "upgrade":
+        applied = upgrade(args.to)
+        print(f"Applied {len(applied)} migration(s).")
+    elif args.cmd == "plans":
+        show_plans(args.version)
+    elif args.write:
+        print("main.sql updated." if write_schema() else "main.sql is up to date.")
+    elif args.check:
+        if schema_block() != schema_sql():
+            sys.exit("main.sql is out of date: run python migrations.py schema --write")
+    else:
+        print(schema_sql())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Lost & Found DBMS Project - In-memory entity model
+# ------------------------------------------------
+# Rows shown in the Treeviews are also kept here as compact named-tuple
+# records, indexed by primary key (and by display label), so selection
+# handlers and form population are dict lookups instead of re-reading
+# values back out of Tk (which also turns "0123" into 123 and None into "").
+#
+# The Treeview iid of a row is str(primary key) (see paging.reconcile_tree),
+# so from_iid() maps a selection straight to its record.
+
+from collections import namedtuple
+
+from queries import LIST_COLUMNS
+
+# Records hold the listed columns (no items.description; see queries.py)
+RECORD_TYPES = {
+    "users": namedtuple("User", LIST_COLUMNS["users"]),
+    "locations": namedtuple("Location", LIST_COLUMNS["locations"]),
+    "items": namedtuple("Item", LIST_COLUMNS["items"]),
+    "claims": namedtuple("Claim", LIST_COLUMNS["claims"]),
+}
+
+# Column shown after the id in "id - name" labels
+LABEL_FIELDS = {"users": "name", "locations": "location_name", "items": "item_name"}
+
+def make_label(row_id, name):
+    return f"{row_id} - {name}"
+
+class EntityIndex:
+    def __init__(self, table):
+        self.table = table
+        self.record_type = RECORD_TYPES[table]
+        self.label_field = LABEL_FIELDS.get(table)
+        self.by_id = {}           # primary key -> record
+        self.by_label = {}        # "id - name" -> primary key
+
+    def _add(self, row):
+        rec = self.record_type._make(row)
+        old = self.by_id.get(rec[0])
+        if old is not None and self.label_field:
+            self.by_label.pop(self.label(old), None)
+        self.by_id[rec[0]] = rec
+        if self.label_field:
+            self.by_label[self.label(rec)] = rec[0]
+        return rec
+
+    def replace(self, rows):
+        """Index exactly `rows` (a full refresh)."""
+        self.by_id = {}
+        self.by_label = {}
+        for r in rows:
+            self._add(r)
+
+    def update(self, rows):
+        """Insert or overwrite `rows`, keeping the others."""
+        for r in rows:
+            self._add(r)
+
+    def discard(self, keys):
+        for key in keys:
+            rec = self.by_id.pop(key, None)
+            if rec is not None and self.label_field:
+                self.by_label.pop(self.label(rec), None)
+
+    def label(self, rec):
+        return make_label(rec[0], getattr(rec, self.label_field))
+
+    def get(self, key):
+        return self.by_id.get(key)
+
+    def from_iid(self, iid):
+        try:
+            return self.by_id.get(int(iid))
+        except ValueError:
+            return None
+
+    def id_for(self, label):
+        return self.by_label.get(label)
+
+    def __len__(self):
+        return len(self.by_id)
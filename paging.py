@@ -0,0 +1,496 @@
+# Lost & Found DBMS Project - Keyset-paginated Treeview
+# ------------------------------------------------
+# Tables are never loaded whole. PagedTable keeps a bounded window of
+# rows in the Treeview and fetches neighbouring pages with keyset
+# pagination on the primary key:
+#   next:   WHERE key > last_key  ORDER BY key      LIMIT n
+#   prev:   WHERE key < first_key ORDER BY key DESC LIMIT n
+# so every page costs one index range scan, however deep the user has
+# scrolled. Scrolling near either edge loads the next page and trims
+# rows from the far side once the window exceeds max_pages pages.
+#
+# Sorting by another column keysets on (column, key) instead, and is only
+# offered for columns with an index (queries.SORTABLE), so a page is still
+# a range read in index order rather than a filesort of the table.
+# Per-column filters (compile_filter) are ANDed into every page query as
+# parameterized predicates; text filters match a prefix (LIKE 'abc%'),
+# which an index on the column can serve.
+#
+# A view over several tables with the same columns (set_sources(), e.g.
+# items + items_archive) runs the page query on each table with its own
+# LIMIT and merges the results server-side:
+#   SELECT * FROM (SELECT .. FROM a WHERE .. ORDER BY .. LIMIT n) AS s0 UNION ALL .. ORDER BY .. LIMIT n
+# so each table is still read by index and only k*n rows are sorted.
+# Each branch also returns its source index, so source_of(key) can tell
+# which table a listed row came from (e.g. archived rows are read-only).
+#
+# The row count in the status line comes from a summary table when the
+# view is unfiltered (`totals`, e.g. queries.TOTAL_SQL); COUNT(*) only
+# runs when a filter narrows the rows.
+#
+# DB work is handed to `submit(fn, on_done, on_error)` (the background
+# executor); all widget updates happen in the callbacks on the Tk thread.
+# An optional model.EntityIndex is kept in step with the window, so
+# selection handlers can look rows up by key.
+
+from datetime import date
+
+from db import run_query
+
+# ---------------------- FILTERS ----------------------
+_OPS = ("<=", ">=", "!=", "<", ">", "=")
+
+def escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def compile_filter(column, kind, text):
+    """One filter box -> (sql, params), or None when it is empty.
+
+    int / date: "5", ">= 5", "!= 5" or a range "3..9"; enum: the exact
+    value; text: a prefix ("wal" -> LIKE 'wal%'), or "*wal" to match
+    anywhere (no index can help with that one). Raises ValueError.
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+    if kind == "enum":
+        return f"{column} = %s", [text]
+    if kind not in ("int", "date"):
+        if text.startswith("*"):
+            return f"{column} LIKE %s", ["%" + escape_like(text[1:]) + "%"]
+        return f"{column} LIKE %s", [escape_like(text) + "%"]
+    parse = int if kind == "int" else date.fromisoformat
+    try:
+        if ".." in text:
+            lo, hi = text.split("..", 1)
+            return f"{column} BETWEEN %s AND %s", [parse(lo.strip()), parse(hi.strip())]
+        for op in _OPS:
+            if text.startswith(op):
+                return f"{column} {op} %s", [parse(text[len(op):].strip())]
+        return f"{column} = %s", [parse(text)]
+    except ValueError:
+        raise ValueError(f"{column}: not a valid {kind} filter: {text!r}") from None
+
+# ---------------------- KEYED RECONCILIATION ----------------------
+def reconcile_tree(tree, rows, shadow, key_index=0):
+    """Make `tree` show `rows` in order, touching only rows that changed.
+
+    Rows are identified by the primary key at `key_index` (used as the
+    Treeview iid). `shadow` maps iid -> row as currently displayed and is
+    updated in place. Selection and scroll position survive because
+    unchanged rows are never deleted. Returns the widget-operation counts.
+    """
+    ops = {"inserted": 0, "updated": 0, "deleted": 0, "moved": 0}
+    wanted = {str(r[key_index]) for r in rows}
+    gone = [iid for iid in tree.get_children() if iid not in wanted]
+    if gone:
+        tree.delete(*gone)
+        for iid in gone:
+            shadow.pop(iid, None)
+        ops["deleted"] = len(gone)
+
+    current = tree.get_children()
+    moved = set()
+    j = 0
+    for i, r in enumerate(rows):
+        iid = str(r[key_index])
+        while j < len(current) and current[j] in moved:
+            j += 1
+        if iid not in shadow:
+            tree.insert("", i, iid=iid, values=r)
+            ops["inserted"] += 1
+        else:
+            if j < len(current) and current[j] == iid:
+                j += 1
+            else:
+                tree.move(iid, "", i)
+                moved.add(iid)
+                ops["moved"] += 1
+            if shadow[iid] != r:
+                tree.item(iid, values=r)
+                ops["updated"] += 1
+        shadow[iid] = r
+    ops["ops"] = sum(ops.values())
+    return ops
+
+def format_ops(ops):
+    return (f"+{ops['inserted']} ~{ops['updated']} -{ops['deleted']} "
+            f"moved {ops['moved']} ({ops['ops']} widget ops)")
+
+class PagedTable:
+    def __init__(self, tree, table, columns, key, submit, page_size=200,
+                 max_pages=3, on_status=None, on_error=None, scrollbar=None, model=None,
+                 sortable=None, kinds=None, totals=None):
+        self.tree = tree
+        self.table = table
+        self.columns = columns
+        self.key = key
+        self.submit = submit
+        self.page_size = page_size
+        self.max_rows = page_size * max_pages
+        self.on_status = on_status
+        self.on_error = on_error
+        self.scrollbar = scrollbar
+        self.model = model
+        self.sortable = tuple(sortable or (key,))   # indexed columns
+        self.kinds = kinds or {}    # column -> "int" / "date" / "enum" (else text)
+        self.totals = totals or {}  # table -> SQL reading its unfiltered row count
+        self.sort = key             # ORDER BY sort[, key]
+        self.descending = False
+        self.filters = {}           # column -> compiled (sql, params)
+        self.rows = []              # materialized window, in display order
+        self.last_ops = None        # widget ops of the last reload
+        self.total = None
+        self.at_start = True
+        self.at_end = True
+        self.loading = False
+        self.paused = False         # showing rows from show_rows(), not pages
+        self._epoch = 0             # bumped when the window's source changes
+        self.sources = [table]      # tables the rows are read from
+        self.row_source = {}        # key -> source table, when sources > 1
+        self._columns = ", ".join(columns)
+        tree.configure(yscrollcommand=self.on_yscroll)
+
+    # ---------------------- SQL (worker thread) ----------------------
+    def _position(self, row, later, inclusive=False):
+        # Rows after (later) / before `row` in ascending (sort, key) order,
+        # NULLs first as MySQL sorts them
+        s, k, kv = self.sort, self.key, row[0]
+        op = (">" if later else "<") + ("=" if inclusive else "")
+        if s == k:
+            return f"{k} {op} %s", [kv]
+        sv = row[self.columns.index(s)]
+        if sv is None:
+            if later:
+                return f"(({s} IS NULL AND {k} {op} %s) OR {s} IS NOT NULL)", [kv]
+            return f"{s} IS NULL AND {k} {op} %s", [kv]
+        if later:
+            return f"({s} > %s OR ({s} = %s AND {k} {op} %s))", [sv, sv, kv]
+        return f"({s} < %s OR ({s} = %s AND {k} {op} %s) OR {s} IS NULL)", [sv, sv, kv]
+
+    def _past(self, row, inclusive=False):
+        # Rows below `row` in display order
+        return self._position(row, not self.descending, inclusive)
+
+    def _ahead(self, row):
+        # Rows above `row` in display order
+        return self._position(row, self.descending)
+
+    def _where(self, extra=None):
+        clauses = [sql for sql, _ in self.filters.values()]
+        params = [p for _, ps in self.filters.values() for p in ps]
+        if extra is not None:
+            clauses.append(extra[0])
+            params.extend(extra[1])
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _page(self, n, extra=None, reverse=False):
+        where, params = self._where(extra)
+        desc = " DESC" if self.descending != reverse else ""
+        order = [self.key] if self.sort == self.key else [self.sort, self.key]
+        order_by = f"ORDER BY {', '.join(c + desc for c in order)} LIMIT %s"
+        if len(self.sources) == 1:
+            sql = f"SELECT {self._columns} FROM {self.sources[0]}{where} {order_by}"
+            params = [*params, n]
+        else:
+            # Each branch a derived table: valid SQL on every backend
+            sql = " UNION ALL ".join(f"SELECT * FROM (SELECT {self._columns}, {i} AS source_index "
+                                     f"FROM {t}{where} {order_by}) AS s{i}"
+                                     for i, t in enumerate(self.sources)) + " " + order_by
+            params = [*params, n] * len(self.sources) + [n]
+        rows = run_query(sql, params)
+        if len(self.sources) > 1:
+            for r in rows:
+                self.row_source[r[0]] = self.sources[r[-1]]
+            rows = [r[:-1] for r in rows]
+        if reverse:
+            rows.reverse()
+        return rows
+
+    def fetch_first(self, n):
+        return self._page(n)
+
+    def fetch_last(self, n):
+        return self._page(n, reverse=True)
+
+    def fetch_after(self, row, n):
+        return self._page(n, self._past(row))
+
+    def fetch_before(self, row, n):
+        return self._page(n, self._ahead(row), reverse=True)
+
+    def fetch_from(self, row, n):
+        return self._page(n, self._past(row, inclusive=True))
+
+    def fetch_count(self):
+        where, params = self._where()
+        return sum(int(run_query(self.totals[t])[0][0]) if not where and t in self.totals
+                   else run_query(f"SELECT COUNT(*) FROM {t}{where}", params)[0][0]
+                   for t in self.sources)
+
+    # ---------------------- sorting / filtering (Tk thread) ----------------------
+    def sort_by(self, column):
+        """Order by `column` (again: flip the direction) and go to the top."""
+        if column not in self.sortable:
+            raise ValueError(f"{column} has no index to sort on "
+                             f"(sortable: {', '.join(self.sortable)})")
+        self.descending = column == self.sort and not self.descending
+        self.sort = column
+        self._restart()
+
+    def set_filters(self, texts):
+        """Filter on {column: text} (see compile_filter); raises ValueError."""
+        filters = {}
+        for column, text in texts.items():
+            clause = compile_filter(column, self.kinds.get(column, "text"), text)
+            if clause is not None:
+                filters[column] = clause
+        if filters != self.filters:
+            self.filters = filters
+            self._restart()
+
+    def set_sources(self, tables):
+        """Read rows from `tables` (same columns) instead of just self.table."""
+        tables = list(tables)
+        if tables != self.sources:
+            self.sources = tables
+            self.row_source = {}
+            self._restart()
+
+    def source_of(self, key):
+        """The table the listed row `key` was read from."""
+        if len(self.sources) == 1:
+            return self.sources[0]
+        return self.row_source.get(key, self.table)
+
+    def _restart(self):
+        # New order / filters: in-flight pages belong to the old view
+        self._epoch += 1
+        self.loading = False
+        self.first()
+
+    def in_key_order(self):
+        return not (self.paused or self.filters or self.descending or self.sort != self.key)
+
+    # ---------------------- navigation (Tk thread) ----------------------
+    def reload(self):
+        # Re-read the current window in place (keeps the user's position)
+        if not self.rows:
+            return self.first()
+        start = self.rows[0]
+        n = max(len(self.rows), self.page_size)
+        if self.at_end:
+            n += self.page_size     # let rows added at the end show up
+        at_start = self.at_start
+        def load():
+            return self.fetch_from(start, n), self.fetch_count()
+        def done(result):
+            rows, total = result
+            self.total = total
+            self._replace(rows, at_start=at_start, at_end=len(rows) < n)
+            self._trim_top()
+        self._load(load, done)
+
+    def first(self):
+        self.paused = False
+        n = self.page_size
+        def load():
+            return self.fetch_first(n), self.fetch_count()
+        def done(result):
+            rows, self.total = result
+            self._replace(rows, at_start=True, at_end=len(rows) < n)
+        self._load(load, done)
+
+    def last(self):
+        self.paused = False
+        n = self.page_size
+        def load():
+            return self.fetch_last(n), self.fetch_count()
+        def done(result):
+            rows, self.total = result
+            self._replace(rows, at_start=len(rows) < n, at_end=True)
+            if rows:
+                self.tree.see(self.tree.get_children()[-1])
+        self._load(load, done)
+
+    def next_page(self):
+        # Jump: the window becomes the page after the current one
+        if self.at_end or not self.rows:
+            return
+        after, n = self.rows[-1], self.page_size
+        def done(rows):
+            if rows:
+                self._replace(rows, at_start=False, at_end=len(rows) < n)
+            else:
+                self.at_end = True
+                self._status()
+        self._load(lambda: self.fetch_after(after, n), done)
+
+    def prev_page(self):
+        if self.at_start or not self.rows:
+            return
+        before, n = self.rows[0], self.page_size
+        def done(rows):
+            if rows:
+                self._replace(rows, at_start=len(rows) < n, at_end=False)
+            else:
+                self.at_start = True
+                self._status()
+        self._load(lambda: self.fetch_before(before, n), done)
+
+    def on_yscroll(self, first, last):
+        # Treeview yscrollcommand: extend the window when the view nears an edge
+        if self.scrollbar is not None:
+            self.scrollbar.set(first, last)
+        if self.loading or self.paused or not self.rows:
+            return
+        if float(last) >= 0.98 and not self.at_end:
+            self._extend_down()
+        elif float(first) <= 0.02 and not self.at_start:
+            self._extend_up()
+
+    # ---------------------- external result sets ----------------------
+    def show_rows(self, rows, status=None):
+        # Show rows fetched elsewhere (e.g. a search) and stop paging
+        self.paused = True
+        self._epoch += 1
+        self.loading = False
+        self._replace(rows, at_start=True, at_end=True)
+        if status is not None and self.on_status is not None:
+            self.on_status(status)
+
+    def resume(self):
+        # Back to keyset pages after show_rows()
+        if self.paused:
+            self._epoch += 1
+            self.loading = False
+            self.first()
+
+    def apply_changes(self, changed, deleted):
+        """Fold rows changed / deleted elsewhere (changes.SyncPoller) into the window.
+
+        Changed rows inside the window's key range are updated, new keys
+        past an open end are appended, deleted keys are dropped. Search
+        results (paused) and sorted / filtered views only get their
+        existing rows updated or dropped; the next reload re-places them.
+        """
+        if not self.rows:
+            return
+        keyed = self.in_key_order()
+        rows = {r[0]: r for r in self.rows}
+        lo, hi = self.rows[0][0], self.rows[-1][0]
+        gone = [k for k in deleted if k in rows]
+        for k in gone:
+            del rows[k]
+        added = 0
+        for r in changed:
+            k = r[0]
+            if k in rows:
+                rows[k] = tuple(r)
+            elif keyed and (lo <= k <= hi or (self.at_end and k > hi)
+                                      or (self.at_start and k < lo)):
+                rows[k] = tuple(r)
+                added += 1
+        if keyed:
+            merged = [rows[k] for k in sorted(rows)]
+        else:
+            merged = [rows[r[0]] for r in self.rows if r[0] in rows]
+        if merged == self.rows and not gone:
+            return
+        if self.total is not None:
+            self.total += added - len(gone)
+        self._replace(merged, at_start=self.at_start, at_end=self.at_end)
+        if keyed:
+            self._trim_top()
+
+    # ---------------------- window maintenance ----------------------
+    def _load(self, fn, on_done):
+        self.loading = True
+        epoch = self._epoch
+        def done(result):
+            if epoch != self._epoch:
+                return              # superseded by show_rows() / resume()
+            self.loading = False
+            on_done(result)
+        def failed(e):
+            if epoch != self._epoch:
+                return
+            self.loading = False
+            if self.on_error is None:
+                raise e
+            self.on_error(e)
+        self.submit(fn, done, failed)
+
+    def _extend_down(self):
+        after, n = self.rows[-1], self.page_size
+        def done(rows):
+            self.at_end = len(rows) < n
+            for r in rows:
+                self.tree.insert("", "end", iid=str(r[0]), values=r)
+            self.rows.extend(rows)
+            if self.model is not None:
+                self.model.update(rows)
+            self._trim_top()
+            self._status()
+        self._load(lambda: self.fetch_after(after, n), done)
+
+    def _extend_up(self):
+        before, n = self.rows[0], self.page_size
+        def done(rows):
+            self.at_start = len(rows) < n
+            for i, r in enumerate(rows):
+                self.tree.insert("", i, iid=str(r[0]), values=r)
+            self.rows[:0] = rows
+            if self.model is not None:
+                self.model.update(rows)
+            # Rows went in above the view; scroll so the same rows stay visible
+            self.tree.yview_scroll(len(rows), "units")
+            extra = len(self.rows) - self.max_rows
+            if extra > 0:
+                for r in self.rows[-extra:]:
+                    self.tree.delete(str(r[0]))
+                if self.model is not None:
+                    self.model.discard(r[0] for r in self.rows[-extra:])
+                del self.rows[-extra:]
+                self.at_end = False
+            self._status()
+        self._load(lambda: self.fetch_before(before, n), done)
+
+    def _trim_top(self):
+        extra = len(self.rows) - self.max_rows
+        if extra <= 0:
+            return
+        for r in self.rows[:extra]:
+            self.tree.delete(str(r[0]))
+        if self.model is not None:
+            self.model.discard(r[0] for r in self.rows[:extra])
+        del self.rows[:extra]
+        self.at_start = False
+        self.tree.yview_scroll(-extra, "units")
+
+    def _replace(self, rows, at_start, at_end):
+        shadow = {str(r[0]): r for r in self.rows}
+        self.last_ops = reconcile_tree(self.tree, rows, shadow)
+        self.rows = list(rows)
+        if self.model is not None:
+            self.model.replace(rows)
+        self.at_start = at_start
+        self.at_end = at_end
+        self._status()
+
+    def _status(self):
+        if self.on_status is None:
+            return
+        total = "?" if self.total is None else f"{self.total:,}"
+        if self.rows:
+            i = self.columns.index(self.sort)
+            order = " desc" if self.descending else ""
+            text = (f"{self.sort}{order} {self.rows[0][i]} - {self.rows[-1][i]}  "
+                    f"({len(self.rows):,} loaded of {total})")
+            if self.filters:
+                text += f"  filtered on {', '.join(self.filters)}"
+            if self.last_ops is not None:
+                text += "  last refresh: " + format_ops(self.last_ops)
+        else:
+            text = f"No rows ({total} total)"
+        self.on_status(text)
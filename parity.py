@@ -0,0 +1,323 @@
+# Lost & Found DBMS Project - Backend parity check
+# ------------------------------------------------
+# Runs one scripted session through the application's data layer
+# (repository.py, paging, search, sync, archive, summaries) on each storage backend
+# and compares what comes back, step by step, plus the schema (tables and
+# columns, triggers, procedures / functions, idx_* indexes).
+# Each backend is also checked on its own: summary tables consistent with
+# the base tables, count_items_by_user() equal to a COUNT(*).
+#
+# Both sides start from a fresh main.sql / main_sqlite.sql load (the
+# sample data); the session adds, changes and deletes rows.
+#
+# Usage:
+#   python parity.py                  # SQLite only (temp file): session + self-checks
+#   python parity.py --temp-server    # also a throwaway mysqld loaded with main.sql, then diff
+#   python parity.py --mysql          # also the server in db.DB_CONFIG (freshly loaded main.sql!)
+# Exit code 1 on any difference or failed check. test_parity.py runs the
+# same comparison under pytest.
+
+import argparse
+import datetime
+import decimal
+import os
+import sys
+import tempfile
+
+from mysql.connector import Error
+
+import archive
+import db
+import repository
+import sqlite_backend
+from changes import SyncPoller, SYNC_CONFIG
+from db import get_conn, run_query, run_exec
+from paging import PagedTable, compile_filter
+from querycache import result_cache
+from queries import LIST_COLUMNS, SORTABLE, COLUMN_KINDS, QUERY_HUB, TOTAL_SQL
+from search import search_items
+from summaries import check as check_summaries, rebuild as rebuild_summaries
+
+# Present on SQLite only: ON UPDATE CURRENT_TIMESTAMP(6) as triggers
+SQLITE_ONLY_TRIGGERS = {"trg_users_touch", "trg_locations_touch", "trg_items_touch", "trg_claims_touch"}
+
+def norm(value):
+    # Backend-neutral form of a fetched value (timestamps differ by nature)
+    if isinstance(value, (list, tuple)):
+        return [norm(v) for v in value]
+    if isinstance(value, dict):
+        return {k: norm(v) for k, v in value.items()}
+    if isinstance(value, datetime.datetime):
+        return "<timestamp>"
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", "replace")
+    return value
+
+class _Tree:
+    # PagedTable wants a Treeview only for its scroll callback
+    def configure(self, **kw):
+        pass
+
+# ---------------------- SCHEMA ----------------------
+def schema():
+    with get_conn() as con:
+        cur = con.cursor()
+        try:
+            if db.backend_name() == "mysql":
+                cur.execute("""SELECT table_name, column_name FROM information_schema.columns
+                               WHERE table_schema = DATABASE() ORDER BY table_name, ordinal_position""")
+                columns = {}
+                for table, column in cur.fetchall():
+                    columns.setdefault(table, []).append(column)
+                cur.execute("SELECT trigger_name FROM information_schema.triggers WHERE trigger_schema = DATABASE()")
+                triggers = {r[0] for r in cur.fetchall()}
+                cur.execute("SELECT routine_name FROM information_schema.routines WHERE routine_schema = DATABASE()")
+                routines = {r[0] for r in cur.fetchall()}
+                cur.execute("""SELECT DISTINCT index_name FROM information_schema.statistics
+                               WHERE table_schema = DATABASE() AND index_name LIKE 'idx%'""")
+                indexes = {r[0] for r in cur.fetchall()}
+            else:
+                cur.execute("""SELECT name FROM sqlite_master
+                               WHERE type = 'table' AND name NOT LIKE 'sqlite%' ORDER BY name""")
+                columns = {}
+                for (table,) in cur.fetchall():
+                    cur.execute(f"PRAGMA table_info({table})")
+                    columns[table] = [r[1] for r in cur.fetchall()]
+                cur.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+                triggers = {r[0] for r in cur.fetchall()} - SQLITE_ONLY_TRIGGERS
+                routines = set(sqlite_backend.PROCEDURES) | {"count_items_by_user"}
+                cur.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx%'")
+                indexes = {r[0] for r in cur.fetchall()}
+        finally:
+            cur.close()
+    return {"columns": columns, "triggers": sorted(triggers), "routines": sorted(routines),
+            "indexes": sorted(indexes)}
+
+# ---------------------- SESSION ----------------------
+def session():
+    """[(step, result)] of one scripted session; errors are results too."""
+    steps = []
+
+    def step(name, fn):
+        try:
+            result = fn()
+        except Error as e:
+            result = ("error", e.errno)
+        except ValueError as e:
+            result = ("ValueError", str(e))
+        steps.append((name, norm(result)))
+        return result
+
+    step("add user", lambda: repository.create("users", {"name": "Asha Rao", "email": "asha@example.com",
+                                                          "phone": "5550001", "role": "staff"}))
+    step("add user 2", lambda: repository.create("users", {"name": "Dev Kumar", "email": "dev@example.com"}))
+    step("duplicate email", lambda: repository.create("users", {"name": "X", "email": "asha@example.com"}))
+    step("bad role", lambda: repository.create("users", {"name": "Y", "email": "y@example.com", "role": "guest"}))
+    users = {r["email"]: r["user_id"] for r in repository.list_rows("users", limit=500)}
+    asha, dev = users["asha@example.com"], users["dev@example.com"]
+    step("add location", lambda: repository.create("locations", {"location_name": "Gym", "building": "Block D",
+                                                                  "floor_no": 2}))
+    loc = max(r["location_id"] for r in repository.list_rows("locations", limit=500))
+    step("add_item lost", lambda: repository.add_item("Blue Umbrella", "folding, wooden handle", "Umbrella",
+                                                      "lost", asha, loc))
+    step("add_item found", lambda: repository.add_item("Umbrella (blue)", "found near entrance", "Umbrella",
+                                                       "found", dev, loc))
+    step("add_item found 2", lambda: repository.add_item("Steel Bottle", None, "Bottle", "found", dev, 1))
+    step("add_item bad status", lambda: repository.add_item("Hat", None, "Clothing", "claimed", dev, 1))
+    step("item with unknown user", lambda: repository.create("items", {
+        "item_name": "Ghost", "status": "lost", "reported_by": 99999, "location_id": loc}))
+    items = {r["item_name"]: r["item_id"] for r in repository.list_rows("items", limit=500)}
+    umbrella, found_umbrella, bottle = items["Blue Umbrella"], items["Umbrella (blue)"], items["Steel Bottle"]
+    step("update item", lambda: repository.update("items", bottle, {"category": "Daily Use",
+                                                                    "description": "dented"}))
+    step("get item", lambda: repository.get("items", bottle))
+    step("item description", lambda: repository.item_description(bottle))
+
+    for claimer in (asha, 1, 2):
+        step("add claim", lambda: repository.create("claims", {"item_id": found_umbrella, "claimer_id": claimer,
+                                                              "remarks": "mine"}))
+    step("add claim bottle", lambda: repository.create("claims", {"item_id": bottle, "claimer_id": 3}))
+    claims = [r for r in repository.list_rows("claims", limit=500)]
+    umbrella_claims = [c["claim_id"] for c in claims if c["item_id"] == found_umbrella]
+    bottle_claim = [c["claim_id"] for c in claims if c["item_id"] == bottle][0]
+    step("reject one", lambda: repository.update_claim_status(umbrella_claims[2], "rejected", "no proof"))
+    step("bad claim status", lambda: repository.update_claim_status(bottle_claim, "maybe", ""))
+    step("batch approve", lambda: repository.decide_claims(umbrella_claims + [bottle_claim], "approved", "ok"))
+    step("batch approve again", lambda: repository.decide_claims(umbrella_claims, "approved", "ok"))
+    step("batch reject empty", lambda: repository.decide_claims([], "rejected", ""))
+    step("claims after", lambda: [(c["claim_id"], c["status"], c["remarks"])
+                                  for c in repository.list_rows("claims", limit=500)])
+    step("items after", lambda: [(i["item_id"], i["status"], i["category"])
+                                 for i in repository.list_rows("items", limit=500)])
+    step("history", lambda: [r[1:] for r in repository.item_history(found_umbrella)])
+
+    for name in QUERY_HUB:
+        step(f"hub {name}", lambda: sorted(norm(repository.hub_query(name)[1]), key=str))
+    for user_id in (1, 2, 3, asha, dev):
+        step(f"count_items_by_user({user_id})", lambda: repository.count_items_by_user(user_id))
+
+    pager = PagedTable(_Tree(), "items", LIST_COLUMNS["items"], "item_id", submit=None,
+                       sortable=SORTABLE["items"], kinds=COLUMN_KINDS["items"], totals=TOTAL_SQL)
+    step("page first", lambda: pager.fetch_first(3))
+    step("page after", lambda: pager.fetch_after(pager.fetch_first(3)[-1], 3))
+    step("page last", lambda: pager.fetch_last(2))
+    step("total", lambda: pager.fetch_count())
+    # Order / filters / sources set directly: sort_by() etc. also restart the Tk view
+    pager.sort, pager.descending = "item_name", True
+    step("sorted desc", lambda: pager.fetch_first(4))
+    step("sorted desc after", lambda: pager.fetch_after(pager.fetch_first(2)[-1], 3))
+    pager.sort, pager.descending = "item_id", False
+    pager.filters = {"item_name": compile_filter("item_name", "text", "*umbrella"),
+                     "status": compile_filter("status", "enum", "lost")}
+    step("filtered", lambda: pager.fetch_first(10))
+    step("filtered count", lambda: pager.fetch_count())
+    pager.filters = {"item_name": compile_filter("item_name", "text", "50%_")}
+    step("filter literal %", lambda: pager.fetch_first(10))
+    pager.filters = {}
+    pager.sources = ["items", "items_archive"]
+    step("with archive", lambda: pager.fetch_first(5))
+    step("count", lambda: pager.fetch_count())
+
+    step("search", lambda: sorted(r[0] for r in search_items("umbrella")["rows"]))
+    step("search filtered", lambda: sorted(r[0] for r in search_items("umbrella", status="lost")["rows"]))
+
+    # No overlap: only what the next steps change, however long the session took
+    poller = SyncPoller(config=dict(SYNC_CONFIG, overlap=0.0))
+    poller.poll()
+    step("update user", lambda: repository.update("users", dev, {"phone": "5550002"}))
+    step("update user unchanged", lambda: repository.update("users", dev, {"phone": "5550002"}))
+    step("update missing user", lambda: repository.update("users", 999999, {"phone": "5550002"}))
+    step("delete claim", lambda: repository.delete("claims", bottle_claim))
+    step("delete referenced item", lambda: repository.delete("items", found_umbrella))
+    step("sync", lambda: {t: (sorted(r[0] for r in rows), sorted(deleted), truncated)
+                          for t, (rows, deleted, truncated) in poller.poll().items()})
+    step("tombstones", lambda: run_query("SELECT table_name, row_id FROM tombstones ORDER BY tombstone_id"))
+    step("final summaries", lambda: [run_query(f"SELECT * FROM {t} ORDER BY 1, 2") for t in
+                                     ("item_category_counts", "user_item_counts", "claim_status_counts")])
+
+    # Resolved rows made old enough to archive: the claimed umbrella (with
+    # its decided claims) and the claimed bottle (its claim was deleted)
+    step("age resolved", lambda: (
+        run_exec("UPDATE items SET report_date = %s WHERE status = 'claimed'", (datetime.date(2021, 3, 1),)),
+        run_exec("UPDATE claims SET claim_date = %s WHERE status <> 'pending'", (datetime.date(2021, 3, 2),))))
+    # Archiving moves rows, it does not forget them: the Query Hub counts,
+    # count_items_by_user() and the archived join must come out the same
+    def counts():
+        pager.filters, pager.sources = {}, ["items", "items_archive"]
+        return {"hub": {name: sorted(norm(repository.hub_query(name, archived=True)[1]), key=str)
+                        for name in QUERY_HUB},
+                "users": [repository.count_items_by_user(u) for u in (1, 2, 3, asha, dev)],
+                "pages": pager.fetch_count()}
+    step("counts before archive", counts)
+    step("archive", lambda: {k: v for k, v in archive.archive().items() if k in ("items", "claims", "done")})
+    step("archived", lambda: (run_query("SELECT item_id, status FROM items_archive ORDER BY item_id"),
+                              run_query("SELECT claim_id, item_id, status FROM claims_archive ORDER BY claim_id")))
+    step("archive again", lambda: {k: v for k, v in archive.archive().items() if k in ("items", "claims")})
+    step("counts after archive", counts)
+    step("live join after archive", lambda: sorted(norm(repository.hub_query("join")[1]), key=str))
+    step("row sources", lambda: [(r[0], pager.source_of(r[0])) for r in pager.fetch_first(10)])
+
+    def rebuilt():
+        with get_conn() as con:
+            cur = con.cursor()
+            try:
+                rebuild_summaries(cur)
+                return check_summaries(cur)
+            finally:
+                cur.close()
+    step("summaries drift", lambda: run_exec("UPDATE user_item_counts SET item_count = item_count + 5"))
+    step("rebuild summaries", rebuilt)
+    return steps
+
+def self_check():
+    """Problems found on the current backend alone."""
+    problems = []
+    with get_conn() as con:
+        cur = con.cursor()
+        try:
+            for table, bad in check_summaries(cur).items():
+                problems.append(f"{table} out of sync: {bad}")
+        finally:
+            cur.close()
+    for user_id, n in run_query("""SELECT reported_by, COUNT(*) FROM (
+                                       SELECT reported_by FROM items
+                                       UNION ALL SELECT reported_by FROM items_archive) AS t
+                                   WHERE reported_by IS NOT NULL GROUP BY reported_by"""):
+        got = repository.count_items_by_user(user_id)
+        if got != n:
+            problems.append(f"count_items_by_user({user_id}) = {got}, items + items_archive have {n}")
+    return problems
+
+def collect(backend):
+    db.close_pool()
+    result_cache.clear()
+    db.STORAGE_CONFIG["backend"] = backend
+    try:
+        return {"schema": schema(), "steps": session(), "problems": self_check()}
+    finally:
+        db.close_pool()
+
+def compare(a, b, names=("mysql", "sqlite")):
+    diffs = []
+    sa, sb = a["schema"], b["schema"]
+    for table in sorted(set(sa["columns"]) | set(sb["columns"])):
+        ca, cb = sa["columns"].get(table), sb["columns"].get(table)
+        if ca != cb:
+            diffs.append(f"table {table}: {names[0]} {ca} / {names[1]} {cb}")
+    for kind in ("triggers", "routines", "indexes"):
+        only_a = sorted(set(sa[kind]) - set(sb[kind]))
+        only_b = sorted(set(sb[kind]) - set(sa[kind]))
+        if only_a or only_b:
+            diffs.append(f"{kind}: only {names[0]} {only_a}, only {names[1]} {only_b}")
+    for (name, ra), (_, rb) in zip(a["steps"], b["steps"]):
+        if ra != rb:
+            diffs.append(f"step {name!r}:\n    {names[0]}: {ra}\n    {names[1]}: {rb}")
+    return diffs
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Check that the storage backends behave the same.")
+    group = ap.add_mutually_exclusive_group()
+    group.add_argument("--temp-server", action="store_true", help="compare with a throwaway mysqld")
+    group.add_argument("--mysql", action="store_true",
+                       help="compare with the server in DB_CONFIG (a fresh main.sql load; rows are added)")
+    ap.add_argument("--mysqld", help="server binary for --temp-server")
+    ap.add_argument("-v", "--verbose", action="store_true", help="print every step's result")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="lostfound-parity-") as tmp:
+        sqlite_backend.SQLITE_CONFIG["path"] = os.path.join(tmp, "parity.db")
+        results = {"sqlite": collect("sqlite")}
+        if args.temp_server:
+            from benchmark import TempServer, use_server
+            with TempServer(args.mysqld) as server:
+                server.load_sql(os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.sql"))
+                use_server(server.config)
+                results["mysql"] = collect("mysql")
+        elif args.mysql:
+            results["mysql"] = collect("mysql")
+
+    failed = False
+    for backend, result in results.items():
+        print(f"{backend}: {len(result['steps'])} steps, {len(result['schema']['columns'])} tables")
+        if args.verbose:
+            for name, value in result["steps"]:
+                print(f"  {name}: {value}")
+        for problem in result["problems"]:
+            print(f"  FAIL {problem}")
+            failed = True
+    if "mysql" in results:
+        diffs = compare(results["mysql"], results["sqlite"])
+        for d in diffs:
+            print(f"DIFF {d}")
+        print(f"{len(diffs)} difference(s) between mysql and sqlite.")
+        failed = failed or bool(diffs)
+    else:
+        print("(no MySQL side: pass --temp-server or --mysql to compare)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+# Lost & Found DBMS Project - Query profiler
+# ------------------------------------------------
+# run_query / run_exec / call_proc report every statement here. Stats are
+# kept per statement fingerprint (the SQL with literals replaced by ?), so
+# the same query with different parameters lands in one bucket:
+# - call count and rows returned / affected
+# - connect (pool checkout), execute and fetch latency percentiles over
+#   the most recent `samples` calls
+# - statements slower than `slow_ms` are logged (logger "lostfound.slow")
+#   and kept in a short in-memory list for the Performance tab.
+
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+
+PROFILER_CONFIG = {
+    "enabled": True,
+    "slow_ms": 200.0,     # log statements slower than this (connect+execute+fetch)
+    "samples": 1000,      # latency samples kept per fingerprint
+    "slow_keep": 50,      # recent slow statements kept for the UI
+}
+
+slow_log = logging.getLogger("lostfound.slow")
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+def fingerprint(sql):
+    """Normalize SQL so calls that differ only in literals share a bucket."""
+    fp = _STRING.sub("?", sql)
+    fp = _NUMBER.sub("?", fp)
+    fp = fp.replace("%s", "?")
+    fp = _IN_LIST.sub("(...)", fp)
+    return _SPACE.sub(" ", fp).strip()
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    k = max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+class StatementStats:
+    __slots__ = ("fingerprint", "calls", "rows", "errors", "total_ms",
+                 "connect", "execute", "fetch", "total")
+
+    def __init__(self, fp, samples):
+        self.fingerprint = fp
+        self.calls = 0
+        self.rows = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.connect = deque(maxlen=samples)
+        self.execute = deque(maxlen=samples)
+        self.fetch = deque(maxlen=samples)
+        self.total = deque(maxlen=samples)
+
+    def summary(self):
+        out = {"fingerprint": self.fingerprint, "calls": self.calls, "rows": self.rows,
+               "errors": self.errors, "total_ms": round(self.total_ms, 2)}
+        for name in ("connect", "execute", "fetch", "total"):
+            values = sorted(getattr(self, name))
+            for pct in (50, 95, 99):
+                out[f"{name}_p{pct}"] = round(percentile(values, pct), 2)
+        return out
+
+class Profiler:
+    def __init__(self, config=PROFILER_CONFIG):
+        self.config = config
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._slow = deque(maxlen=config["slow_keep"])
+
+    def record(self, sql, connect_s, execute_s, fetch_s, rows, params=None, error=None):
+        if not self.config["enabled"]:
+            return
+        fp = fingerprint(sql)
+        c, e, f = connect_s * 1000.0, execute_s * 1000.0, fetch_s * 1000.0
+        total = c + e + f
+        with self._lock:
+            st = self._stats.get(fp)
+            if st is None:
+                st = self._stats[fp] = StatementStats(fp, self.config["samples"])
+            st.calls += 1
+            st.rows += rows or 0
+            st.total_ms += total
+            if error is not None:
+                st.errors += 1
+            st.connect.append(c)
+            st.execute.append(e)
+            st.fetch.append(f)
+            st.total.append(total)
+            slow = total >= self.config["slow_ms"]
+            if slow:
+                self._slow.append((time.strftime("%H:%M:%S"), round(total, 1), " ".join(sql.split())))
+        if slow:
+            slow_log.warning("slow query %.1f ms (connect %.1f, execute %.1f, fetch %.1f, rows %s): %s %r",
+                             total, c, e, f, rows, " ".join(sql.split()), params)
+
+    def stats(self):
+        with self._lock:
+            items = list(self._stats.values())
+        return sorted((st.summary() for st in items), key=lambda s: -s["total_ms"])
+
+    def slow_queries(self):
+        with self._lock:
+            return list(self._slow)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+
+profiler = Profiler()
+
+# ---------------------- EXPLAIN ANALYZE ----------------------
+def parse_plan_tree(text):
+    """Turn MySQL's EXPLAIN ANALYZE / FORMAT=TREE text into (depth, line) pairs."""
+    nodes = []
+    for line in text.splitlines():
+        stripped = line.lstrip(" ")
+        if not stripped:
+            continue
+        indent = len(line) - len(stripped)
+        if stripped.startswith("-> "):
+            nodes.append((indent // 4, stripped[3:]))
+        elif nodes:
+            # Wrapped continuation of the previous node
+            depth, prev = nodes[-1]
+            nodes[-1] = (depth, prev + " " + stripped)
+    return nodes
@@ -0,0 +1,153 @@
+# Lost & Found DBMS Project - Shared SQL
+# ------------------------------------------------
+# SQL used both by the GUI and by the headless tools (export, ...).
+
+# Full-row SELECT per tab, in Treeview column order
+TABLE_SQL = {
+    "users": "SELECT user_id, name, email, phone, role FROM users ORDER BY user_id",
+    "locations": "SELECT location_id, location_name, building, floor_no FROM locations ORDER BY location_id",
+    "items": """SELECT item_id,item_name,description,category,status,report_date,reported_by,location_id
+                FROM items ORDER BY item_id""",
+    "claims": "SELECT claim_id,item_id,claimer_id,claim_date,status,remarks FROM claims ORDER BY claim_id",
+}
+
+TABLE_COLUMNS = {
+    "users": ["user_id", "name", "email", "phone", "role"],
+    "locations": ["location_id", "location_name", "building", "floor_no"],
+    "items": ["item_id", "item_name", "description", "category", "status",
+              "report_date", "reported_by", "location_id"],
+    "claims": ["claim_id", "item_id", "claimer_id", "claim_date", "status", "remarks"],
+}
+
+# What the paged tabs list. items.description (TEXT) stays out of list
+# queries and is read for the selected row only (ITEM_DESCRIPTION_SQL).
+LIST_COLUMNS = {t: [c for c in cols if c != "description"] for t, cols in TABLE_COLUMNS.items()}
+
+ITEM_DESCRIPTION_SQL = "SELECT description FROM items WHERE item_id = %s"
+# ... when the Items tab also lists archived items (archive.py)
+ITEM_DESCRIPTION_ARCHIVED_SQL = """
+    SELECT description FROM items WHERE item_id = %s
+    UNION ALL
+    SELECT description FROM items_archive WHERE item_id = %s"""
+
+# Unfiltered row count of a paged table, read from the trigger-maintained
+# summary tables (summaries.py) instead of a COUNT(*) over the table
+TOTAL_SQL = {
+    "items": "SELECT COALESCE(SUM(item_count), 0) FROM item_category_counts",
+    "claims": "SELECT COALESCE(SUM(claim_count), 0) FROM claim_status_counts",
+    "items_archive": "SELECT COALESCE(SUM(archived_count), 0) FROM item_category_counts",
+    "claims_archive": "SELECT COALESCE(SUM(archived_count), 0) FROM claim_status_counts",
+}
+
+# Header-click sorting is offered on columns with an index to read the
+# (column, primary key) order from (main.sql / migration 7), key first
+SORTABLE = {
+    "users": ["user_id", "name", "email"],
+    "locations": ["location_id", "location_name", "building"],
+    "items": ["item_id", "item_name", "report_date", "reported_by", "location_id"],
+    "claims": ["claim_id", "item_id", "claimer_id", "claim_date"],
+}
+
+# How the per-column filter boxes compare (paging.compile_filter);
+# columns not listed are text, matched as a prefix
+COLUMN_KINDS = {
+    "users": {"user_id": "int", "role": "enum"},
+    "locations": {"location_id": "int", "floor_no": "int"},
+    "items": {"item_id": "int", "status": "enum", "report_date": "date",
+              "reported_by": "int", "location_id": "int"},
+    "claims": {"claim_id": "int", "item_id": "int", "claimer_id": "int",
+               "claim_date": "date", "status": "enum"},
+}
+
+# The Query Hub reads the trigger-maintained summary tables
+# (item_category_counts, user_item_counts, claim_status_counts; see
+# summaries.py) instead of aggregating items / claims on every click.
+# Their counts are live + archived_count: archived rows (archive.py) are
+# still counted.
+
+# Nested query: users who reported more than the average number of items.
+# The average is over reported_by groups, as GROUP BY reported_by gives it:
+# one per user with items, plus one for items with no reporter (the items
+# the per-user counts do not cover).
+NESTED_SQL = """
+    SELECT u.name, u.user_id
+    FROM users u
+    JOIN user_item_counts c ON c.user_id = u.user_id
+    WHERE c.item_count + c.archived_count > (
+        SELECT t.total * 1.0 / NULLIF(r.reporters + CASE WHEN t.total > r.reported THEN 1 ELSE 0 END, 0)
+        FROM (SELECT COALESCE(SUM(item_count + archived_count), 0) AS total
+              FROM item_category_counts) AS t,
+             (SELECT COUNT(*) AS reporters, COALESCE(SUM(item_count + archived_count), 0) AS reported
+              FROM user_item_counts WHERE item_count + archived_count > 0) AS r
+    )
+    """
+
+# Join query: claims with their item and claimer
+JOIN_SQL = """
+    SELECT
+        c.claim_id,
+        i.item_name,
+        u.name AS claimer_name,
+        c.status AS claim_status,
+        i.status AS item_status
+    FROM claims c
+    JOIN items i ON c.item_id = i.item_id
+    JOIN users u ON c.claimer_id = u.user_id
+    ORDER BY c.claim_id
+    """
+
+# ... with the archived claims and items too (JOIN_SQL over live UNION ALL
+# archive; a claim may be archived before its item)
+JOIN_ARCHIVED_SQL = """
+    SELECT
+        c.claim_id,
+        i.item_name,
+        u.name AS claimer_name,
+        c.status AS claim_status,
+        i.status AS item_status
+    FROM (SELECT claim_id, item_id, claimer_id, status FROM claims
+          UNION ALL
+          SELECT claim_id, item_id, claimer_id, status FROM claims_archive) AS c
+    JOIN (SELECT item_id, item_name, status FROM items
+          UNION ALL
+          SELECT item_id, item_name, status FROM items_archive) AS i ON c.item_id = i.item_id
+    JOIN users u ON c.claimer_id = u.user_id
+    ORDER BY c.claim_id
+    """
+
+# Aggregate query: items per category
+AGGREGATE_SQL = """
+    SELECT category, SUM(item_count + archived_count) AS total_items
+    FROM item_category_counts
+    GROUP BY category
+    HAVING total_items > 0
+    ORDER BY total_items DESC
+    """
+
+# Claims per status
+CLAIM_STATUS_SQL = """
+    SELECT status, claim_count + archived_count AS claim_count
+    FROM claim_status_counts
+    WHERE claim_count + archived_count > 0
+    ORDER BY status
+    """
+
+# Query Hub: name -> (sql, result column headings)
+QUERY_HUB = {
+    "nested": (NESTED_SQL, ["Name", "User ID"]),
+    "join": (JOIN_SQL, ["Claim ID", "Item Name", "Claimer Name", "Claim Status", "Item Status"]),
+    "aggregate": (AGGREGATE_SQL, ["Category", "Total Items"]),
+    "claim_status": (CLAIM_STATUS_SQL, ["Claim Status", "Total Claims"]),
+}
+
+# Query Hub with "Include archived": the queries that list rows read the
+# archive tables too (the summaries already count archived rows)
+QUERY_HUB_ARCHIVED = {"join": JOIN_ARCHIVED_SQL}
+
+# History of one item, oldest first (item_events, written by the triggers)
+ITEM_HISTORY_SQL = """
+    SELECT event_time, event_type, actor_id, claim_id
+    FROM item_events
+    WHERE item_id = %s
+    ORDER BY event_time, event_id
+    """
@@ -0,0 +1,123 @@
+# Lost & Found DBMS Project - Query Hub result cache
+# ------------------------------------------------
+# The Query Hub buttons and count_items_by_user() are clicked far more
+# often than the data under them changes. ResultCache keeps their rows,
+# keyed by (SQL, parameters), in a bounded LRU (entry count and an
+# estimate of memory use). An entry is dropped
+# - as soon as a write through the DB helpers bumps the version of a table
+#   it reads (db.table_version; triggers' tables included, and the
+#   multi-desk sync bumps tables that other desks changed), or
+# - after `ttl` seconds, for writes made by other clients in between.
+#
+# The tables a query reads are taken from its FROM / JOIN clauses, plus
+# FUNCTION_READS for the stored functions it calls.
+
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from db import run_query, table_version
+
+CACHE_CONFIG = {
+    "max_entries": 64,
+    "max_bytes": 4 * 1024 * 1024,   # estimated size of the cached rows
+    "ttl": 30.0,                    # seconds; None = until invalidated
+}
+
+# Stored functions -> tables they read
+FUNCTION_READS = {"count_items_by_user": ("user_item_counts",)}
+
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+`?(\w+)", re.I)
+_FUNCTION_CALL = re.compile(r"\b(\w+)\s*\(")
+
+def read_tables(sql):
+    """Tables `sql` depends on (FROM / JOIN targets and FUNCTION_READS)."""
+    tables = {t.lower() for t in _TABLE_REF.findall(sql)}
+    for name in _FUNCTION_CALL.findall(sql):
+        tables.update(FUNCTION_READS.get(name.lower(), ()))
+    return tuple(sorted(tables))
+
+def rows_size(rows):
+    # Rough bytes held by a fetched result (list + tuples + values)
+    size = sys.getsizeof(rows)
+    for r in rows:
+        size += sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r)
+    return size
+
+class ResultCache:
+    def __init__(self, config=CACHE_CONFIG):
+        self.config = config
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (rows, {table: version}, loaded_at, size)
+        self._bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "invalidated": 0, "expired": 0, "evicted": 0}
+
+    def query(self, sql, params=None):
+        """run_query(sql, params) through the cache (worker thread)."""
+        key = (sql, tuple(params or ()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                state = self._check(entry)
+                if state is None:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry[0]
+                self.stats[state] += 1
+                self._drop(key)
+            self.stats["misses"] += 1
+        # Versions before the query: a write racing with it invalidates the result
+        versions = {t: table_version(t) for t in read_tables(sql)}
+        rows = run_query(sql, params)
+        self._store(key, rows, versions)
+        return rows
+
+    def _check(self, entry):
+        rows, versions, loaded_at, size = entry
+        if any(table_version(t) != v for t, v in versions.items()):
+            return "invalidated"
+        ttl = self.config["ttl"]
+        if ttl is not None and time.monotonic() - loaded_at > ttl:
+            return "expired"
+        return None
+
+    def _store(self, key, rows, versions):
+        size = rows_size(rows)
+        limit = self.config["max_bytes"]
+        if size > limit:
+            return                  # would push out everything else
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (rows, versions, time.monotonic(), size)
+            self._bytes += size
+            while len(self._entries) > self.config["max_entries"] or self._bytes > limit:
+                self._drop(next(iter(self._entries)))
+                self.stats["evicted"] += 1
+
+    def _drop(self, key):
+        self._bytes -= self._entries.pop(key)[3]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def snapshot(self):
+        with self._lock:
+            data = dict(self.stats)
+            data.update(entries=len(self._entries), bytes=self._bytes,
+                        max_bytes=self.config["max_bytes"])
+        lookups = data["hits"] + data["misses"]
+        data["hit_ratio"] = data["hits"] / lookups if lookups else 0.0
+        return data
+
+def format_stats(stats):
+    return (f"Result cache: {stats['hit_ratio']:.0%} hits ({stats['hits']}/{stats['hits'] + stats['misses']}), "
+            f"{stats['entries']} entries, {stats['bytes'] / 1024:.1f} of "
+            f"{stats['max_bytes'] / 1024:.0f} KB, {stats['invalidated']} invalidated, "
+            f"{stats['expired']} expired, {stats['evicted']} evicted")
+
+result_cache = ResultCache()
@@ -0,0 +1,155 @@
+# Lost & Found DBMS Project - Data access
+# ------------------------------------------------
+# The reads and writes behind the GUI tabs and the HTTP service
+# (service.py), as plain functions over the pooled helpers in db.py; no
+# Tk in here, so any front end (or a test) can use them.
+#
+# Entities are described once in ENTITIES; create() / update() write only
+# the fields they are given (so an item's description is left alone
+# unless it is part of the update).
+
+import json
+
+from db import run_query, run_exec, call_proc
+from querycache import result_cache
+from queries import (TABLE_COLUMNS, QUERY_HUB, QUERY_HUB_ARCHIVED, ITEM_HISTORY_SQL,
+                     ITEM_DESCRIPTION_SQL, ITEM_DESCRIPTION_ARCHIVED_SQL)
+
+ENTITIES = {
+    "users": {"key": "user_id", "fields": ("name", "email", "phone", "role"),
+              "required": ("name", "email")},
+    "locations": {"key": "location_id", "fields": ("location_name", "building", "floor_no"),
+                  "required": ("location_name",)},
+    "items": {"key": "item_id",
+              "fields": ("item_name", "description", "category", "status", "reported_by", "location_id"),
+              "required": ("item_name", "status", "reported_by", "location_id")},
+    "claims": {"key": "claim_id", "fields": ("item_id", "claimer_id", "remarks"),
+               "required": ("item_id", "claimer_id")},
+}
+
+MAX_LIST = 500                # rows per list_rows() call
+SCALARS = (str, int, float, bool, type(None))   # what a column value may be
+
+def _spec(entity):
+    try:
+        return ENTITIES[entity]
+    except KeyError:
+        raise ValueError(f"Unknown entity {entity!r}; choose from {', '.join(ENTITIES)}") from None
+
+def check_fields(entity, values, required=False):
+    """Fields of `entity` present in `values`, in table order; ValueError on
+    unknown fields (or missing required ones)."""
+    spec = _spec(entity)
+    unknown = set(values) - set(spec["fields"])
+    if unknown:
+        raise ValueError(f"Unknown {entity} field(s): {', '.join(sorted(unknown))}")
+    nested = [f for f, v in values.items() if not isinstance(v, SCALARS)]
+    if nested:
+        raise ValueError(f"{', '.join(sorted(nested))}: expected a single value")
+    if required:
+        missing = [f for f in spec["required"] if values.get(f) in (None, "")]
+        if missing:
+            raise ValueError(f"{', '.join(missing)} required")
+    return [f for f in spec["fields"] if f in values]
+
+# ---------------------- GENERIC CRUD ----------------------
+def get(entity, key):
+    """One full row as a dict, or None."""
+    spec = _spec(entity)
+    cols = TABLE_COLUMNS[entity]
+    rows = run_query(f"SELECT {', '.join(cols)} FROM {entity} WHERE {spec['key']} = %s", (key,))
+    return dict(zip(cols, rows[0])) if rows else None
+
+def list_rows(entity, after=None, limit=100):
+    """Up to `limit` full rows with a key above `after`, in key order (keyset page)."""
+    spec = _spec(entity)
+    cols = TABLE_COLUMNS[entity]
+    limit = max(1, min(int(limit), MAX_LIST))
+    rows = run_query(f"SELECT {', '.join(cols)} FROM {entity} WHERE {spec['key']} > %s "
+                     f"ORDER BY {spec['key']} LIMIT %s", (after if after is not None else 0, limit))
+    return [dict(zip(cols, r)) for r in rows]
+
+def create(entity, values):
+    """INSERT one row from {field: value}; returns rows inserted."""
+    fields = check_fields(entity, values, required=True)
+    return run_exec(f"INSERT INTO {entity}({', '.join(fields)}) "
+                    f"VALUES({', '.join(['%s'] * len(fields))})",
+                    [values[f] for f in fields])
+
+def update(entity, key, values):
+    """UPDATE the given fields of one row; returns the rows it matched
+    (0: no such row)."""
+    fields = check_fields(entity, values)
+    if not fields:
+        raise ValueError("Nothing to update")
+    key_column = _spec(entity)["key"]
+    # MySQL counts changed rows, not matched ones (an UPDATE to the same
+    # values gives 0), so look the row up first, as update_claim_status does
+    if not run_query(f"SELECT 1 FROM {entity} WHERE {key_column}=%s", (key,)):
+        return 0
+    run_exec(f"UPDATE {entity} SET {', '.join(f + '=%s' for f in fields)} "
+             f"WHERE {key_column}=%s",
+             [values[f] for f in fields] + [key])
+    return 1
+
+def delete(entity, key):
+    return run_exec(f"DELETE FROM {entity} WHERE {_spec(entity)['key']}=%s", (key,))
+
+# ---------------------- ITEMS ----------------------
+def add_item(name, description, category, status, user_id, location_id):
+    # CALL add_item(p_name, p_desc, p_cat, p_status, p_user, p_loc); the
+    # insert trigger logs the 'added' event
+    if not (name and status and user_id and location_id):
+        raise ValueError("Name, Status, User, Location required.")
+    return call_proc("add_item", (name, description, category, status, user_id, location_id))
+
+def item_description(item_id, include_archived=False):
+    if include_archived:
+        rows = run_query(ITEM_DESCRIPTION_ARCHIVED_SQL, (item_id, item_id))
+    else:
+        rows = run_query(ITEM_DESCRIPTION_SQL, (item_id,))
+    return rows[0][0] if rows else None
+
+def item_history(item_id):
+    return run_query(ITEM_HISTORY_SQL, (item_id,))
+
+# ---------------------- CLAIMS ----------------------
+def update_claim_status(claim_id, status, remark=""):
+    """CALL update_claim_status(p_claim_id, p_status, p_remark); returns the
+    number of claims it matched (0: no such claim).
+
+    Approving fires trg_claim_approve (item -> claimed, event logged).
+    """
+    # The CALL's affected-row count is not usable (unchanged rows count as 0
+    # and callproc ends with its own SELECT), so look the claim up first
+    if not run_query("SELECT 1 FROM claims WHERE claim_id = %s", (claim_id,)):
+        return 0
+    call_proc("update_claim_status", (claim_id, status, remark))
+    return 1
+
+def decide_claims(claim_ids, status, remark=""):
+    """Approve / reject many claims in one transaction (batch_claim_status).
+
+    Returns {"decided", "auto_rejected", "skipped"}.
+    """
+    if not isinstance(claim_ids, (list, tuple)) or not all(
+            isinstance(c, int) and not isinstance(c, bool) for c in claim_ids):
+        raise ValueError("claim_ids must be a list of claim ids")
+    decided, auto_rejected, skipped = call_proc(
+        "batch_claim_status", (json.dumps([int(c) for c in claim_ids]), status, remark))[0]
+    return {"decided": int(decided), "auto_rejected": int(auto_rejected), "skipped": int(skipped)}
+
+# ---------------------- QUERY HUB ----------------------
+def hub_query(name, archived=False):
+    """(column headings, rows) of a Query Hub query, through the result cache.
+    archived: list archived rows too (QUERY_HUB_ARCHIVED)."""
+    try:
+        sql, columns = QUERY_HUB[name]
+    except KeyError:
+        raise ValueError(f"Unknown query {name!r}; choose from {', '.join(QUERY_HUB)}") from None
+    if archived:
+        sql = QUERY_HUB_ARCHIVED.get(name, sql)
+    return columns, result_cache.query(sql)
+
+def count_items_by_user(user_id):
+    return result_cache.query("SELECT count_items_by_user(%s)", (user_id,))[0][0]
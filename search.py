@@ -0,0 +1,158 @@
+# Lost & Found DBMS Project - Item search
+# ------------------------------------------------
+# Text search over items.item_name / description / category, combined
+# with status, category, location and report-date filters.
+# - With the ft_items_text FULLTEXT index (migration 4 / main.sql) the
+#   words are matched IN BOOLEAN MODE as required prefixes (+word*), so
+#   "blu wal" finds "Blue wallet" while the user is still typing, and
+#   results are ranked by MATCH() relevance.
+# - Words shorter than InnoDB's minimum token size are not in the index;
+#   they (and every word, when the index is missing) are matched with
+#   LIKE '%word%' instead.
+# - Results come a page at a time (LIMIT / OFFSET; one extra row tells
+#   whether there is a next page). MAX_EXECUTION_TIME caps a runaway
+#   LIKE scan so a stale search cannot hold a pool connection for long.
+#
+# Usage:
+#   python search.py "blue wallet" [--status lost] [--page 2]
+
+import argparse
+import re
+import time
+
+from mysql.connector import Error
+
+from db import run_query, backend_name
+from queries import LIST_COLUMNS
+
+SEARCH_CONFIG = {
+    "page_size": 100,
+    "min_token": 3,           # innodb_ft_min_token_size
+    "max_exec_ms": 2000,      # MAX_EXECUTION_TIME hint per search
+}
+
+FT_INDEX = "ft_items_text"
+FT_COLUMNS = "item_name, description, category"
+ER_FT_MATCHING_KEY_NOT_FOUND = 1191
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_fulltext_ready = None        # None = not checked yet
+
+def words(text):
+    # Boolean-mode operators (+ - * " ~ < > ( ) @) are dropped with the rest
+    return _WORD.findall((text or "").lower())
+
+def like_pattern(word):
+    return "%" + word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+def fulltext_available():
+    global _fulltext_ready
+    if _fulltext_ready is None:
+        if backend_name() != "mysql":
+            _fulltext_ready = False     # no FULLTEXT index on the embedded backend
+            return False
+        rows = run_query("""SELECT 1 FROM information_schema.statistics
+                            WHERE table_schema = DATABASE() AND table_name = 'items'
+                              AND index_name = %s LIMIT 1""", (FT_INDEX,))
+        _fulltext_ready = bool(rows)
+    return _fulltext_ready
+
+def build_search(text, status=None, category=None, location_id=None,
+                 date_from=None, date_to=None, page=0, page_size=None, fulltext=True):
+    """Return (sql, params, mode) for one page of matching items."""
+    page_size = page_size or SEARCH_CONFIG["page_size"]
+    where, where_params = [], []
+    order, order_params = [], []
+    terms = words(text)
+    indexed = [w for w in terms if len(w) >= SEARCH_CONFIG["min_token"]] if fulltext else []
+    short = [w for w in terms if w not in indexed]
+    if not terms:
+        mode = "filter"
+    elif indexed:
+        # The index narrows the rows; short words are checked on those only
+        mode = "fulltext"
+        against = " ".join(f"+{w}*" for w in indexed)
+        where.append(f"MATCH({FT_COLUMNS}) AGAINST (%s IN BOOLEAN MODE)")
+        where_params.append(against)
+        order.append(f"MATCH({FT_COLUMNS}) AGAINST (%s IN BOOLEAN MODE) DESC")
+        order_params.append(against)
+    else:
+        mode = "like"
+        # Name hits first
+        order.append("(item_name LIKE %s) DESC")
+        order_params.append(like_pattern(terms[0]))
+    for w in short:
+        where.append("(item_name LIKE %s OR category LIKE %s OR description LIKE %s)")
+        where_params.extend([like_pattern(w)] * 3)
+
+    if status:
+        where.append("status = %s"); where_params.append(status)
+    if category:
+        where.append("category = %s"); where_params.append(category)
+    if location_id:
+        where.append("location_id = %s"); where_params.append(location_id)
+    if date_from:
+        where.append("report_date >= %s"); where_params.append(date_from)
+    if date_to:
+        where.append("report_date <= %s"); where_params.append(date_to)
+    order.append("item_id DESC")
+
+    sql = (f"SELECT /*+ MAX_EXECUTION_TIME({int(SEARCH_CONFIG['max_exec_ms'])}) */ "
+           f"{', '.join(LIST_COLUMNS['items'])} FROM items"
+           + (" WHERE " + " AND ".join(where) if where else "")
+           + " ORDER BY " + ", ".join(order)
+           + " LIMIT %s OFFSET %s")
+    params = where_params + order_params + [page_size + 1, page * page_size]
+    return sql, tuple(params), mode
+
+def search_items(text, page=0, page_size=None, **filters):
+    """Run one search page (worker thread).
+
+    Returns {"rows", "more", "page", "page_size", "mode", "ms"}.
+    """
+    global _fulltext_ready
+    page_size = page_size or SEARCH_CONFIG["page_size"]
+    t0 = time.perf_counter()
+    sql, params, mode = build_search(text, page=page, page_size=page_size,
+                                     fulltext=fulltext_available(), **filters)
+    try:
+        rows = run_query(sql, params)
+    except Error as e:
+        if mode != "fulltext" or getattr(e, "errno", None) != ER_FT_MATCHING_KEY_NOT_FOUND:
+            raise
+        # Index dropped since we looked: remember and retry with LIKE
+        _fulltext_ready = False
+        sql, params, mode = build_search(text, page=page, page_size=page_size,
+                                         fulltext=False, **filters)
+        rows = run_query(sql, params)
+    return {"rows": rows[:page_size], "more": len(rows) > page_size, "page": page,
+            "page_size": page_size, "mode": mode, "ms": (time.perf_counter() - t0) * 1000.0}
+
+def format_summary(result):
+    shown = len(result["rows"])
+    first = result["page"] * result["page_size"]
+    more = "+" if result["more"] else ""
+    if not shown:
+        return f"No matches ({result['mode']}, {result['ms']:.0f} ms)"
+    return (f"Matches {first + 1}-{first + shown}{more} "
+            f"({result['mode']}, {result['ms']:.0f} ms)")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Search items.")
+    ap.add_argument("text")
+    ap.add_argument("--status", choices=("lost", "found", "claimed"))
+    ap.add_argument("--category")
+    ap.add_argument("--location", type=int)
+    ap.add_argument("--from", dest="date_from")
+    ap.add_argument("--to", dest="date_to")
+    ap.add_argument("--page", type=int, default=1)
+    args = ap.parse_args(argv)
+    result = search_items(args.text, page=args.page - 1, status=args.status,
+                          category=args.category, location_id=args.location,
+                          date_from=args.date_from, date_to=args.date_to)
+    for r in result["rows"]:
+        print("\t".join("" if v is None else str(v) for v in r))
+    print(format_summary(result))
+
+if __name__ == "__main__":
+    main()
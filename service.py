@@ -0,0 +1,362 @@
+# Lost & Found DBMS Project - Headless HTTP/JSON service
+# ------------------------------------------------
+# The CRUD and Query Hub operations of repository.py over HTTP, for
+# kiosks / scripts that file and look up reports without the GUI.
+#
+# - asyncio.start_server (stdlib only): one coroutine per client
+#   connection, HTTP/1.1 keep-alive, JSON in and out.
+# - Blocking DB calls run on a thread pool of `workers` threads, by
+#   default POOL_CONFIG["size"]: every worker can hold a pooled connection
+#   at once, so none of them waits on checkout and the pool stays bounded.
+# - Backpressure: at most `max_in_flight` requests are admitted (running
+#   on a worker or queued for one); beyond that a request is answered 503
+#   with Retry-After right away instead of piling up latency.
+#
+# Routes (ids are integers; <entity> is users / locations / items / claims):
+#   GET    /health                      no DB
+#   GET    /stats                       pool, result cache, service counters
+#   GET    /<entity>?after=0&limit=100  keyset page in key order
+#   GET    /<entity>/<id>
+#   POST   /<entity>                    items go through CALL add_item
+#   PATCH  /<entity>/<id>               only the fields given
+#   DELETE /<entity>/<id>
+#   GET    /items/<id>/history
+#   POST   /claims/<id>/status          {"status", "remark"} -> update_claim_status
+#   POST   /claims/decisions            {"claim_ids", "status", "remark"} -> batch_claim_status
+#   GET    /queries/<name>?archived=1   Query Hub (nested, join, aggregate, claim_status)
+#   GET    /users/<id>/item-count       count_items_by_user()
+#
+# Usage:
+#   python service.py [--host 127.0.0.1] [--port 8080] [--workers 5] [--max-in-flight 64]
+
+import argparse
+import asyncio
+import datetime
+import decimal
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+from mysql.connector import DataError, Error, IntegrityError
+from mysql.connector.errors import PoolError
+
+import repository
+from db import POOL_CONFIG, close_pool, pool_stats
+from querycache import result_cache
+
+SERVICE_CONFIG = {
+    "host": "127.0.0.1",
+    "port": 8080,
+    "workers": None,          # DB threads; None = POOL_CONFIG["size"]
+    "max_in_flight": 64,      # admitted requests (running + queued); more get 503
+    "retry_after": 1,         # seconds, sent with 503
+    "max_body": 1024 * 1024,  # bytes
+    "idle_timeout": 30.0,     # seconds a keep-alive connection may sit idle
+}
+
+# Server errors for a value the client sent (-> 400): data truncated (bad
+# ENUM value), incorrect value, out of range, too long, CHECK violated
+# (MySQL, MariaDB). Most arrive as plain DatabaseError, not DataError.
+BAD_VALUE_ERRNOS = {1265, 1366, 1292, 1264, 1406, 3819, 4025}
+
+log = logging.getLogger("lostfound.service")
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# ---------------------- HANDLERS (worker threads) ----------------------
+# handler(*path groups, query, data) -> (status, JSON payload)
+
+def _int(query, name, default=None):
+    value = query.get(name, [None])[0]
+    if value in (None, ""):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer") from None
+
+def _list(entity, query, data):
+    rows = repository.list_rows(entity, _int(query, "after"), _int(query, "limit", 100))
+    return 200, {"rows": rows, "next_after": rows[-1][repository.ENTITIES[entity]["key"]] if rows else None}
+
+def _get(entity, key, query, data):
+    row = repository.get(entity, int(key))
+    if row is None:
+        raise HttpError(404, f"No {entity} row {key}")
+    return 200, row
+
+def _create(entity, query, data):
+    if entity == "items":
+        # Through the procedure, like the GUI (insert trigger logs 'added')
+        repository.check_fields("items", data, required=True)
+        repository.add_item(data["item_name"], data.get("description"), data.get("category"),
+                            data["status"], data["reported_by"], data["location_id"])
+        return 201, {"rows": 1}
+    return 201, {"rows": repository.create(entity, data)}
+
+def _update(entity, key, query, data):
+    if not repository.update(entity, int(key), data):
+        raise HttpError(404, f"No {entity} row {key}")
+    return 200, {"rows": 1}
+
+def _delete(entity, key, query, data):
+    n = repository.delete(entity, int(key))
+    if not n:
+        raise HttpError(404, f"No {entity} row {key}")
+    return 200, {"rows": n}
+
+def _item_history(key, query, data):
+    rows = repository.item_history(int(key))
+    return 200, {"rows": [dict(zip(("event_time", "event_type", "actor_id", "claim_id"), r))
+                          for r in rows]}
+
+def _text(data, name, default=None):
+    value = data.get(name, default)
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string")
+    return value
+
+def _claim_status(key, query, data):
+    if not data.get("status"):
+        raise ValueError("status required")
+    if not repository.update_claim_status(int(key), _text(data, "status"), _text(data, "remark", "")):
+        raise HttpError(404, f"No claims row {key}")
+    return 200, {"ok": True}
+
+def _decide(query, data):
+    if not data.get("claim_ids") or not data.get("status"):
+        raise ValueError("claim_ids and status required")
+    return 200, repository.decide_claims(data["claim_ids"], _text(data, "status"),
+                                         _text(data, "remark", ""))
+
+def _hub_query(name, query, data):
+    columns, rows = repository.hub_query(name, archived=bool(_int(query, "archived", 0)))
+    return 200, {"columns": columns, "rows": rows}
+
+def _item_count(key, query, data):
+    return 200, {"user_id": int(key), "items": repository.count_items_by_user(int(key))}
+
+ENTITY = "(users|locations|items|claims)"
+
+# (method, path pattern, handler); the first full match wins
+ROUTES = [
+    ("GET", r"/queries/(\w+)", _hub_query),
+    ("GET", r"/users/(\d+)/item-count", _item_count),
+    ("GET", r"/items/(\d+)/history", _item_history),
+    ("POST", r"/claims/decisions", _decide),
+    ("POST", r"/claims/(\d+)/status", _claim_status),
+    ("GET", rf"/{ENTITY}", _list),
+    ("POST", rf"/{ENTITY}", _create),
+    ("GET", rf"/{ENTITY}/(\d+)", _get),
+    ("PATCH", rf"/{ENTITY}/(\d+)", _update),
+    ("DELETE", rf"/{ENTITY}/(\d+)", _delete),
+]
+ROUTES = [(method, re.compile(pattern), handler) for method, pattern, handler in ROUTES]
+
+def route(method, path):
+    """(handler, path groups); HttpError 404 / 405 when nothing matches."""
+    allowed = False
+    for m, pattern, handler in ROUTES:
+        match = pattern.fullmatch(path)
+        if match:
+            if m == method:
+                return handler, match.groups()
+            allowed = True
+    if allowed:
+        raise HttpError(405, f"{method} not allowed on {path}")
+    raise HttpError(404, f"No route for {path}")
+
+def _json_default(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", "replace")
+    return str(value)
+
+# ---------------------- SERVER (event loop) ----------------------
+class Service:
+    def __init__(self, config=SERVICE_CONFIG):
+        self.config = dict(config)
+        workers = self.config["workers"] or POOL_CONFIG["size"]
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lostfound-db")
+        self.workers = workers
+        self.in_flight = 0        # only touched on the event loop thread
+        self.stats = {"requests": 0, "rejected": 0, "errors": 0, "peak_in_flight": 0}
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._client, self.config["host"], self.config["port"])
+        return self.server
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        self.executor.shutdown(wait=True)
+        close_pool()
+
+    def snapshot(self):
+        return dict(self.stats, in_flight=self.in_flight, workers=self.workers,
+                    max_in_flight=self.config["max_in_flight"])
+
+    async def _client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader),
+                                                     self.config["idle_timeout"])
+                except HttpError as e:
+                    await self._respond(writer, e.status, {"error": str(e)}, False)
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                method, path, query, body, keep_alive = request
+                status, payload, headers = await self._dispatch(method, path, query, body)
+                await self._respond(writer, status, payload, keep_alive, headers)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader):
+        try:
+            line = await reader.readline()
+            if not line:
+                return None           # client closed the connection
+            try:
+                method, target, version = line.decode("latin-1").split()
+            except ValueError:
+                raise HttpError(400, "Malformed request line") from None
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+                if len(headers) > 100:
+                    raise HttpError(431, "Too many headers")
+        except ValueError:            # line over the StreamReader limit
+            raise HttpError(400, "Request line or header too long") from None
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "Bad Content-Length") from None
+        if length > self.config["max_body"]:
+            raise HttpError(413, "Request body too large")
+        body = await reader.readexactly(length) if length > 0 else b""
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        url = urlsplit(target)
+        return method.upper(), url.path.rstrip("/") or "/", parse_qs(url.query), body, keep_alive
+
+    async def _dispatch(self, method, path, query, body):
+        """(status, payload, extra headers) for one request."""
+        self.stats["requests"] += 1
+        # Cheap, DB-free endpoints are answered even when saturated
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}, None
+        if method == "GET" and path == "/stats":
+            return 200, {"service": self.snapshot(), "pool": pool_stats(),
+                         "result_cache": result_cache.snapshot()}, None
+        try:
+            handler, args = route(method, path)
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise HttpError(400, "Request body must be a JSON object")
+        except HttpError as e:
+            return e.status, {"error": str(e)}, None
+        except ValueError:
+            return 400, {"error": "Request body is not valid JSON"}, None
+        if self.in_flight >= self.config["max_in_flight"]:
+            self.stats["rejected"] += 1
+            return 503, {"error": "Server busy, retry later"}, {"Retry-After": str(self.config["retry_after"])}
+        self.in_flight += 1
+        self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.in_flight)
+        try:
+            loop = asyncio.get_running_loop()
+            status, payload = await loop.run_in_executor(self.executor, partial(handler, *args, query, data))
+            return status, payload, None
+        except HttpError as e:
+            return e.status, {"error": str(e)}, None
+        except ValueError as e:
+            # Input the handlers / repository rejected
+            return 400, {"error": str(e)}, None
+        except DataError as e:
+            return 400, {"error": e.msg or str(e)}, None
+        except IntegrityError as e:
+            return 409, {"error": e.msg}, None
+        except PoolError as e:
+            # No connection freed up within the checkout timeout
+            self.stats["rejected"] += 1
+            return 503, {"error": str(e)}, {"Retry-After": str(self.config["retry_after"])}
+        except Error as e:
+            if e.errno in BAD_VALUE_ERRNOS:
+                return 400, {"error": e.msg or str(e)}, None
+            self.stats["errors"] += 1
+            log.error("%s %s failed: %s", method, path, e)
+            return 500, {"error": e.msg or str(e)}, None
+        except Exception:
+            # A bug, not bad input: logged with its traceback
+            self.stats["errors"] += 1
+            log.exception("%s %s failed", method, path)
+            return 500, {"error": "Internal server error"}, None
+        finally:
+            self.in_flight -= 1
+
+    async def _respond(self, writer, status, payload, keep_alive, headers=None):
+        body = json.dumps(payload, default=_json_default).encode("utf-8")
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+                 "Content-Type: application/json; charset=utf-8",
+                 f"Content-Length: {len(body)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+async def serve(config=SERVICE_CONFIG):
+    service = Service(config)
+    server = await service.start()
+    host, port = server.sockets[0].getsockname()[:2]
+    print(f"Serving on http://{host}:{port} ({service.workers} DB workers, "
+          f"max {service.config['max_in_flight']} in flight)", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Lost & Found HTTP/JSON service.")
+    ap.add_argument("--host", default=SERVICE_CONFIG["host"])
+    ap.add_argument("--port", type=int, default=SERVICE_CONFIG["port"])
+    ap.add_argument("--workers", type=int, default=SERVICE_CONFIG["workers"],
+                    help="DB threads (default: POOL_CONFIG['size'])")
+    ap.add_argument("--max-in-flight", type=int, default=SERVICE_CONFIG["max_in_flight"])
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    config = dict(SERVICE_CONFIG, host=args.host, port=args.port, workers=args.workers,
+                  max_in_flight=args.max_in_flight)
+    try:
+        asyncio.run(serve(config))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+# Lost & Found DBMS Project - Embedded SQLite storage backend
+# ------------------------------------------------
+# For single-desk / offline installs without a MySQL server: the same
+# pooled helpers (db.run_query / run_exec / call_proc / get_conn) run
+# in-process against one SQLite file, with no client/server round trip.
+# Select it with STORAGE_CONFIG["backend"] = "sqlite" in db.py (or
+# LOSTFOUND_BACKEND=sqlite).
+#
+# SQLiteConnection / SQLiteCursor mimic the part of mysql.connector the
+# application uses, so nothing above db.py changes:
+# - The schema is main_sqlite.sql (main.sql translated), created on first
+#   open. The stored procedures add_item / update_claim_status /
+#   batch_claim_status and the function count_items_by_user() are Python
+#   functions (PROCEDURES, create_function); the triggers are SQLite triggers.
+# - The application's MySQL SQL is rewritten on the way in: %s -> ?, LIKE
+#   gets ESCAPE '\', "x - INTERVAL n unit" becomes a function call, a
+#   trailing FOR UPDATE [SKIP LOCKED] is dropped (BEGIN IMMEDIATE already
+#   holds the only write lock); NOW(), VERSION(), DATABASE() and CONCAT()
+#   are registered functions.
+# - sqlite3 errors are raised as the mysql.connector error classes with the
+#   nearest MySQL errno, so callers' except clauses keep working.
+# - WAL journal (readers never wait for the writer), memory-mapped reads,
+#   writes under BEGIN IMMEDIATE with a busy timeout (one writer at a time).
+#
+# archive.py and summaries.py rebuild check backend_name() where MySQL
+# needs partitions or LOCK TABLES. Not available on SQLite: FULLTEXT search
+# (search.py falls back to LIKE), migrations.py (MySQL DDL) and EXPLAIN
+# ANALYZE on the Performance tab.
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
+
+from mysql.connector import errors
+
+from db import ConnectionPool
+
+SQLITE_CONFIG = {
+    "path": "lostfound.db",
+    "schema": os.path.join(os.path.dirname(os.path.abspath(__file__)), "main_sqlite.sql"),
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",        # safe with WAL: a crash loses at most the last commits
+    "mmap_size": 256 * 1024 * 1024, # bytes of the file read through mmap
+    "cache_size": -16000,           # pages, or KiB when negative
+    "busy_timeout": 5000,           # ms a writer waits for another writer
+}
+
+# MySQL errno for the errors the application looks at
+ER_DUP_ENTRY = 1062
+ER_BAD_NULL_ERROR = 1048
+ER_NO_REFERENCED_ROW = 1452
+ER_ROW_IS_REFERENCED = 1451
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_PARSE_ERROR = 1064
+ER_WRONG_VALUE = 1265
+ER_SP_DOES_NOT_EXIST = 1305
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+# ---------------------- TYPES ----------------------
+# Values go in as text in the same format the schema's defaults use, and
+# DATE / DATETIME / TIMESTAMP columns come back as date / datetime like
+# they do from MySQL.
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda v: v.strftime(TIMESTAMP_FORMAT))
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_converter("DATE", lambda b: date.fromisoformat(b.decode()))
+sqlite3.register_converter("DATETIME", lambda b: datetime.fromisoformat(b.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda b: datetime.fromisoformat(b.decode()))
+
+# ---------------------- DIALECT ----------------------
+_INTERVAL = re.compile(r"(\S+)\s*-\s*INTERVAL\s+(%s|\d+)\s+(MICROSECOND|SECOND|MINUTE|HOUR|DAY)\b", re.I)
+_LIKE = re.compile(r"\bLIKE\s+%s", re.I)
+_MARK = re.compile(r"%(s|%)")
+_LOCKING = re.compile(r"\s+FOR\s+UPDATE(\s+SKIP\s+LOCKED)?\s*$", re.I)
+
+@lru_cache(maxsize=512)
+def translate(sql):
+    """MySQL-flavoured application SQL -> SQLite."""
+    sql = _INTERVAL.sub(r"date_sub(\1, \2, '\3')", sql)
+    sql = _LIKE.sub(r"LIKE %s ESCAPE '\\'", sql)
+    sql = _LOCKING.sub("", sql)
+    return _MARK.sub(lambda m: "?" if m.group(1) == "s" else "%", sql)
+
+def _now(precision=0):
+    # Millisecond resolution, like the strftime('%f') column defaults, so a
+    # row stamped in the same millisecond as a NOW(6) is never "before" it
+    now = datetime.now()
+    if not precision:
+        return now.strftime("%Y-%m-%d %H:%M:%S")
+    return now.replace(microsecond=now.microsecond // 1000 * 1000).strftime(TIMESTAMP_FORMAT)
+
+def _date_sub(value, amount, unit):
+    if value is None or amount is None:
+        return None
+    base = datetime.fromisoformat(str(value))
+    return (base - timedelta(**{unit.lower() + "s": int(amount)})).strftime(TIMESTAMP_FORMAT)
+
+def _concat(*parts):
+    return None if any(p is None for p in parts) else "".join(str(p) for p in parts)
+
+def _error(e, sql=""):
+    # sqlite3 error -> the mysql.connector error a MySQL server would cause
+    msg = str(e)
+    if isinstance(e, sqlite3.IntegrityError):
+        if "UNIQUE" in msg or "PRIMARY KEY" in msg:
+            errno = ER_DUP_ENTRY
+        elif "NOT NULL" in msg:
+            errno = ER_BAD_NULL_ERROR
+        elif "FOREIGN KEY" in msg:
+            # Deleting a parent row vs. pointing at a missing one
+            errno = ER_ROW_IS_REFERENCED if sql.lstrip()[:6].upper() == "DELETE" else ER_NO_REFERENCED_ROW
+        else:
+            # The CHECKs are the ENUMs: strict-mode MySQL rejects the value
+            return errors.DataError(msg=msg, errno=ER_WRONG_VALUE)
+        return errors.IntegrityError(msg=msg, errno=errno)
+    if isinstance(e, sqlite3.OperationalError):
+        if "locked" in msg or "busy" in msg:
+            return errors.DatabaseError(msg=msg, errno=ER_LOCK_WAIT_TIMEOUT)
+        return errors.ProgrammingError(msg=msg, errno=ER_PARSE_ERROR)
+    return errors.DatabaseError(msg=msg)
+
+# ---------------------- PROCEDURES ----------------------
+# name -> fn(cursor, *params) returning the rows the MySQL procedure SELECTs.
+# They run inside call_proc's transaction, like the procedures do.
+
+def _check_enum(name, value, allowed):
+    if value not in allowed:
+        raise errors.DataError(msg=f"Data truncated for column '{name}'", errno=ER_WRONG_VALUE)
+
+def add_item(cur, name, desc, cat, status, user_id, location_id):
+    _check_enum("p_status", status, ("lost", "found"))
+    cur.execute("INSERT INTO items(item_name, description, category, status, reported_by, location_id) "
+                "VALUES (%s, %s, %s, %s, %s, %s)", (name, desc, cat, status, user_id, location_id))
+    return []
+
+def update_claim_status(cur, claim_id, status, remark):
+    _check_enum("p_status", status, ("approved", "rejected"))
+    cur.execute("UPDATE claims SET status = %s, remarks = %s WHERE claim_id = %s",
+                (status, remark, claim_id))
+    return []
+
+def batch_claim_status(cur, claim_ids, status, remark):
+    # Same rules as the MySQL procedure: one winner per item (the oldest
+    # listed claim), other pending claims on its item auto-rejected, none
+    # for items already claimed; returns [(decided, auto_rejected, skipped)]
+    _check_enum("p_status", status, ("approved", "rejected"))
+    ids = sorted({int(c) for c in json.loads(claim_ids)})
+    listed = len(json.loads(claim_ids))
+    if not ids:
+        return [(0, 0, listed)]
+    marks = ", ".join(["%s"] * len(ids))
+    cur.execute(f"""SELECT c.claim_id, c.item_id, COALESCE(i.status = 'claimed', 0)
+                    FROM claims c LEFT JOIN items i ON i.item_id = c.item_id
+                    WHERE c.claim_id IN ({marks}) AND c.status = 'pending'""", ids)
+    selected = cur.fetchall()
+    decided = competing = 0
+    if status == "approved":
+        winners = {}
+        for claim_id, item_id, item_claimed in selected:
+            if not item_claimed and (item_id not in winners or claim_id < winners[item_id]):
+                winners[item_id] = claim_id
+        for item_id, claim_id in sorted(winners.items(), key=lambda w: w[1]):
+            cur.execute("UPDATE claims SET status = 'approved', remarks = %s WHERE claim_id = %s",
+                        (remark, claim_id))
+            decided += cur.rowcount
+            if item_id is not None:
+                cur.execute("""UPDATE claims SET status = 'rejected', remarks = %s
+                               WHERE item_id = %s AND status = 'pending'""",
+                            (f"Claim #{claim_id} was approved for this item", item_id))
+                competing += cur.rowcount
+        for claim_id, _, item_claimed in selected:
+            if item_claimed:
+                cur.execute("""UPDATE claims SET status = 'rejected', remarks = 'Item was already claimed'
+                               WHERE claim_id = %s AND status = 'pending'""", (claim_id,))
+                competing += cur.rowcount
+    elif selected:
+        pending = [r[0] for r in selected]
+        cur.execute(f"UPDATE claims SET status = 'rejected', remarks = %s "
+                    f"WHERE claim_id IN ({', '.join(['%s'] * len(pending))})", [remark, *pending])
+        decided = cur.rowcount
+    return [(decided, competing, listed - len(selected))]
+
+PROCEDURES = {
+    "add_item": add_item,
+    "update_claim_status": update_claim_status,
+    "batch_claim_status": batch_claim_status,
+}
+
+# ---------------------- CONNECTION ----------------------
+class _Result:
+    # What cursor.stored_results() yields
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+class SQLiteCursor:
+    def __init__(self, con):
+        self._con = con
+        self._cur = con.raw.cursor()
+        self._results = []
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cur.lastrowid
+
+    @property
+    def description(self):
+        return self._cur.description
+
+    def execute(self, sql, params=()):
+        try:
+            self._cur.execute(translate(sql), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise _error(e, sql) from e
+        return self
+
+    def executemany(self, sql, seq_params):
+        try:
+            self._cur.executemany(translate(sql), [tuple(p) for p in seq_params])
+        except sqlite3.Error as e:
+            raise _error(e, sql) from e
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchmany(self, size=1):
+        return self._cur.fetchmany(size)
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def callproc(self, name, params=()):
+        try:
+            proc = PROCEDURES[name]
+        except KeyError:
+            raise errors.ProgrammingError(msg=f"PROCEDURE {name} does not exist",
+                                          errno=ER_SP_DOES_NOT_EXIST) from None
+        rows = proc(SQLiteCursor(self._con), *params)
+        self._results = [_Result(rows)] if rows else []
+        return params
+
+    def stored_results(self):
+        return iter(self._results)
+
+    def close(self):
+        self._cur.close()
+
+class SQLiteConnection:
+    """One sqlite3 connection behind the mysql.connector calls db.py makes."""
+
+    stmt_cache = None         # sqlite3 keeps its own per-connection statement cache
+
+    def __init__(self, path, config=SQLITE_CONFIG, cached_statements=128):
+        self.raw = sqlite3.connect(path, isolation_level=None, check_same_thread=False,
+                                   detect_types=sqlite3.PARSE_DECLTYPES,
+                                   timeout=config["busy_timeout"] / 1000.0,
+                                   cached_statements=cached_statements)
+        self.raw.execute(f"PRAGMA busy_timeout = {int(config['busy_timeout'])}")
+        self.raw.execute(f"PRAGMA journal_mode = {config['journal_mode']}")
+        self.raw.execute(f"PRAGMA synchronous = {config['synchronous']}")
+        self.raw.execute(f"PRAGMA mmap_size = {int(config['mmap_size'])}")
+        self.raw.execute(f"PRAGMA cache_size = {int(config['cache_size'])}")
+        self.raw.execute("PRAGMA foreign_keys = ON")
+        self.raw.execute("PRAGMA temp_store = MEMORY")
+        self.raw.create_function("NOW", -1, _now)
+        self.raw.create_function("date_sub", 3, _date_sub)
+        self.raw.create_function("CONCAT", -1, _concat)
+        self.raw.create_function("VERSION", 0, lambda: f"SQLite {sqlite3.sqlite_version}")
+        self.raw.create_function("DATABASE", 0, lambda: "main")
+        self.raw.create_function("count_items_by_user", 1, self._count_items_by_user)
+        self.autocommit = True
+
+    def _count_items_by_user(self, user_id):
+        # O(1): the per-user count, live and archived, as in main.sql
+        row = self.raw.execute("SELECT item_count + archived_count FROM user_item_counts WHERE user_id = ?",
+                               (user_id,)).fetchone()
+        return row[0] if row else 0
+
+    @property
+    def in_transaction(self):
+        return self.raw.in_transaction
+
+    def start_transaction(self):
+        # Take the write lock up front: a deferred transaction that reads and
+        # then writes can fail with SQLITE_BUSY instead of waiting
+        try:
+            self.raw.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            raise _error(e) from e
+
+    def commit(self):
+        if self.raw.in_transaction:
+            self.raw.execute("COMMIT")
+
+    def rollback(self):
+        if self.raw.in_transaction:
+            self.raw.execute("ROLLBACK")
+
+    def cursor(self, buffered=None, prepared=False):
+        return SQLiteCursor(self)
+
+    def is_connected(self):
+        return True
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        self.raw.close()
+
+_schema_lock = threading.Lock()
+
+def ensure_schema(path, config=SQLITE_CONFIG):
+    """Create the schema (and sample data) in a new / empty database file."""
+    with _schema_lock:
+        con = sqlite3.connect(path, isolation_level=None)
+        try:
+            if con.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'users'").fetchone()[0]:
+                return False
+            with open(config["schema"], encoding="utf-8") as f:
+                con.executescript("BEGIN;\n" + f.read() + "\nCOMMIT;")
+            return True
+        finally:
+            con.close()
+
+class SQLitePool(ConnectionPool):
+    """ConnectionPool of SQLiteConnections on one database file.
+
+    Same checkout / timeout / stats behaviour as the MySQL pool; there is
+    no server to lose, so connections are never pinged.
+    """
+
+    def __init__(self, size=5, checkout_timeout=10.0, ping_after=30.0, stmt_cache_size=64,
+                 config=SQLITE_CONFIG):
+        super().__init__({"database": config["path"]}, size, checkout_timeout, ping_after,
+                         stmt_cache_size)
+        self.config = config
+        ensure_schema(config["path"], config)
+
+    def _connect(self):
+        return SQLiteConnection(self.config["path"], self.config, self.stmt_cache_size)
+
+    def _check_health(self, con, last_used):
+        return con
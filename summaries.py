@@ -0,0 +1,152 @@
+# Lost & Found DBMS Project - Summary tables
+# ------------------------------------------------
+# item_category_counts, user_item_counts and claim_status_counts are kept
+# current by the trg_*_summary_* triggers (main.sql / migration 2), so the
+# Query Hub and count_items_by_user() read O(groups) rows instead of
+# scanning items / claims. This module checks them against the base tables
+# and rebuilds them if they ever drift (e.g. rows changed with triggers
+# disabled, or a restore of only some tables).
+# Rows moved to items_archive / claims_archive (archive.py) leave the live
+# counts (item_count, claim_count) and are added to archived_count, so the
+# summaries keep counting every row ever reported (migration 10).
+# On MySQL the rebuild holds LOCK TABLES; on SQLite one BEGIN IMMEDIATE
+# transaction (the database's only write lock) does the same job.
+#
+# Usage:
+#   python summaries.py check
+#   python summaries.py rebuild
+
+import argparse
+
+from db import backend_name, get_conn
+
+# summary column -> (query over the summary, same numbers from the base table)
+CHECKS = {
+    "item_category_counts": (
+        "SELECT category, status, item_count FROM item_category_counts WHERE item_count <> 0",
+        """SELECT COALESCE(category, ''), COALESCE(status, ''), COUNT(*)
+           FROM items GROUP BY COALESCE(category, ''), COALESCE(status, '')"""),
+    "user_item_counts": (
+        "SELECT user_id, item_count FROM user_item_counts WHERE item_count <> 0",
+        "SELECT reported_by, COUNT(*) FROM items WHERE reported_by IS NOT NULL GROUP BY reported_by"),
+    "claim_status_counts": (
+        "SELECT status, claim_count FROM claim_status_counts WHERE claim_count <> 0",
+        "SELECT COALESCE(status, ''), COUNT(*) FROM claims GROUP BY COALESCE(status, '')"),
+    "item_category_counts.archived_count": (
+        "SELECT category, status, archived_count FROM item_category_counts WHERE archived_count <> 0",
+        """SELECT COALESCE(category, ''), COALESCE(status, ''), COUNT(*)
+           FROM items_archive GROUP BY COALESCE(category, ''), COALESCE(status, '')"""),
+    "user_item_counts.archived_count": (
+        "SELECT user_id, archived_count FROM user_item_counts WHERE archived_count <> 0",
+        """SELECT reported_by, COUNT(*) FROM items_archive
+           WHERE reported_by IS NOT NULL GROUP BY reported_by"""),
+    "claim_status_counts.archived_count": (
+        "SELECT status, archived_count FROM claim_status_counts WHERE archived_count <> 0",
+        "SELECT COALESCE(status, ''), COUNT(*) FROM claims_archive GROUP BY COALESCE(status, '')"),
+}
+
+# Live counts only: the summary tables as migration 2 created them, before
+# the archive tables and archived_count existed
+LIVE_REBUILD = [
+    "DELETE FROM item_category_counts",
+    """INSERT INTO item_category_counts(category, status, item_count)
+       SELECT COALESCE(category, ''), COALESCE(status, ''), COUNT(*)
+       FROM items GROUP BY COALESCE(category, ''), COALESCE(status, '')""",
+    "DELETE FROM user_item_counts",
+    """INSERT INTO user_item_counts(user_id, item_count)
+       SELECT reported_by, COUNT(*) FROM items
+       WHERE reported_by IS NOT NULL GROUP BY reported_by""",
+    "DELETE FROM claim_status_counts",
+    """INSERT INTO claim_status_counts(status, claim_count)
+       SELECT COALESCE(status, ''), COUNT(*) FROM claims GROUP BY COALESCE(status, '')""",
+]
+
+# Live and archived counts, one pass over each live / archive table pair
+REBUILD = [
+    "DELETE FROM item_category_counts",
+    """INSERT INTO item_category_counts(category, status, item_count, archived_count)
+       SELECT category, status, SUM(live), SUM(archived) FROM (
+           SELECT COALESCE(category, '') AS category, COALESCE(status, '') AS status,
+                  1 AS live, 0 AS archived FROM items
+           UNION ALL
+           SELECT COALESCE(category, ''), COALESCE(status, ''), 0, 1 FROM items_archive
+       ) AS t GROUP BY category, status""",
+    "DELETE FROM user_item_counts",
+    """INSERT INTO user_item_counts(user_id, item_count, archived_count)
+       SELECT reported_by, SUM(live), SUM(archived) FROM (
+           SELECT reported_by, 1 AS live, 0 AS archived FROM items WHERE reported_by IS NOT NULL
+           UNION ALL
+           SELECT reported_by, 0, 1 FROM items_archive WHERE reported_by IS NOT NULL
+       ) AS t GROUP BY reported_by""",
+    "DELETE FROM claim_status_counts",
+    """INSERT INTO claim_status_counts(status, claim_count, archived_count)
+       SELECT status, SUM(live), SUM(archived) FROM (
+           SELECT COALESCE(status, '') AS status, 1 AS live, 0 AS archived FROM claims
+           UNION ALL
+           SELECT COALESCE(status, ''), 0, 1 FROM claims_archive
+       ) AS t GROUP BY status""",
+]
+
+def _counts(cur, sql):
+    cur.execute(sql)
+    return {tuple(r[:-1]): int(r[-1]) for r in cur.fetchall()}
+
+def check(cur):
+    """Return {summary column: [(group, summary count, actual count), ...]} for mismatches."""
+    problems = {}
+    for table, (summary_sql, base_sql) in CHECKS.items():
+        have = _counts(cur, summary_sql)
+        want = _counts(cur, base_sql)
+        bad = [(k, have.get(k, 0), want.get(k, 0))
+               for k in sorted(set(have) | set(want), key=str) if have.get(k, 0) != want.get(k, 0)]
+        if bad:
+            problems[table] = bad
+    return problems
+
+def rebuild(cur, archived=True):
+    # Writers are blocked while the counts are recomputed, so no trigger
+    # update can fall between the DELETE and the INSERT ... SELECT.
+    # archived=False: live counts only (migration 2, no archive tables yet)
+    statements = REBUILD if archived else LIVE_REBUILD
+    if backend_name() != "mysql":
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            for sql in statements:
+                cur.execute(sql)
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+        cur.execute("COMMIT")
+        return
+    cur.execute("LOCK TABLES items READ, claims READ, "
+                + ("items_archive READ, claims_archive READ, " if archived else "")
+                + "item_category_counts WRITE, user_item_counts WRITE, claim_status_counts WRITE")
+    try:
+        for sql in statements:
+            cur.execute(sql)
+    finally:
+        cur.execute("UNLOCK TABLES")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Check or rebuild the summary tables.")
+    ap.add_argument("cmd", choices=("check", "rebuild"))
+    args = ap.parse_args(argv)
+    with get_conn() as con:
+        cur = con.cursor()
+        try:
+            if args.cmd == "rebuild":
+                rebuild(cur)
+                print("Summary tables rebuilt.")
+            problems = check(cur)
+        finally:
+            cur.close()
+    for table, bad in problems.items():
+        print(f"{table}: {len(bad)} group(s) out of sync")
+        for group, have, want in bad[:20]:
+            print(f"   {group}: summary {have}, actual {want}")
+    if not problems:
+        print("Summary tables are consistent.")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+# Lost & Found DBMS Project - Background DB executor
+# ------------------------------------------------
+# Runs DB work off the Tk thread so the mainloop keeps painting.
+# - Jobs are grouped in channels (one per tab); a channel runs its jobs
+#   one at a time, so results are delivered in submission order and a
+#   write is always finished before the refresh queued behind it.
+# - Different channels run in parallel on a small thread pool.
+# - A job submitted with a `key` supersedes older jobs of the same key in
+#   its channel: queued ones are dropped, a running one has its result
+#   discarded (e.g. a second Refresh click while the first is running).
+# - Results are handed back to the Tk thread through a queue polled with
+#   root.after(), never by touching widgets from a worker thread. A callback
+#   that raises is logged (logger "lostfound.tasks") and the queue keeps
+#   draining.
+
+import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger("lostfound.tasks")
+
+class Job:
+    __slots__ = ("channel", "key", "fn", "on_done", "on_error", "cancelled")
+
+    def __init__(self, channel, key, fn, on_done, on_error):
+        self.channel = channel
+        self.key = key
+        self.fn = fn
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class DbExecutor:
+    def __init__(self, root, workers=4, poll_ms=30, on_busy=None):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_busy = on_busy          # on_busy(channel, in_flight) on the Tk thread
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db")
+        self._lock = threading.Lock()
+        self._pending = {}              # channel -> deque of queued jobs
+        self._running = {}              # channel -> job being executed
+        self._results = queue.Queue()
+        self._polling = False
+        self._closed = False
+
+    # ---- Tk thread ----
+    def submit(self, channel, fn, on_done=None, on_error=None, key=None):
+        job = Job(channel, key, fn, on_done, on_error)
+        with self._lock:
+            if self._closed:
+                return job
+            waiting = self._pending.setdefault(channel, deque())
+            if key is not None:
+                for old in waiting:
+                    if old.key == key:
+                        old.cancel()
+                running = self._running.get(channel)
+                if running is not None and running.key == key:
+                    running.cancel()
+                self._pending[channel] = waiting = deque(j for j in waiting if not j.cancelled)
+            waiting.append(job)
+            self._start_next(channel)
+        self._notify_busy(channel)
+        self._ensure_polling()
+        return job
+
+    def post(self, callback, value=None):
+        # Thread-safe: run callback(value) on the Tk thread (progress updates)
+        self._results.put((None, True, (callback, value)))
+
+    def in_flight(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._pending.get(channel, ())) + (channel in self._running)
+            return sum(len(q) for q in self._pending.values()) + len(self._running)
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            for waiting in self._pending.values():
+                for job in waiting:
+                    job.cancel()
+                waiting.clear()
+            for job in self._running.values():
+                job.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    job, ok, value = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    if job is None:
+                        callback, value = value
+                        callback(value)
+                    else:
+                        try:
+                            self._deliver(job, ok, value)
+                        finally:
+                            self._notify_busy(job.channel)
+                except Exception:
+                    # One failing callback must not stall every later result
+                    log.exception("Error delivering %s result",
+                                  "posted" if job is None else f"'{job.channel}'")
+        finally:
+            if self.in_flight() or not self._results.empty():
+                self.root.after(self.poll_ms, self._poll)
+            else:
+                self._polling = False
+
+    def _deliver(self, job, ok, value):
+        if job.cancelled:
+            return
+        callback = job.on_done if ok else job.on_error
+        if callback is None:
+            if not ok:
+                raise value
+            return
+        callback(value)
+
+    def _notify_busy(self, channel):
+        if self.on_busy is not None:
+            self.on_busy(channel, self.in_flight(channel))
+
+    # ---- worker side (called with self._lock held) ----
+    def _start_next(self, channel):
+        if channel in self._running:
+            return
+        waiting = self._pending.get(channel)
+        while waiting:
+            job = waiting.popleft()
+            if job.cancelled:
+                continue
+            self._running[channel] = job
+            self._pool.submit(self._run, job)
+            return
+
+    def _run(self, job):
+        try:
+            if job.cancelled:
+                ok, value = True, None
+            else:
+                ok, value = True, job.fn()
+        except Exception as e:
+            ok, value = False, e
+        # Hand the result over before freeing the channel so the Tk side
+        # sees this job's result ahead of anything queued behind it.
+        self._results.put((job, ok, value))
+        with self._lock:
+            if self._running.get(job.channel) is job:
+                del self._running[job.channel]
+            if not self._closed:
+                self._start_next(job.channel)
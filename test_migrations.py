@@ -0,0 +1,29 @@
+# Lost & Found DBMS Project - migrations.py tests
+# ------------------------------------------------
+# main.sql's generated block must match the migrations it is generated
+# from (python migrations.py schema --write), and main_sqlite.sql must
+# record the same migrations as applied.
+#
+# Usage:
+#   python -m pytest -q test_migrations.py
+
+import os
+import re
+
+import migrations
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def test_main_sql_is_generated_from_migrations():
+    assert migrations.schema_block() == migrations.schema_sql(), \
+        "main.sql is out of date: run python migrations.py schema --write"
+
+def test_schema_sql_defines_each_object_once():
+    names = re.findall(r"^CREATE (?:TABLE IF NOT EXISTS|TRIGGER|FUNCTION|PROCEDURE) (\w+)",
+                       migrations.schema_sql(), re.M)
+    assert names and len(names) == len(set(names))
+
+def test_sqlite_schema_records_every_migration():
+    with open(os.path.join(HERE, "main_sqlite.sql")) as f:
+        recorded = {int(v) for v in re.findall(r"^\((\d+), '", f.read(), re.M)}
+    assert recorded == {m["version"] for m in migrations.MIGRATIONS}
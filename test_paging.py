@@ -0,0 +1,154 @@
+# Lost & Found DBMS Project - paging.py tests
+# ------------------------------------------------
+# No database needed: compile_filter is pure, reconcile_tree runs against
+# an in-memory stand-in for ttk.Treeview.
+#
+# Usage:
+#   python -m pytest -q test_paging.py
+
+from datetime import date
+
+import pytest
+
+from paging import compile_filter, reconcile_tree
+
+class FakeTree:
+    # The slice of ttk.Treeview that reconcile_tree uses (top level only)
+    def __init__(self):
+        self.order = []
+        self.values = {}
+
+    def get_children(self, item=""):
+        return tuple(self.order)
+
+    def insert(self, parent, index, iid, values):
+        self.order.insert(index, iid)
+        self.values[iid] = values
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.order.remove(iid)
+            del self.values[iid]
+
+    def move(self, iid, parent, index):
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def item(self, iid, values):
+        self.values[iid] = values
+
+def shown(tree):
+    return [tree.values[iid] for iid in tree.order]
+
+@pytest.fixture
+def filled():
+    tree, shadow = FakeTree(), {}
+    rows = [(1, "wallet"), (2, "bottle"), (3, "charger")]
+    reconcile_tree(tree, rows, shadow)
+    return tree, shadow
+
+# ---------------------- compile_filter ----------------------
+@pytest.mark.parametrize("text", ["", "   ", None])
+def test_empty_filter_is_none(text):
+    assert compile_filter("item_id", "int", text) is None
+
+@pytest.mark.parametrize("text, expected", [
+    ("5", ("item_id = %s", [5])),
+    (" 5 ", ("item_id = %s", [5])),
+    (">= 5", ("item_id >= %s", [5])),
+    ("<=5", ("item_id <= %s", [5])),
+    ("!= 5", ("item_id != %s", [5])),
+    ("< 5", ("item_id < %s", [5])),
+    ("> 5", ("item_id > %s", [5])),
+    ("= 5", ("item_id = %s", [5])),
+    ("3..9", ("item_id BETWEEN %s AND %s", [3, 9])),
+    ("3 .. 9", ("item_id BETWEEN %s AND %s", [3, 9])),
+])
+def test_int_filter(text, expected):
+    assert compile_filter("item_id", "int", text) == expected
+
+def test_date_filter():
+    assert compile_filter("report_date", "date", "2024-01-31") == \
+        ("report_date = %s", [date(2024, 1, 31)])
+    assert compile_filter("report_date", "date", ">= 2024-01-01") == \
+        ("report_date >= %s", [date(2024, 1, 1)])
+    assert compile_filter("report_date", "date", "2024-01-01..2024-02-01") == \
+        ("report_date BETWEEN %s AND %s", [date(2024, 1, 1), date(2024, 2, 1)])
+
+@pytest.mark.parametrize("kind, text", [
+    ("int", "five"), ("int", ">= "), ("int", "3.."), ("int", "=> 5"),
+    ("date", "2024-13-01"), ("date", "yesterday"),
+])
+def test_bad_filter_raises(kind, text):
+    with pytest.raises(ValueError, match=f"not a valid {kind} filter"):
+        compile_filter("col", kind, text)
+
+def test_enum_filter_is_exact():
+    assert compile_filter("status", "enum", "lost") == ("status = %s", ["lost"])
+    assert compile_filter("status", "enum", "lo%") == ("status = %s", ["lo%"])
+
+def test_text_filter_is_prefix():
+    assert compile_filter("item_name", "text", "wal") == ("item_name LIKE %s", ["wal%"])
+
+def test_text_filter_star_matches_anywhere():
+    assert compile_filter("item_name", "text", "*wal") == ("item_name LIKE %s", ["%wal%"])
+
+@pytest.mark.parametrize("text, param", [
+    ("50%", "50\\%%"),
+    ("a_b", "a\\_b%"),
+    ("c:\\x", "c:\\\\x%"),
+    ("*100%", "%100\\%%"),
+])
+def test_text_filter_escapes_like(text, param):
+    assert compile_filter("item_name", "text", text) == ("item_name LIKE %s", [param])
+
+# ---------------------- reconcile_tree ----------------------
+def test_first_fill_inserts_every_row():
+    tree, shadow = FakeTree(), {}
+    ops = reconcile_tree(tree, [(1, "a"), (2, "b")], shadow)
+    assert ops == {"inserted": 2, "updated": 0, "deleted": 0, "moved": 0, "ops": 2}
+    assert shown(tree) == [(1, "a"), (2, "b")]
+    assert shadow == {"1": (1, "a"), "2": (2, "b")}
+
+def test_same_rows_touch_nothing(filled):
+    tree, shadow = filled
+    ops = reconcile_tree(tree, [(1, "wallet"), (2, "bottle"), (3, "charger")], shadow)
+    assert ops["ops"] == 0
+
+def test_changed_row_is_updated_in_place(filled):
+    tree, shadow = filled
+    ops = reconcile_tree(tree, [(1, "wallet"), (2, "flask"), (3, "charger")], shadow)
+    assert ops == {"inserted": 0, "updated": 1, "deleted": 0, "moved": 0, "ops": 1}
+    assert shown(tree) == [(1, "wallet"), (2, "flask"), (3, "charger")]
+
+def test_inserted_row_lands_at_its_position(filled):
+    tree, shadow = filled
+    ops = reconcile_tree(tree, [(1, "wallet"), (4, "umbrella"), (2, "bottle"), (3, "charger")], shadow)
+    assert ops == {"inserted": 1, "updated": 0, "deleted": 0, "moved": 0, "ops": 1}
+    assert tree.order == ["1", "4", "2", "3"]
+
+def test_missing_row_is_deleted(filled):
+    tree, shadow = filled
+    ops = reconcile_tree(tree, [(1, "wallet"), (3, "charger")], shadow)
+    assert ops == {"inserted": 0, "updated": 0, "deleted": 1, "moved": 0, "ops": 1}
+    assert tree.order == ["1", "3"]
+    assert "2" not in shadow
+
+def test_reordered_row_is_moved(filled):
+    tree, shadow = filled
+    ops = reconcile_tree(tree, [(3, "charger"), (1, "wallet"), (2, "bottle")], shadow)
+    assert ops == {"inserted": 0, "updated": 0, "deleted": 0, "moved": 1, "ops": 1}
+    assert tree.order == ["3", "1", "2"]
+
+def test_mixed_change(filled):
+    tree, shadow = filled
+    rows = [(2, "bottle (found)"), (5, "keys"), (1, "wallet")]
+    ops = reconcile_tree(tree, rows, shadow)
+    assert ops == {"inserted": 1, "updated": 1, "deleted": 1, "moved": 1, "ops": 4}
+    assert shown(tree) == rows
+    assert shadow == {str(r[0]): r for r in rows}
+
+def test_key_index():
+    tree, shadow = FakeTree(), {}
+    reconcile_tree(tree, [("a", 10), ("b", 20)], shadow, key_index=1)
+    assert tree.order == ["10", "20"]
@@ -0,0 +1,96 @@
+# Lost & Found DBMS Project - Backend parity tests
+# ------------------------------------------------
+# pytest version of parity.py: the scripted session (CRUD, procedures,
+# paging, search, sync, archive, summary rebuild) runs on SQLite and on
+# MySQL, and both must give the same schema and the same result at every
+# step, with the summary tables consistent afterwards.
+#
+# The MySQL side is a throwaway server when mysqld / mariadbd is on PATH
+# (like parity.py --temp-server), or the server in db.DB_CONFIG when
+# LOSTFOUND_TEST_MYSQL=1 is set (it must hold a freshly loaded main.sql;
+# the session adds rows). Otherwise the MySQL tests are skipped.
+#
+# Usage:
+#   python -m pytest -q test_parity.py
+
+import os
+import shutil
+
+import pytest
+
+import db
+import parity
+import sqlite_backend
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def _collect(backend):
+    saved = db.STORAGE_CONFIG["backend"]
+    try:
+        return parity.collect(backend)
+    finally:
+        db.STORAGE_CONFIG["backend"] = saved
+
+@pytest.fixture(scope="module")
+def sqlite_result(tmp_path_factory):
+    saved = sqlite_backend.SQLITE_CONFIG["path"]
+    sqlite_backend.SQLITE_CONFIG["path"] = str(tmp_path_factory.mktemp("parity") / "parity.db")
+    try:
+        return _collect("sqlite")
+    finally:
+        sqlite_backend.SQLITE_CONFIG["path"] = saved
+
+@pytest.fixture(scope="module")
+def mysql_result():
+    if os.environ.get("LOSTFOUND_TEST_MYSQL") == "1":
+        return _collect("mysql")
+    if not (shutil.which("mysqld") or shutil.which("mariadbd")):
+        pytest.skip("no MySQL server: mysqld / mariadbd not on PATH and LOSTFOUND_TEST_MYSQL unset")
+    from benchmark import TempServer, use_server
+    saved = dict(db.DB_CONFIG)
+    try:
+        with TempServer(log=lambda *a: None) as server:
+            server.load_sql(os.path.join(HERE, "main.sql"))
+            use_server(server.config)
+            return _collect("mysql")
+    finally:
+        db.DB_CONFIG.clear()
+        db.DB_CONFIG.update(saved)
+
+def _failed_steps(result):
+    return [(name, value) for name, value in result["steps"]
+            if isinstance(value, list) and value[:1] == ["ValueError"]]
+
+# ---------------------- EACH BACKEND ----------------------
+def test_sqlite_self_check(sqlite_result):
+    assert sqlite_result["problems"] == []
+
+def test_sqlite_session(sqlite_result):
+    steps = dict(sqlite_result["steps"])
+    assert steps["duplicate email"] == ["error", 1062]
+    assert steps["bad role"] == ["error", 1265]
+    assert steps["delete referenced item"] == ["error", 1451]
+    assert steps["update user unchanged"] == 1
+    assert steps["update missing user"] == 0
+    assert steps["archive"] == {"items": 2, "claims": 4, "done": True}
+    assert steps["archive again"] == {"items": 0, "claims": 0}
+    assert steps["counts after archive"] == steps["counts before archive"]
+    assert steps["live join after archive"] != steps["counts after archive"]["hub"]["join"]
+    assert [r for r in steps["row sources"] if r[1] != "items"] == [[5, "items_archive"], [6, "items_archive"]]
+    assert steps["rebuild summaries"] == {}
+    assert _failed_steps(sqlite_result) == []
+
+def test_mysql_self_check(mysql_result):
+    assert mysql_result["problems"] == []
+
+# ---------------------- MYSQL vs SQLITE ----------------------
+def test_same_schema(mysql_result, sqlite_result):
+    diffs = parity.compare({"schema": mysql_result["schema"], "steps": []},
+                           {"schema": sqlite_result["schema"], "steps": []})
+    assert not diffs, "\n".join(diffs)
+
+def test_same_session(mysql_result, sqlite_result):
+    assert [n for n, _ in mysql_result["steps"]] == [n for n, _ in sqlite_result["steps"]]
+    diffs = parity.compare({"schema": sqlite_result["schema"], "steps": mysql_result["steps"]},
+                           {"schema": sqlite_result["schema"], "steps": sqlite_result["steps"]})
+    assert not diffs, "\n".join(diffs)